@@ -33,3 +33,28 @@ export interface NodeInfo {
   rarity?: string;
 }
 
+// items_relation_interned.json: edges refer to a shared dependency table by index
+export interface InternedEdge extends Omit<Edge, 'dependency'> {
+  dependency?: number;
+}
+
+export interface InternedItemData extends Omit<ItemData, 'edges'> {
+  edges: InternedEdge[];
+}
+
+export interface InternedRelationGraph {
+  dependencies: NonNullable<Edge['dependency']>[];
+  nodes: InternedItemData[];
+}
+
+// public/relation/index.json, written by build_relation_graph.py --shards
+export interface RelationShardIndex {
+  hops: number;
+  nodes: {
+    [name: string]: {
+      file: string;
+      node_type: 'item' | 'trader';
+      edge_count: number;
+    };
+  };
+}
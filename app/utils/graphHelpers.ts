@@ -1,4 +1,4 @@
-import { Edge, ItemData } from '../types/graph';
+import { Edge, InternedRelationGraph, ItemData, RelationShardIndex } from '../types/graph';
 
 // Edge type priority order (lower number = higher priority)
 const EDGE_TYPE_PRIORITY: { [key: string]: number } = {
@@ -10,6 +10,46 @@ const EDGE_TYPE_PRIORITY: { [key: string]: number } = {
   'trade': 5,
 };
 
+// Rebuild the items_relation.json shape from the interned format
+// (edges sharing a dependency share the same array, so treat them as read-only)
+export const rehydrateRelationGraph = (interned: InternedRelationGraph): ItemData[] => {
+  const { dependencies } = interned;
+  return interned.nodes.map((node) => ({
+    ...node,
+    edges: node.edges.map(({ dependency, ...edge }) =>
+      dependency === undefined ? edge : { ...edge, dependency: dependencies[dependency] }
+    ),
+  }));
+};
+
+// Fetch only the part of the relation graph around one node
+// (the shard index is fetched once; shard files are content-hashed and cached by the browser)
+let shardIndexPromise: Promise<RelationShardIndex> | null = null;
+
+const fetchJson = async <T>(url: string): Promise<T> => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch ${url}: ${response.status} ${response.statusText}`);
+  }
+  return response.json();
+};
+
+export const fetchRelationShard = async (name: string): Promise<Map<string, ItemData> | null> => {
+  if (!shardIndexPromise) {
+    // Forget a failed index fetch so the next shard load retries it
+    shardIndexPromise = fetchJson<RelationShardIndex>('/relation/index.json').catch((error) => {
+      shardIndexPromise = null;
+      throw error;
+    });
+  }
+  const entry = (await shardIndexPromise).nodes[name];
+  if (!entry) {
+    return null;
+  }
+  const shard = await fetchJson<ItemData[]>(`/relation/${entry.file}`);
+  return new Map(shard.map((item) => [item.name, item]));
+};
+
 // Helper function to clean relation names
 export const cleanRelationName = (relation: string): string => {
   return relation.replace(/_from$|_to$/g, '');
@@ -0,0 +1,384 @@
+"""
+Cheapest way to obtain items: buying from traders, crafting, or recycling/salvaging other items
+Runs a Dijkstra-style search over the relation graph and caches answers until trader prices or recipes change
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from cli_options import get_cli_option, get_positional_args, has_flag
+from crafting_trees import BREAKDOWN_RELATIONS, get_breakdown_outputs, get_dependency_value, group_recipes
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CACHE_FILE = Path(__file__).parent / ".cache" / "acquisition_cache.json"
+
+# Value of one unit of each non-item currency in coins; offers in other
+# currencies are skipped unless a rate is given (--rates=Cred:50,Augment:1000)
+DEFAULT_RATES = {"Coins": 1.0}
+
+# Upper bound on queue pushes per option, in case recycling and crafting form a loop that keeps getting cheaper
+MAX_PUSHES_PER_OPTION = 50
+
+
+class Option(NamedTuple):
+    """
+    One way to get an item: pay fixed coins plus quantity of each input,
+    and receive `produces` units. cost = (fixed + sum(quantity * input cost)) / produces
+    """
+    method: str                         # buy, craft, recycle, salvage or currency
+    inputs: List[Tuple[str, int]]
+    fixed: float
+    produces: int
+    details: Dict[str, Any]
+
+
+def get_trader_offers(items_relation: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    item -> offers {"trader", "price", "currency", "stack"} from the trader edges of the graph.
+    stack is the number of units one purchase gives (ammo is sold in stacks).
+    """
+    offers: Dict[str, List[Dict[str, Any]]] = {}
+    for node in items_relation:
+        if node.get("node_type") != "trader":
+            continue
+        for edge in node["edges"]:
+            if edge["relation"] != "trader":
+                continue
+            price = next((dep for dep in edge.get("dependency") or [] if dep.get("type") == "price"), None)
+            if price and isinstance(price.get("amount"), (int, float)):
+                offers.setdefault(edge["name"], []).append({
+                    "trader": node["name"],
+                    "price": price["amount"],
+                    "currency": price.get("currency", "Coins"),
+                    "stack": get_dependency_value(edge["dependency"], "ammo_count") or 1
+                })
+    return offers
+
+
+def get_sell_price(node: Dict[str, Any]) -> Optional[float]:
+    """Sell price of an item at its base level, if known."""
+    price = node.get("infobox", {}).get("sellprice")
+    if isinstance(price, list):
+        price = price[0] if price else None
+    return float(price) if isinstance(price, (int, float)) else None
+
+
+def build_options(
+    items_relation: List[Dict[str, Any]],
+    rates: Dict[str, float] = DEFAULT_RATES
+) -> Dict[str, List[Option]]:
+    """Every way to obtain every item, from the trader, craft_from and recycle/salvage edges."""
+    nodes = {node["name"]: node for node in items_relation}
+    options: Dict[str, List[Option]] = {}
+
+    for item, offers in get_trader_offers(items_relation).items():
+        for offer in offers:
+            currency, price, produces = offer["currency"], offer["price"], offer["stack"]
+            if currency in rates:
+                option = Option("buy", [], price * rates[currency], produces, offer)
+            elif currency in nodes:
+                # Barter: pay with another item
+                option = Option("buy", [(currency, price)], 0.0, produces, offer)
+            else:
+                continue
+            options.setdefault(item, []).append(option)
+
+    for name, node in nodes.items():
+        for recipe in group_recipes(node):
+            details = {key: value for key, value in recipe.items() if key != "materials"}
+            produces = recipe.get("output_quantity") or 1
+            options.setdefault(name, []).append(Option("craft", recipe["materials"], 0.0, produces, details))
+
+        for method, relation in BREAKDOWN_RELATIONS.items():
+            for output, quantity in get_breakdown_outputs(node, relation):
+                if output != name:
+                    options.setdefault(output, []).append(Option(method, [(name, 1)], 0.0, quantity, {"from": name}))
+
+    # Barter currencies you already hold cost what they would have sold for
+    currencies = {
+        currency
+        for item_options in options.values() for option in item_options
+        if option.method == "buy" for currency, _ in option.inputs
+    }
+    for currency in sorted(currencies):
+        sell_price = get_sell_price(nodes[currency])
+        if sell_price is not None:
+            options.setdefault(currency, []).append(Option("currency", [], sell_price, 1, {}))
+    return options
+
+
+def options_fingerprint(options: Dict[str, List[Option]], rates: Dict[str, float]) -> str:
+    """Hash of every price, recipe and rate the costs depend on."""
+    data = json.dumps(
+        {"options": {item: [list(option) for option in item_options] for item, item_options in sorted(options.items())},
+         "rates": rates},
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class AcquisitionSolver:
+    """
+    Computes the cheapest unit cost (in coins) of every item and the option that achieves it.
+    Like Dijkstra, items are settled from a priority queue in order of cost; an
+    option is evaluated once all of its inputs have a cost. Because recycling
+    divides a cost among several outputs, an item can get cheaper after it was
+    settled, in which case it is queued again.
+    """
+
+    def __init__(self, items_relation: List[Dict[str, Any]], rates: Dict[str, float] = DEFAULT_RATES):
+        self.options = build_options(items_relation, rates)
+        self.fingerprint = options_fingerprint(self.options, rates)
+        self.cost: Dict[str, float] = {}
+        self.best: Dict[str, Option] = {}
+        self.solve()
+
+    def evaluate(self, option: Option) -> Optional[float]:
+        """Unit cost through an option, or None while an input has no cost yet."""
+        total = option.fixed
+        for item, quantity in option.inputs:
+            if item not in self.cost:
+                return None
+            total += quantity * self.cost[item]
+        return total / option.produces
+
+    def solve(self) -> None:
+        """Fill self.cost and self.best."""
+        users: Dict[str, List[Tuple[str, Option]]] = {}
+        queue: List[Tuple[float, str]] = []
+        for item, item_options in self.options.items():
+            for option in item_options:
+                for input_item, _ in option.inputs:
+                    users.setdefault(input_item, []).append((item, option))
+                if not option.inputs:
+                    self.relax(item, option, option.fixed / option.produces, queue)
+
+        pushes_left = MAX_PUSHES_PER_OPTION * sum(len(item_options) for item_options in self.options.values())
+        while queue and pushes_left > 0:
+            cost, item = heapq.heappop(queue)
+            if cost > self.cost[item]:
+                continue
+            for output, option in users.get(item, []):
+                candidate = self.evaluate(option)
+                if candidate is not None and self.relax(output, option, candidate, queue):
+                    pushes_left -= 1
+        if queue:
+            print("[WARNING] Acquisition costs did not settle (a recycle/craft loop keeps getting cheaper)")
+
+    def relax(self, item: str, option: Option, cost: float, queue: List[Tuple[float, str]]) -> bool:
+        """Record a cheaper cost for an item and queue it."""
+        if item in self.cost and cost >= self.cost[item] - 1e-9:
+            return False
+        self.cost[item] = cost
+        self.best[item] = option
+        heapq.heappush(queue, (cost, item))
+        return True
+
+    def plan(self, item: str, quantity: int, path: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Steps to obtain quantity of an item with the cheapest options, as a tree.
+        Every node has "paid" (currency -> amount, including its inputs) and "cost" in coins.
+        """
+        path = path or []
+        step: Dict[str, Any] = {"name": item, "quantity": quantity}
+        option = self.best.get(item)
+        if option is None or item in path:
+            step["method"] = "unavailable"
+            step["cost"] = None
+            step["paid"] = {}
+            return step
+
+        runs = math.ceil(quantity / option.produces)
+        step["method"] = option.method
+        step.update(option.details)
+        paid: Dict[str, float] = {}
+        cost = option.fixed * runs
+        if option.method == "buy" and not option.inputs:
+            paid[option.details["currency"]] = option.details["price"] * runs
+        elif option.method == "currency":
+            paid[item] = quantity
+
+        inputs = []
+        for input_item, input_quantity in option.inputs:
+            if option.method == "buy":
+                # Barter currency is paid, not obtained
+                paid[input_item] = paid.get(input_item, 0) + input_quantity * runs
+                cost += input_quantity * runs * self.cost[input_item]
+                continue
+            sub_step = self.plan(input_item, input_quantity * runs, path + [item])
+            inputs.append(sub_step)
+            if sub_step["cost"] is None:
+                cost = None
+            elif cost is not None:
+                cost += sub_step["cost"]
+            for currency, amount in sub_step["paid"].items():
+                paid[currency] = paid.get(currency, 0) + amount
+
+        if runs * option.produces > quantity:
+            step["surplus"] = runs * option.produces - quantity
+        step["cost"] = cost
+        step["paid"] = paid
+        if inputs:
+            step["inputs"] = inputs
+        return step
+
+
+def check_batch_sizes(
+    solver: AcquisitionSolver,
+    items_database: List[Dict[str, Any]],
+    traders_database: List[Dict[str, Any]]
+) -> List[str]:
+    """
+    Check that recipes making several units per craft and trader stacks (ammo)
+    reach the solver with their batch size, and that a plan for exactly one
+    batch crafts or buys it once. Returns the errors found.
+    """
+    expected: List[Tuple[str, str, int]] = []
+    for item_data in items_database:
+        for recipe in item_data.get("crafting") or []:
+            if recipe.get("output_quantity"):
+                expected.append((item_data["name"], "craft", recipe["output_quantity"]))
+    for trader_data in traders_database:
+        for entry in trader_data.get("shop") or []:
+            if entry.get("ammo_count"):
+                expected.append((entry["name"], "buy", entry["ammo_count"]))
+
+    errors = []
+    for item, method, batch in expected:
+        batches = [option.produces for option in solver.options.get(item, []) if option.method == method]
+        if batch not in batches:
+            errors.append(f"{item}: no {method} option making {batch} (found {batches or 'none'})")
+
+        option = solver.best.get(item)
+        if option is None or option.produces != batch or option.method != method:
+            continue
+        step = solver.plan(item, batch)
+        for input_item, quantity in option.inputs:
+            used = next((sub["quantity"] for sub in step.get("inputs", []) if sub["name"] == input_item), None)
+            used = step["paid"].get(input_item, used) if option.method == "buy" else used
+            if used != quantity:
+                errors.append(f"{item}: {batch} units should use {quantity}x {input_item}, plan uses {used}")
+        if "surplus" in step:
+            errors.append(f"{item}: {batch} units leave a surplus of {step['surplus']}")
+    return errors
+
+
+def load_cache(fingerprint: str, path: Path = CACHE_FILE) -> Dict[str, Any]:
+    """Cached answers, or an empty cache if prices or recipes changed since they were computed."""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("fingerprint") == fingerprint:
+            return cache
+    return {"fingerprint": fingerprint, "results": {}}
+
+
+def save_cache(cache: Dict[str, Any], path: Path = CACHE_FILE) -> None:
+    """Save cached answers."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+
+
+def cheapest_acquisition(
+    solver: AcquisitionSolver,
+    item: str,
+    quantity: int = 1,
+    cache: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Cheapest plan for quantity of an item, served from cache when possible."""
+    key = f"{item}|{quantity}"
+    if cache is not None and key in cache["results"]:
+        return cache["results"][key]
+    result = solver.plan(item, quantity)
+    if cache is not None:
+        cache["results"][key] = result
+    return result
+
+
+def parse_rates(text: str) -> Dict[str, float]:
+    """Currency rates from "Cred:50,Augment:1000" (coins per unit), added to DEFAULT_RATES."""
+    rates = dict(DEFAULT_RATES)
+    for part in filter(None, text.split(',')):
+        currency, _, rate = part.rpartition(':')
+        rates[currency] = float(rate)
+    return rates
+
+
+def print_plan(step: Dict[str, Any], indent: int = 0) -> None:
+    """Print a plan tree."""
+    pad = "  " * indent
+    if step["method"] == "unavailable":
+        print(f"{pad}{step['quantity']}x {step['name']}: no known source")
+        return
+    if step["method"] == "buy":
+        unit = "each" if step["stack"] == 1 else f"per {step['stack']}"
+        how = f"buy from {step['trader']} ({step['price']} {step['currency']} {unit})"
+    elif step["method"] in BREAKDOWN_RELATIONS:
+        how = f"{step['method']} {step['from']}"
+    elif step["method"] == "currency":
+        how = "use your own (valued at sell price)"
+    else:
+        how = "craft" + (f" at {step['dependency'][0]['name']}" if step.get("dependency") else "")
+        if step.get("output_quantity"):
+            how += f" ({step['output_quantity']} per craft)"
+    cost = f"{step['cost']:.0f}" if step["cost"] is not None else "?"
+    print(f"{pad}{step['quantity']}x {step['name']}: {how} -> {cost} coins")
+    for sub_step in step.get("inputs", []):
+        print_plan(sub_step, indent + 1)
+
+
+def main():
+    relation_file = DATA_DIR / "items_relation.json"
+    if not relation_file.exists():
+        print(f"Error: {relation_file} not found!")
+        return
+
+    item_names = get_positional_args()
+    if not item_names and not has_flag('check'):
+        print('Usage: python acquisition_cost.py "Item Name" [--quantity=N] [--rates=Cred:50] [--no-cache]')
+        print('       python acquisition_cost.py --check')
+        return
+
+    quantity = int(get_cli_option('quantity', '1'))
+    rates = parse_rates(get_cli_option('rates', ''))
+
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        items_relation = json.load(f)
+    solver = AcquisitionSolver(items_relation, rates)
+
+    if has_flag('check'):
+        with open(DATA_DIR / "items_database.json", 'r', encoding='utf-8') as f:
+            items_database = json.load(f)
+        with open(DATA_DIR / "traders_database.json", 'r', encoding='utf-8') as f:
+            traders_database = json.load(f)
+        errors = check_batch_sizes(solver, items_database, traders_database)
+        if errors:
+            print(f"[FAIL] {len(errors)} batch size errors:")
+            for error in errors:
+                print(f"  - {error}")
+            sys.exit(1)
+        print("[OK] Crafted and bought batch sizes match the item and trader data")
+        return
+
+    cache = None if has_flag('no-cache') else load_cache(solver.fingerprint)
+
+    for name in item_names:
+        result = cheapest_acquisition(solver, name, quantity, cache)
+        print()
+        print_plan(result)
+        if result["paid"]:
+            paid = ", ".join(f"{amount:g} {currency}" for currency, amount in result["paid"].items())
+            print(f"  Total paid: {paid}")
+
+    if cache is not None:
+        save_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
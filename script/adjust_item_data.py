@@ -5,6 +5,8 @@ Adjust item data for specific items that need manual corrections
 import json
 from pathlib import Path
 
+from json_output import write_json
+
 
 def build_special_types_map(special_types_data: dict) -> dict:
     """Build a comprehensive map of item_name -> special type details."""
@@ -103,26 +105,19 @@ def build_special_types_map(special_types_data: dict) -> dict:
     return items_map
 
 
-def adjust_item_data():
-    """Apply manual corrections to item database."""
-    data_dir = Path(__file__).parent.parent / "data"
-    database_file = data_dir / "items_database.json"
+def load_special_types_map(data_dir: Path) -> dict:
+    """Load special_item_types.json and build the item_name -> special type map."""
     special_types_file = data_dir / "special_item_types.json"
+    if not special_types_file.exists():
+        return {}
     
-    if not database_file.exists():
-        print(f"Error: {database_file} not found!")
-        return
-    
-    with open(database_file, 'r', encoding='utf-8') as f:
-        items_database = json.load(f)
-    
-    # Load special item types with detailed parsing
-    special_types_map = {}
-    if special_types_file.exists():
-        with open(special_types_file, 'r', encoding='utf-8') as f:
-            special_types_data = json.load(f)
-        special_types_map = build_special_types_map(special_types_data)
-    
+    with open(special_types_file, 'r', encoding='utf-8') as f:
+        special_types_data = json.load(f)
+    return build_special_types_map(special_types_data)
+
+
+def apply_item_adjustments(items_database: list, special_types_map: dict) -> int:
+    """Apply manual corrections to items in place. Returns the number of updated fields."""
     # Define adjustments
     type_adjustments = {
         "Augment": [
@@ -192,13 +187,31 @@ def adjust_item_data():
             item['image_urls']['thumb'] = image_adjustments[item['name']]
             updated += 1
     
+    return updated
+
+
+def adjust_item_data():
+    """Apply manual corrections to item database."""
+    data_dir = Path(__file__).parent.parent / "data"
+    database_file = data_dir / "items_database.json"
+    
+    if not database_file.exists():
+        print(f"Error: {database_file} not found!")
+        return
+    
+    with open(database_file, 'r', encoding='utf-8') as f:
+        items_database = json.load(f)
+    
+    # Load special item types with detailed parsing
+    special_types_map = load_special_types_map(data_dir)
+    
+    updated = apply_item_adjustments(items_database, special_types_map)
+    
     # Save database
-    with open(database_file, 'w', encoding='utf-8') as f:
-        json.dump(items_database, f, indent=2, ensure_ascii=False)
+    write_json(database_file, items_database)
     
     print(f"Updated {updated} item fields")
 
 
 if __name__ == "__main__":
     adjust_item_data()
-
@@ -0,0 +1,136 @@
+"""
+Benchmark for the HTML extraction backends of html_extract
+Runs the textarea and infobox image extraction over the HTML pages stored in the HTTP cache,
+reports CPU time per page for each backend and checks that they agree with BeautifulSoup
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import html_extract
+from cli_options import get_cli_option
+from http_cache import DEFAULT_CACHE_PATH, HttpCache
+
+WIKI_URL_PREFIX = "https://arcraiders.wiki/"
+
+# Pages listed per backend when its results differ from BeautifulSoup's
+MAX_DIFFS_SHOWN = 5
+
+TASKS: Dict[str, Callable[[bytes, str], object]] = {
+    "textarea": lambda content, backend: html_extract.extract_textarea(content, backend=backend),
+    "infobox image": lambda content, backend: html_extract.extract_infobox_image(content, backend=backend)
+}
+
+
+def page_task(content: bytes) -> str:
+    """Edit forms are benchmarked on their source textarea, other pages on the infobox image."""
+    return "textarea" if html_extract.SOURCE_TEXTAREA_ID.encode() in content else "infobox image"
+
+
+def load_html_pages(pages_dir: Optional[Path] = None) -> List[Tuple[str, bytes]]:
+    """
+    Load (name, body) pairs of wiki HTML pages: every *.html file of pages_dir
+    if given, otherwise every cached wiki page (edit forms and article pages).
+    """
+    if pages_dir is not None:
+        return [(path.name, path.read_bytes()) for path in sorted(pages_dir.glob("*.html"))]
+
+    if not DEFAULT_CACHE_PATH.exists():
+        return []
+    cache = HttpCache(DEFAULT_CACHE_PATH)
+    try:
+        pages = []
+        for key in cache.keys(WIKI_URL_PREFIX):
+            # API responses are JSON; only HTML pages are benchmarked
+            if "api.php" in key:
+                continue
+            entry = cache.get(key)
+            if entry and entry["body"].lstrip()[:1] == b"<":
+                pages.append((key, entry["body"]))
+        return pages
+    finally:
+        cache.close()
+
+
+def benchmark(
+    pages: List[Tuple[str, bytes]],
+    backends: List[str],
+    repeat: int
+) -> Dict[Tuple[str, str], float]:
+    """Return (task, backend) -> CPU milliseconds per page (best of repeat rounds)."""
+    results = {}
+    for task, extract in TASKS.items():
+        contents = [content for _, content in pages if page_task(content) == task]
+        if not contents:
+            continue
+        for backend in backends:
+            best = None
+            for _ in range(repeat):
+                start = time.process_time()
+                for content in contents:
+                    extract(content, backend)
+                elapsed = time.process_time() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[(task, backend)] = best * 1000 / len(contents)
+    return results
+
+
+def find_differences(pages: List[Tuple[str, bytes]], backend: str) -> List[str]:
+    """Names of the pages where backend extracts something other than BeautifulSoup."""
+    differences = []
+    for name, content in pages:
+        extract = TASKS[page_task(content)]
+        if extract(content, backend) != extract(content, "soup"):
+            differences.append(name)
+    return differences
+
+
+def main():
+    pages_dir = get_cli_option('pages', '')
+    repeat = int(get_cli_option('repeat', '3'))
+
+    pages = load_html_pages(Path(pages_dir) if pages_dir else None)
+    if not pages:
+        print("[ERROR] No HTML pages found. Run the scrapers with --backend=edit once to fill the cache, "
+              "or pass --pages=DIR with *.html files")
+        return
+
+    backends = list(html_extract.BACKENDS)
+    if html_extract.lxml_html is None:
+        print("[WARNING] lxml is not installed, skipping the lxml backend")
+        backends.remove("lxml")
+
+    counts = {task: sum(1 for _, content in pages if page_task(content) == task) for task in TASKS}
+    total_bytes = sum(len(content) for _, content in pages)
+    print(f"Pages: {counts['textarea']} edit forms, {counts['infobox image']} article pages, "
+          f"{total_bytes / 1024:.0f} KiB, best of {repeat} rounds")
+
+    results = benchmark(pages, backends, repeat)
+
+    print()
+    print(f"{'task':<14} {'backend':<8} {'CPU/page':>10} {'speedup':>9}")
+    for (task, backend), milliseconds in results.items():
+        speedup = results[(task, "soup")] / milliseconds if milliseconds else float('inf')
+        print(f"{task:<14} {backend:<8} {milliseconds:>8.2f}ms {speedup:>8.1f}x")
+
+    print()
+    failed = False
+    for backend in backends:
+        if backend == "soup":
+            continue
+        differences = find_differences(pages, backend)
+        if not differences:
+            print(f"[OK] {backend}: all {len(pages)} pages match BeautifulSoup")
+            continue
+        failed = True
+        print(f"[FAIL] {backend}: {len(differences)} of {len(pages)} pages differ from BeautifulSoup:")
+        for name in differences[:MAX_DIFFS_SHOWN]:
+            print(f"  - {name}")
+        if len(differences) > MAX_DIFFS_SHOWN:
+            print(f"  ... and {len(differences) - MAX_DIFFS_SHOWN} more")
+    exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
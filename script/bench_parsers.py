@@ -0,0 +1,283 @@
+"""
+Micro-benchmark and regression check for the wikitext parsers
+Parses stored raw page sources repeatedly, reports throughput in pages/sec per parser,
+and diffs the parsed pages against the committed items_database.json/traders_database.json
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import get_item_data_from_wiki
+import get_trader_data_from_wiki
+from adjust_item_data import apply_item_adjustments, load_special_types_map
+from cli_options import get_cli_option, has_flag
+from http_cache import DEFAULT_CACHE_PATH, HttpCache
+from raw_store import DEFAULT_CORPUS, DEFAULT_RAW_STORE, load_corpus_index, load_raw_sources
+from raw_store import load_corpus as load_corpus_pages
+from wiki_client import RateLimiter
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+RECIPE_SECTIONS = [
+    ('Required Materials to Craft', 'craft'),
+    ('Required Materials to Upgrade', 'upgrade'),
+    ('Required Materials to Repair', 'repair')
+]
+RECYCLING_SECTIONS = ['Recycled Material', 'Salvaged Material']
+
+# Differences listed per page in the regression report
+MAX_DIFFS_SHOWN = 3
+
+
+def load_corpus(corpus_dir: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """
+    Load item (title, source) pairs to parse.
+    Reads corpus_dir if given (a --include-raw snapshot or any directory of *.wiki files),
+    otherwise the snapshot in data/wiki_corpus, the raw-source store or, if those are
+    empty, the wikitext stored in the HTTP cache.
+    """
+    if corpus_dir is not None:
+        return list(load_corpus_pages("items", corpus_dir).items())
+
+    if load_corpus_index(DEFAULT_CORPUS):
+        pages = list(load_corpus_pages("items", DEFAULT_CORPUS).items())
+        if pages:
+            return pages
+
+    if DEFAULT_RAW_STORE.exists():
+        pages = list(load_raw_sources(DEFAULT_RAW_STORE).items())
+        if pages:
+            return pages
+
+    if not DEFAULT_CACHE_PATH.exists():
+        return []
+    cache = HttpCache(DEFAULT_CACHE_PATH)
+    try:
+        pages = []
+        for title in cache.wikitext_titles():
+            cached = cache.get_wikitext(title)
+            if cached:
+                pages.append((title, cached["source"]))
+        return pages
+    finally:
+        cache.close()
+
+
+def load_trader_corpus(corpus_dir: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """Trader (title, source) pairs of a --include-raw snapshot (none for a plain directory)."""
+    corpus_dir = corpus_dir or DEFAULT_CORPUS
+    if not load_corpus_index(corpus_dir):
+        return []
+    return list(load_corpus_pages("traders", corpus_dir).items())
+
+
+def load_parser_module(path: Path) -> ModuleType:
+    """Import a copy of get_item_data_from_wiki.py (e.g. from an older commit) to compare against."""
+    spec = importlib.util.spec_from_file_location(f"baseline_{Path(path).stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_stages(parser: ModuleType) -> Dict[str, Callable[[str, str], object]]:
+    """Benchmark stages: each takes (title, source) and parses one page."""
+    rate_limiter = RateLimiter(0)
+
+    def parse_recipes(title: str, source: str) -> None:
+        # Older parser versions rescan the source per section instead of indexing it
+        build_index = getattr(parser, 'build_section_index', None)
+        extra_args = (build_index(source),) if build_index else ()
+        for section_title, table_type in RECIPE_SECTIONS:
+            section = parser.extract_section(source, section_title, *extra_args)
+            if section:
+                parser.parse_recipe_table(section, table_type)
+
+    def parse_page(title: str, source: str) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser.parse_item_from_wiki(title, rate_limiter=rate_limiter, source_text=source, fetch_images=False)
+
+    def parse_recycling_tables(title: str, source: str) -> None:
+        build_index = getattr(parser, 'build_section_index', None)
+        extra_args = (build_index(source),) if build_index else ()
+        for section_title in RECYCLING_SECTIONS:
+            section = parser.extract_section(source, section_title, *extra_args)
+            if section:
+                parser.parse_recycling_wiki_table(section)
+
+    stages = {
+        "infobox": lambda title, source: parser.parse_infobox(source, title),
+        "recipes": parse_recipes,
+        "recycling": lambda title, source: parser.parse_recycling_table(source),
+        "recycling table": parse_recycling_tables
+    }
+    # Older parser versions always fetch the page, so they cannot parse a stored source
+    if hasattr(parser, 'parse_item_source'):
+        stages["full page"] = parse_page
+    return stages
+
+
+def get_trader_stages(parser: ModuleType) -> Dict[str, Callable[[str, str], object]]:
+    """Benchmark stages for trader pages."""
+    return {"item grid": lambda title, source: parser.parse_item_grid(source)}
+
+
+def benchmark(
+    stages: Dict[str, Callable[[str, str], object]],
+    pages: List[Tuple[str, str]],
+    repeat: int
+) -> Dict[str, float]:
+    """Return stage name -> pages/sec (best of repeat rounds)."""
+    results = {}
+    for stage, parse in stages.items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for title, source in pages:
+                parse(title, source)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[stage] = len(pages) / best if best else float('inf')
+    return results
+
+
+def diff_values(expected: Any, actual: Any, path: str = "") -> List[str]:
+    """Paths where actual differs from expected, like crafting[0].recipe[1].quantity: 2 != 3."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            key_path = f"{path}.{key}" if path else str(key)
+            if key not in actual:
+                differences.append(f"{key_path}: missing")
+            elif key not in expected:
+                differences.append(f"{key_path}: unexpected {json.dumps(actual[key], ensure_ascii=False)[:60]}")
+            else:
+                differences.extend(diff_values(expected[key], actual[key], key_path))
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        differences = []
+        for index, (expected_value, actual_value) in enumerate(zip(expected, actual)):
+            differences.extend(diff_values(expected_value, actual_value, f"{path}[{index}]"))
+        return differences
+    if expected != actual:
+        return [f"{path}: {json.dumps(expected, ensure_ascii=False)[:60]} != {json.dumps(actual, ensure_ascii=False)[:60]}"]
+    return []
+
+
+def diff_items(pages: List[Tuple[str, str]], items_database: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Parse every page offline the way the pipeline does (parse, then the manual adjustments,
+    image URLs carried over) and diff it against its record in items_database.
+    Returns title -> differences for the pages that do not match.
+    """
+    expected_items = {item['name']: item for item in items_database}
+    special_types_map = load_special_types_map(DATA_DIR)
+    differences = {}
+    for title, source in pages:
+        expected = expected_items.get(title)
+        if expected is None:
+            differences[title] = ["not in the database"]
+            continue
+        item_data = get_item_data_from_wiki.parse_item_source(title, source)
+        apply_item_adjustments([item_data], special_types_map)
+        if expected.get('image_urls') and item_data.get('infobox'):
+            get_item_data_from_wiki.attach_image_urls(item_data, expected['image_urls'])
+        expected = {key: value for key, value in expected.items() if key != 'raw_source'}
+        page_differences = diff_values(expected, item_data)
+        if page_differences:
+            differences[title] = page_differences
+    return differences
+
+
+def diff_traders(pages: List[Tuple[str, str]], traders_database: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Diff the shop parsed from every trader page against traders_database."""
+    expected_shops = {trader['name']: trader.get('shop', []) for trader in traders_database}
+    differences = {}
+    for title, source in pages:
+        if title not in expected_shops:
+            differences[title] = ["not in the database"]
+            continue
+        page_differences = diff_values(expected_shops[title], get_trader_data_from_wiki.parse_item_grid(source), "shop")
+        if page_differences:
+            differences[title] = page_differences
+    return differences
+
+
+def print_differences(label: str, total: int, differences: Dict[str, List[str]]) -> None:
+    """Print the regression report of one database."""
+    if not differences:
+        print(f"[OK] All {total} {label} pages match the committed database")
+        return
+    print(f"[FAIL] {len(differences)} of {total} {label} pages differ from the committed database:")
+    for title, page_differences in list(differences.items())[:10]:
+        print(f"  - {title}:")
+        for difference in page_differences[:MAX_DIFFS_SHOWN]:
+            print(f"      {difference}")
+        if len(page_differences) > MAX_DIFFS_SHOWN:
+            print(f"      ... and {len(page_differences) - MAX_DIFFS_SHOWN} more")
+    if len(differences) > 10:
+        print(f"  ... and {len(differences) - 10} more pages")
+
+
+def main():
+    corpus = get_cli_option('corpus', '')
+    repeat = int(get_cli_option('repeat', '5'))
+    compare = get_cli_option('compare', '')
+    corpus_dir = Path(corpus) if corpus else None
+
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        print("[ERROR] No page sources found. Run the scraper once to fill the cache, or pass --corpus=DIR")
+        return
+    trader_pages = load_trader_corpus(corpus_dir)
+
+    total_bytes = sum(len(source.encode('utf-8')) for _, source in pages + trader_pages)
+    print(f"Corpus: {len(pages)} item pages, {len(trader_pages)} trader pages, "
+          f"{total_bytes / 1024:.0f} KiB, best of {repeat} rounds")
+
+    current = benchmark(get_stages(get_item_data_from_wiki), pages, repeat)
+    baseline = None
+    if compare:
+        baseline = benchmark(get_stages(load_parser_module(Path(compare))), pages, repeat)
+    if trader_pages:
+        current.update(benchmark(get_trader_stages(get_trader_data_from_wiki), trader_pages, repeat))
+
+    print()
+    if baseline:
+        print(f"{'stage':<16} {'baseline':>12} {'current':>12} {'speedup':>9}")
+        for stage, pages_per_sec in current.items():
+            if stage not in baseline:
+                print(f"{stage:<16} {'-':>12} {pages_per_sec:>8.0f} p/s")
+                continue
+            print(f"{stage:<16} {baseline[stage]:>8.0f} p/s {pages_per_sec:>8.0f} p/s "
+                  f"{pages_per_sec / baseline[stage]:>8.2f}x")
+    else:
+        print(f"{'stage':<16} {'current':>12}")
+        for stage, pages_per_sec in current.items():
+            print(f"{stage:<16} {pages_per_sec:>8.0f} p/s")
+
+    if has_flag('no-diff'):
+        return
+
+    print()
+    failed = False
+    with open(DATA_DIR / "items_database.json", 'r', encoding='utf-8') as f:
+        differences = diff_items(pages, json.load(f))
+    print_differences("item", len(pages), differences)
+    failed = failed or bool(differences)
+    if trader_pages:
+        with open(DATA_DIR / "traders_database.json", 'r', encoding='utf-8') as f:
+            differences = diff_traders(trader_pages, json.load(f))
+        print_differences("trader", len(trader_pages), differences)
+        failed = failed or bool(differences)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Scaling benchmark for the data pipeline on synthetic catalogs
+Generates items/traders databases at multiples of the real catalog, times each stage with its
+tracemalloc peak, and writes JSON results that can be compared across commits
+"""
+
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from adjust_item_data import build_special_types_map
+from build_relation_graph import build_relation_graph
+from cli_options import get_cli_option
+from get_item_data_from_wiki import parse_item_source
+from get_trader_data_from_wiki import parse_item_grid
+from json_output import write_json
+from verify_relation_graph import check_required_fields, verify_bidirectional_edges
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+RESULTS_FILE = Path(__file__).parent / ".cache" / "bench_pipeline.json"
+
+# A stage whose time grows faster than scale ** GROWTH_WARNING between two
+# scales is reported (stages under MIN_GROWTH_SECONDS are too noisy to judge)
+GROWTH_WARNING = 1.5
+MIN_GROWTH_SECONDS = 0.05
+
+# Slowdown against --compare results that is reported as a regression
+REGRESSION_RATIO = 1.25
+
+# Item fields holding recipe entries -> fields of an entry that name a level of the item
+ENTRY_LEVEL_KEYS = {
+    "crafting": ("result_level",),
+    "upgrades": ("input_level", "output_level"),
+    "repairs": ("item_name",)
+}
+
+
+def copy_name(name: str, copy_index: int) -> str:
+    """Name of an item or trader in copy copy_index of the catalog (copy 0 keeps the real names)."""
+    return name if copy_index == 0 else f"{name} #{copy_index}"
+
+
+def copy_entry(
+    entry: Dict[str, Any],
+    remap: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    materials_key: str,
+    level_keys: Tuple[str, ...],
+    name: str,
+    new_name: str
+) -> Dict[str, Any]:
+    """
+    Copy a recipe, upgrade, repair or recycling entry with its materials remapped.
+    Level names embed the item name ("Kettle II"), so they are renamed with it.
+    """
+    new_entry = {**entry, materials_key: remap(entry.get(materials_key, []))}
+    for key in level_keys:
+        if entry.get(key):
+            new_entry[key] = entry[key].replace(name, new_name)
+    return new_entry
+
+
+def generate_catalog(
+    items_database: List[Dict[str, Any]],
+    traders_database: List[Dict[str, Any]],
+    special_types: Dict[str, Any],
+    factor: int,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Synthetic inputs factor times the size of the real catalog.
+    Every item and trader is copied factor times, keeping its recipes, upgrade
+    levels and shop sizes, and each material, shop item or listed item points
+    to the same item in a random copy. Fan-out and fan-in therefore match the
+    real catalog while the copies link into one graph instead of factor islands.
+    """
+    rng = random.Random(seed)
+    item_names = {item["name"] for item in items_database}
+
+    def pick(name: str) -> str:
+        return copy_name(name, rng.randrange(factor)) if name in item_names else name
+
+    def remap(materials: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{**material, "item": pick(material["item"])} if material.get("item") else material for material in materials]
+
+    items = []
+    for copy_index in range(factor):
+        for item in items_database:
+            name = item["name"]
+            new_name = copy_name(name, copy_index)
+            new_item = {**item, "name": new_name}
+            if "infobox" in item:
+                new_item["infobox"] = {**item["infobox"], "name": new_name}
+            for key, level_keys in ENTRY_LEVEL_KEYS.items():
+                if key in item:
+                    new_item[key] = [copy_entry(entry, remap, "recipe", level_keys, name, new_name) for entry in item[key]]
+            if "recycling" in item:
+                new_item["recycling"] = {
+                    kind: [copy_entry(entry, remap, "materials", ("input",), name, new_name) for entry in entries]
+                    for kind, entries in item["recycling"].items()
+                }
+            items.append(new_item)
+
+    traders = []
+    for copy_index in range(factor):
+        for trader in traders_database:
+            shop = [
+                {**entry, "name": pick(entry["name"]), "currency": pick(entry.get("currency", "Coins"))}
+                for entry in trader.get("shop", [])
+            ]
+            traders.append({**trader, "name": copy_name(trader["name"], copy_index), "shop": shop})
+
+    # Workshops and quests are copied; expedition/candlelight parts and the plain
+    # lists keep their keys and get every copy's items
+    generated_types: Dict[str, Any] = {}
+    for key, value in special_types.items():
+        if isinstance(value, list):
+            generated_types[key] = [pick(name) for _ in range(factor) for name in value]
+        elif key in ("workshop_upgrade", "quest"):
+            generated_types[key] = {
+                copy_name(group, copy_index): (
+                    {level: remap(entries) for level, entries in levels.items()} if isinstance(levels, dict) else remap(levels)
+                )
+                for copy_index in range(factor) for group, levels in value.items()
+            }
+        else:
+            generated_types[key] = {
+                part: remap(entries * factor) if isinstance(entries, list) else entries
+                for part, entries in value.items()
+            }
+
+    return {"items": items, "traders": traders, "special_types": generated_types}
+
+
+def format_materials(materials: List[Dict[str, Any]]) -> str:
+    """Materials cell of a recipe table: 2x [[Metal Parts]]<br>1x [[Rubber Parts]]."""
+    return "<br>".join(f"{material.get('quantity', 1)}x [[{material['item']}]]" for material in materials)
+
+
+def render_item_source(item: Dict[str, Any]) -> str:
+    """
+    Wikitext of an item page in the layout the item parser reads: the infobox,
+    Sources list, craft/upgrade/repair tables and the Recycling table template.
+    """
+    lines = ["{{Infobox item"]
+    for key, value in item.get("infobox", {}).items():
+        if key == "sellprice" and value is not None:
+            prices = value if isinstance(value, list) else [value]
+            lines.append("|sellprice=" + "<br>".join(f"{{{{Price|{price}}}}}" for price in prices))
+        elif isinstance(value, (str, int, float)):
+            lines.append(f"|{key}={value}")
+        elif value is None:
+            lines.append(f"|{key}=")
+    lines.append("}}")
+
+    if item.get("sources"):
+        lines.append("=== Sources ===")
+        lines.extend(f"* [[{source}]]" for source in item["sources"])
+
+    if item.get("crafting"):
+        lines += ["=== Required Materials to Craft ===", '{| class="wikitable"', "! Recipe !! !! Result !! Workshop !! Blueprint Locked"]
+        for recipe in item["crafting"]:
+            output = recipe.get("result_level") or "{{PAGENAME}}"
+            if recipe.get("output_quantity"):
+                output = f"{recipe['output_quantity']}x {output}"
+            lines += ["|-", f"|{format_materials(recipe.get('recipe', []))}", "|'''→'''", f"|{output}",
+                      f"|{recipe.get('workshop', '')}", f"|{'Yes' if recipe.get('blueprint_locked') else 'No'}"]
+        lines.append("|}")
+
+    if item.get("upgrades"):
+        lines += ["=== Required Materials to Upgrade ===", '{| class="wikitable"', "! Item !! Materials !! !! Result !! Workshop !! Perks"]
+        for upgrade in item["upgrades"]:
+            lines += ["|-", f"|{upgrade.get('input_level', '')}", f"|{format_materials(upgrade.get('recipe', []))}", "|'''→'''"]
+            if upgrade.get("output_level"):
+                lines.append(f"|{upgrade['output_level']}")
+            lines.append(f"|{upgrade.get('workshop', '')}")
+            if upgrade.get("upgrade_perks"):
+                lines.append('|style="text-align:left;"|' + "<br>".join(upgrade["upgrade_perks"]))
+        lines.append("|}")
+
+    if item.get("repairs"):
+        lines += ["=== Required Materials to Repair ===", '{| class="wikitable"', "! Item !! Materials !! Durability"]
+        for repair in item["repairs"]:
+            name_cell = f"'''{repair['item_name']}'''" if repair.get("item_name") else ""
+            lines += ["|-", f"|{name_cell}", f"|{format_materials(repair.get('recipe', []))}"]
+            if "durability" in repair:
+                lines.append(f"|+{repair['durability']}")
+        lines.append("|}")
+
+    recycling = item.get("recycling", {})
+    recycled, salvaged = recycling.get("recycling", []), recycling.get("salvaging", [])
+    if recycled or salvaged:
+        lines.append("{{Recycling table")
+        for index in range(max(len(recycled), len(salvaged))):
+            number = index + 1
+            entry = recycled[index] if index < len(recycled) else salvaged[index]
+            if entry.get("input"):
+                lines.append(f"|input{number}={entry['input']}")
+            for key, entries in (("recycling", recycled), ("salvaging", salvaged)):
+                if index < len(entries):
+                    materials = " + ".join(f"{m.get('quantity', 1)} {m['item']}" for m in entries[index]["materials"])
+                    lines.append(f"|{key}{number}={materials}")
+        lines.append("}}")
+
+    return "\n".join(lines) + "\n"
+
+
+def render_trader_source(trader: Dict[str, Any]) -> str:
+    """Wikitext of a trader page with its shop as an ItemGrid template."""
+    lines = ["{{ItemGrid"]
+    for number, entry in enumerate(trader.get("shop", []), 1):
+        currency = entry.get("currency", "Coins")
+        price = entry.get("price", "")
+        lines.append(f"|name{number}={entry['name']}")
+        lines.append(f"|image{number}=[[File:{entry['name']}.png|link={entry['name']}]]")
+        lines.append(f"|price{number}={{{{Price|{price}}}}}" if currency == "Coins" else f"|price{number}={{{{Price|{price}|{currency}}}}}")
+        if "ammo_count" in entry or "stock" in entry:
+            icon = f"x{entry['ammo_count']}" if "ammo_count" in entry else ""
+            lines.append(f"|category-icon{number}=[[File:Ammo Heavy.png|link=|22px]]{icon} {entry.get('stock', '')}".rstrip())
+        if "is_limited" in entry:
+            lines.append(f"|isLimited{number}={'true' if entry['is_limited'] else 'false'}")
+    lines.append("}}")
+    return "\n".join(lines) + "\n"
+
+
+def verify_nodes(nodes: List[Dict[str, Any]]) -> int:
+    """The checks of verify_relation_graph without loading or printing. Returns the number of problems."""
+    missing = sum(1 for node in nodes if check_required_fields(node))
+    edge_errors, _ = verify_bidirectional_edges(nodes)
+    return missing + len(edge_errors)
+
+
+def measure(run: Callable[[], Any], memory: bool) -> Tuple[Any, Dict[str, float]]:
+    """
+    Run a stage and return (its result, {"seconds", "peak_mib"}).
+    The peak comes from a second, traced run so tracing does not slow down the timed one.
+    """
+    start = time.perf_counter()
+    result = run()
+    stats = {"seconds": round(time.perf_counter() - start, 4)}
+    if memory:
+        tracemalloc.start()
+        try:
+            run()
+            stats["peak_mib"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return result, stats
+
+
+def benchmark_scale(
+    items_database: List[Dict[str, Any]],
+    traders_database: List[Dict[str, Any]],
+    special_types: Dict[str, Any],
+    factor: int,
+    seed: int = 0,
+    memory: bool = True
+) -> Dict[str, Any]:
+    """Generate one synthetic catalog and time every stage on it."""
+    catalog = generate_catalog(items_database, traders_database, special_types, factor, seed)
+    items, traders = catalog["items"], catalog["traders"]
+    item_pages = [(item["name"], render_item_source(item)) for item in items]
+    trader_pages = [render_trader_source(trader) for trader in traders]
+
+    stages: Dict[str, Dict[str, float]] = {}
+    graph, stages["build_relation_graph"] = measure(lambda: build_relation_graph(items, traders), memory)
+    nodes = list(graph.values())
+    _, stages["build_special_types_map"] = measure(lambda: build_special_types_map(catalog["special_types"]), memory)
+    problems, stages["verify_relation_graph"] = measure(lambda: verify_nodes(nodes), memory)
+    _, stages["parse_item_source"] = measure(lambda: [parse_item_source(title, source) for title, source in item_pages], memory)
+    _, stages["parse_item_grid"] = measure(lambda: [parse_item_grid(source) for source in trader_pages], memory)
+
+    return {
+        "scale": factor,
+        "items": len(items),
+        "traders": len(traders),
+        "nodes": len(nodes),
+        "edges": sum(len(node["edges"]) for node in nodes),
+        "problems": problems,
+        "page_bytes": sum(len(source) for _, source in item_pages) + sum(len(source) for source in trader_pages),
+        "stages": stages
+    }
+
+
+def add_growth(results: List[Dict[str, Any]]) -> List[str]:
+    """
+    Add each stage's growth exponent between consecutive scales (1.0 is linear, 2.0 quadratic).
+    Returns warnings for stages that grow faster than GROWTH_WARNING.
+    """
+    warnings = []
+    for previous, row in zip(results, results[1:]):
+        for stage, stats in row["stages"].items():
+            before = previous["stages"][stage]["seconds"]
+            if before <= 0 or stats["seconds"] <= 0:
+                continue
+            growth = math.log(stats["seconds"] / before) / math.log(row["scale"] / previous["scale"])
+            stats["growth"] = round(growth, 2)
+            if growth > GROWTH_WARNING and stats["seconds"] >= MIN_GROWTH_SECONDS:
+                warnings.append(f"{stage} grows as scale^{growth:.2f} from {previous['scale']}x to {row['scale']}x")
+    return warnings
+
+
+def get_commit() -> Optional[str]:
+    """Current git commit of the repository, if git is available."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Print stage times next to an earlier results file; returns the regressions."""
+    regressions = []
+    old_rows = {row["scale"]: row for row in baseline.get("scales", [])}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    print(f"{'stage':<26} {'scale':>6} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for row in results["scales"]:
+        old_row = old_rows.get(row["scale"])
+        if not old_row:
+            continue
+        for stage, stats in row["stages"].items():
+            old_stats = old_row["stages"].get(stage)
+            if not old_stats or not old_stats["seconds"]:
+                continue
+            ratio = stats["seconds"] / old_stats["seconds"]
+            print(f"{stage:<26} {row['scale']:>5}x {old_stats['seconds']:>9.3f}s {stats['seconds']:>9.3f}s {ratio:>6.2f}x")
+            if ratio > REGRESSION_RATIO and stats["seconds"] >= MIN_GROWTH_SECONDS:
+                regressions.append(f"{stage} at {row['scale']}x is {ratio:.2f}x slower")
+    return regressions
+
+
+def main():
+    scales = [int(scale) for scale in get_cli_option('scales', '1,10,100').split(',') if scale]
+    seed = int(get_cli_option('seed', '0'))
+    output_file = Path(get_cli_option('output', str(RESULTS_FILE)))
+    compare = get_cli_option('compare', '')
+    memory = '--no-memory' not in sys.argv
+
+    with open(DATA_DIR / "items_database.json", 'r', encoding='utf-8') as f:
+        items_database = json.load(f)
+    with open(DATA_DIR / "traders_database.json", 'r', encoding='utf-8') as f:
+        traders_database = json.load(f)
+    with open(DATA_DIR / "special_item_types.json", 'r', encoding='utf-8') as f:
+        special_types = json.load(f)
+
+    print(f"Base catalog: {len(items_database)} items, {len(traders_database)} traders; scales {scales}, seed {seed}")
+    rows = []
+    for factor in scales:
+        print(f"\n[{factor}x] generating and timing...")
+        row = benchmark_scale(items_database, traders_database, special_types, factor, seed, memory)
+        rows.append(row)
+        print(f"  {row['items']} items, {row['nodes']} nodes, {row['edges']} edges ({row['problems']} check failures), {row['page_bytes'] / 1024:.0f} KiB of wikitext")
+        for stage, stats in row["stages"].items():
+            peak = f" {stats['peak_mib']:>9.1f} MiB" if "peak_mib" in stats else ""
+            print(f"  {stage:<26} {stats['seconds']:>9.3f}s{peak}")
+
+    warnings = add_growth(rows)
+    results = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "base": {"items": len(items_database), "traders": len(traders_database)},
+        "scales": rows
+    }
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    write_json(output_file, results)
+    print(f"\n[OK] Results saved to: {output_file}")
+
+    for warning in warnings:
+        print(f"[WARNING] Superlinear growth: {warning}")
+
+    if compare:
+        with open(compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for regression in compare_results(results, baseline):
+            print(f"[WARNING] Regression: {regression}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark for the bidirectional-edge check of verify_relation_graph
+Scales the relation graph by copying it N times and times the check at each size
+"""
+
+import json
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+import verify_relation_graph
+from bench_parsers import load_parser_module
+from cli_options import get_cli_option
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def scale_relation_graph(nodes: List[Dict[str, Any]], factor: int) -> List[Dict[str, Any]]:
+    """
+    Return factor disjoint copies of a relation graph. Copy k > 0 renames every
+    node (and the edges pointing to it) to "<name> #k".
+    """
+    scaled = list(nodes)
+    for copy_index in range(1, factor):
+        suffix = f" #{copy_index}"
+        for node in nodes:
+            scaled.append({
+                **node,
+                "name": node["name"] + suffix,
+                "edges": [{**edge, "name": edge["name"] + suffix} for edge in node["edges"]]
+            })
+    return scaled
+
+
+def time_check(check: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        check()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(
+    nodes: List[Dict[str, Any]],
+    scales: List[int],
+    repeat: int,
+    workers: int,
+    baseline: ModuleType = None
+) -> List[Dict[str, Any]]:
+    """Time the check at each scale; returns one result row per scale."""
+    results = []
+    for factor in scales:
+        graph = scale_relation_graph(nodes, factor)
+        row = {"scale": factor, "edges": sum(len(node["edges"]) for node in graph)}
+        row["current"] = time_check(lambda: verify_relation_graph.verify_bidirectional_edges(graph), repeat)
+        if workers > 1:
+            row["parallel"] = time_check(lambda: verify_relation_graph.verify_bidirectional_edges(graph, workers), repeat)
+        if baseline:
+            row["baseline"] = time_check(lambda: baseline.verify_bidirectional_edges(graph), repeat)
+        results.append(row)
+    return results
+
+
+def main():
+    scales = [int(scale) for scale in get_cli_option('scales', '1,10,100').split(',') if scale]
+    repeat = int(get_cli_option('repeat', '3'))
+    workers = int(get_cli_option('workers', '0'))
+    compare = get_cli_option('compare', '')
+
+    relation_file = DATA_DIR / "items_relation.json"
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        nodes = json.load(f)
+
+    baseline = load_parser_module(Path(compare)) if compare else None
+    results = benchmark(nodes, scales, repeat, workers, baseline)
+
+    columns = ["current"] + (["parallel"] if workers > 1 else []) + (["baseline"] if baseline else [])
+    print(f"{'scale':>6} {'edges':>9} " + " ".join(f"{column:>10}" for column in columns))
+    for row in results:
+        times = " ".join(f"{row[column] * 1000:>8.1f}ms" for column in columns)
+        print(f"{row['scale']:>5}x {row['edges']:>9} {times}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Raw-material bill of materials for crafting and upgrading items
+Resolves craft_from/upgrade_from edges of the relation graph down to materials that cannot be crafted
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cli_options import get_cli_option, get_positional_args
+from crafting_trees import group_recipes
+from json_output import write_json
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+ROMAN_LEVELS = ["I", "II", "III", "IV", "V"]
+
+
+def level_number(level: Optional[str]) -> Optional[int]:
+    """1-based level of a level name like "Anvil III" (None if it has no roman numeral)."""
+    if not level:
+        return None
+    suffix = level.rsplit(' ', 1)[-1]
+    return ROMAN_LEVELS.index(suffix) + 1 if suffix in ROMAN_LEVELS else None
+
+
+def get_upgrade_steps(node: Dict[str, Any]) -> Dict[int, List[Tuple[str, int]]]:
+    """
+    Materials of each upgrade step of an item: input level number -> (material, quantity).
+    The mirrored self edges (item upgraded from itself) are skipped.
+    """
+    steps: Dict[int, List[Tuple[str, int]]] = {}
+    for edge in node["edges"]:
+        if edge["relation"] != "upgrade_from" or edge["name"] == node["name"]:
+            continue
+        number = level_number(edge.get("input_level"))
+        if number is not None:
+            steps.setdefault(number, []).append((edge["name"], edge.get("quantity") or 1))
+    return steps
+
+
+def add_materials(totals: Dict[str, int], materials: Dict[str, int], multiplier: int = 1) -> None:
+    """Add multiplier times materials to totals."""
+    for name, quantity in materials.items():
+        totals[name] = totals.get(name, 0) + quantity * multiplier
+
+
+class BomSolver:
+    """
+    Computes raw-material totals over a relation graph.
+    Craftable materials are expanded with their first recipe; an item that
+    would need itself somewhere below is counted as a raw material there.
+    Totals are per craft, so a recipe that makes several units (ammo) is
+    crafted as many whole times as the units needed require.
+    Results are memoized per (item, level).
+    """
+
+    def __init__(self, items_relation: List[Dict[str, Any]]):
+        self.nodes = {node["name"]: node for node in items_relation}
+        self.recipes = {name: group_recipes(node) for name, node in self.nodes.items()}
+        self.upgrades = {name: get_upgrade_steps(node) for name, node in self.nodes.items()}
+        self.cache: Dict[Tuple[str, Optional[int]], Dict[str, int]] = {}
+        self.in_progress = set()
+        self.cycle_hits = 0
+
+    def craft_level(self, name: str) -> int:
+        """Level an item has when crafted (1 unless its recipe says otherwise)."""
+        recipes = self.recipes.get(name)
+        if recipes:
+            return level_number(recipes[0].get("output_level")) or 1
+        return 1
+
+    def max_level(self, name: str) -> Optional[int]:
+        """Highest level an item can be upgraded to (None if it has no upgrades)."""
+        steps = self.upgrades.get(name)
+        return max(steps) + 1 if steps else None
+
+    def output_quantity(self, name: str) -> int:
+        """Units one craft of an item makes."""
+        recipes = self.recipes.get(name)
+        if not recipes:
+            return 1
+        return recipes[0].get("output_quantity") or 1
+
+    def expand(self, name: str, quantity: int) -> Dict[str, int]:
+        """Raw materials of quantity units of an item (the item itself if it cannot be crafted)."""
+        if name in self.in_progress:
+            self.cycle_hits += 1
+            return {name: quantity}
+        if not self.recipes.get(name):
+            return {name: quantity}
+        crafts = math.ceil(quantity / self.output_quantity(name))
+        totals: Dict[str, int] = {}
+        add_materials(totals, self.solve(name), crafts)
+        return totals
+
+    def solve(self, name: str, level: Optional[int] = None) -> Dict[str, int]:
+        """
+        Raw materials to craft an item once (see output_quantity for the units
+        that makes) and, with level, upgrade it to that level.
+        Returns material name -> quantity.
+        """
+        key = (name, level)
+        if key in self.cache:
+            return self.cache[key]
+
+        self.in_progress.add(name)
+        cycle_hits = self.cycle_hits
+        totals: Dict[str, int] = {}
+        try:
+            recipes = self.recipes.get(name)
+            if recipes:
+                for material, quantity in recipes[0]["materials"]:
+                    add_materials(totals, self.expand(material, quantity))
+
+            if level is not None:
+                steps = self.upgrades.get(name, {})
+                for number in range(self.craft_level(name), level):
+                    for material, quantity in steps.get(number, []):
+                        add_materials(totals, self.expand(material, quantity))
+        finally:
+            self.in_progress.discard(name)
+
+        # A total cut short by a cycle depends on where the cycle was entered
+        if self.cycle_hits == cycle_hits:
+            self.cache[key] = totals
+        return totals
+
+
+def parse_level(name: str, level: str) -> Optional[int]:
+    """Level number from "IV", "4" or "Anvil IV" (None for an empty string)."""
+    if not level:
+        return None
+    if level.isdigit():
+        number = int(level) if 1 <= int(level) <= len(ROMAN_LEVELS) else None
+    else:
+        number = level_number(level) or level_number(f"{name} {level}")
+    if number is None:
+        raise ValueError(f"Unknown level '{level}' (use I-V or a number)")
+    return number
+
+
+def build_bom(items_relation: List[Dict[str, Any]], solver: Optional[BomSolver] = None) -> List[Dict[str, Any]]:
+    """
+    Raw materials of every craftable or upgradable item: the crafted item,
+    then each level it can be upgraded to (including the upgrades before it).
+    Items crafted several at a time list the materials of one craft and its output_quantity.
+    """
+    solver = solver or BomSolver(items_relation)
+
+    def as_list(totals: Dict[str, int]) -> List[Dict[str, Any]]:
+        return [{"name": name, "quantity": quantity} for name, quantity in totals.items()]
+
+    bom = []
+    for name, node in solver.nodes.items():
+        if node.get("node_type") != "item":
+            continue
+        max_level = solver.max_level(name)
+        if not solver.recipes.get(name) and max_level is None:
+            continue
+
+        entry: Dict[str, Any] = {"name": name, "materials": as_list(solver.solve(name))}
+        if solver.output_quantity(name) > 1:
+            entry["output_quantity"] = solver.output_quantity(name)
+        if max_level is not None:
+            entry["levels"] = {
+                ROMAN_LEVELS[number - 1]: as_list(solver.solve(name, number))
+                for number in range(solver.craft_level(name) + 1, max_level + 1)
+            }
+        bom.append(entry)
+    return bom
+
+
+def main():
+    relation_file = DATA_DIR / "items_relation.json"
+    output_file = DATA_DIR / "bom.json"
+
+    if not relation_file.exists():
+        print(f"Error: {relation_file} not found!")
+        return
+
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        items_relation = json.load(f)
+    solver = BomSolver(items_relation)
+
+    item_names = get_positional_args()
+    if item_names:
+        # Print the bill of materials of the given items
+        for name in item_names:
+            if name not in solver.nodes:
+                print(f"[ERROR] Unknown item: {name}")
+                continue
+            try:
+                level = parse_level(name, get_cli_option('level', ''))
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return
+            title = name if level is None else f"{name} {ROMAN_LEVELS[level - 1]}"
+            if solver.output_quantity(name) > 1:
+                title += f" (one craft makes {solver.output_quantity(name)})"
+            print(f"\n{title}:")
+            totals = solver.solve(name, level)
+            if not totals:
+                print("  (not craftable)")
+            for material, quantity in sorted(totals.items(), key=lambda item: (-item[1], item[0])):
+                print(f"  {quantity:>5}x {material}")
+        return
+
+    start = time.perf_counter()
+    bom = build_bom(items_relation, solver)
+    elapsed = time.perf_counter() - start
+
+    write_json(output_file, bom)
+    print(f"[OK] Bill of materials for {len(bom)} items saved to: {output_file}")
+    print(f"  Solved in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
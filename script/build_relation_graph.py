@@ -3,9 +3,14 @@ Build relation graph from items database
 Transforms flat item data into a graph structure with explicit edges
 """
 
+import hashlib
 import json
+import re
 from pathlib import Path
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from cli_options import get_cli_option, has_flag
+from json_output import write_json
 
 
 def create_edge(
@@ -75,6 +80,12 @@ def process_crafting(item_data: Dict[str, Any], item_name: str) -> List[Dict[str
                 dependency = []
             dependency.append({"type": "result_level", "name": result_level})
         
+        # Add the number of units one craft makes (only recorded when more than 1)
+        if craft_recipe.get("output_quantity"):
+            if dependency is None:
+                dependency = []
+            dependency.append({"type": "output_quantity", "value": craft_recipe["output_quantity"]})
+        
         # Process recipe materials (incoming edges)
         if "recipe" in craft_recipe:
             for material in craft_recipe["recipe"]:
@@ -294,6 +305,124 @@ def create_node(
     return node
 
 
+# Relation -> (reverse relation, reverse direction) for edges mirrored onto the target node
+REVERSE_RELATIONS = {
+    "craft_from": ("craft_to", "out"),
+    "craft_to": ("craft_from", "in"),
+    "upgrade_from": ("upgrade_to", "out"),
+    "upgrade_to": ("upgrade_from", "in"),
+    "repair_from": ("repair_to", "out"),
+    "repair_to": ("repair_from", "in"),
+    "recycle_to": ("recycle_from", "in"),
+    "recycle_from": ("recycle_to", "out"),
+    "salvage_to": ("salvage_from", "in"),
+    "salvage_from": ("salvage_to", "out"),
+}
+
+
+def process_item(item_data: Dict[str, Any], item_name: str) -> List[Dict[str, Any]]:
+    """Create all forward edges of an item (crafting, upgrades, repairs, recycling)."""
+    edges = []
+    
+    # Process crafting
+    edges.extend(process_crafting(item_data, item_name))
+    
+    # Process upgrades
+    edges.extend(process_upgrades(item_data, item_name))
+    
+    # Process repairs
+    edges.extend(process_repairs(item_data, item_name))
+    
+    # Process recycling and salvaging
+    edges.extend(process_recycling(item_data, item_name))
+    
+    return edges
+
+
+def process_trader_shop(trader_data: Dict[str, Any], trader_name: str) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Create edges for a trader's shop.
+    Returns (trader -> item edge, item -> trader sold_by edge) pairs in shop order.
+    """
+    edge_pairs = []
+    
+    shop = trader_data.get("shop", [])
+    for item in shop:
+        item_name = item.get("name")
+        if not item_name:
+            continue
+        
+        # Build dependency list with price/stock info
+        dependency = []
+        
+        # Add price information
+        if "price" in item or "currency" in item:
+            price_dep = {"type": "price"}
+            if "price" in item:
+                price_dep["amount"] = item["price"]
+            if "currency" in item:
+                price_dep["currency"] = item["currency"]
+            dependency.append(price_dep)
+        
+        # Add stock information
+        if "stock" in item or "is_limited" in item:
+            stock_dep = {"type": "stock"}
+            if "stock" in item:
+                stock_dep["value"] = item["stock"]
+            if "is_limited" in item:
+                stock_dep["is_limited"] = item["is_limited"]
+            dependency.append(stock_dep)
+        
+        # Add ammo count information
+        if "ammo_count" in item:
+            dependency.append({
+                "type": "ammo_count",
+                "value": item["ammo_count"]
+            })
+        
+        # Create edge from trader to item
+        edge = create_edge(
+            name=item_name,
+            direction="out",
+            relation="trader",
+            quantity=1,
+            dependency=dependency if dependency else None
+        )
+        
+        # Reverse edge from item to trader (sold_by)
+        reverse_edge = create_edge(
+            name=trader_name,
+            direction="in",
+            relation="sold_by",
+            quantity=1,
+            dependency=dependency if dependency else None
+        )
+        
+        edge_pairs.append((edge, reverse_edge))
+    
+    return edge_pairs
+
+
+def create_reverse_edge(node_name: str, edge: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Create the edge mirrored onto edge["name"] for an edge of node_name.
+    Returns None for relations without a reverse (trader/sold_by are paired explicitly).
+    """
+    if edge["relation"] not in REVERSE_RELATIONS:
+        return None
+    
+    reverse_relation, reverse_direction = REVERSE_RELATIONS[edge["relation"]]
+    return create_edge(
+        name=node_name,
+        direction=reverse_direction,
+        relation=reverse_relation,
+        quantity=edge.get("quantity"),
+        dependency=edge.get("dependency"),
+        input_level=edge.get("output_level"),  # Swap levels for reverse
+        output_level=edge.get("input_level")
+    )
+
+
 def build_relation_graph(items_database: List[Dict[str, Any]], traders_database: List[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
     """
     Build relation graph from items database and traders database.
@@ -327,22 +456,8 @@ def build_relation_graph(items_database: List[Dict[str, Any]], traders_database:
         if base_name not in nodes:
             continue
         
-        edges = []
-        
-        # Process crafting
-        edges.extend(process_crafting(item_data, base_name))
-        
-        # Process upgrades
-        edges.extend(process_upgrades(item_data, base_name))
-        
-        # Process repairs
-        edges.extend(process_repairs(item_data, base_name))
-        
-        # Process recycling and salvaging
-        edges.extend(process_recycling(item_data, base_name))
-        
         # Merge edges with existing ones
-        nodes[base_name]["edges"].extend(edges)
+        nodes[base_name]["edges"].extend(process_item(item_data, base_name))
     
     # Process traders if provided
     if traders_database:
@@ -360,64 +475,14 @@ def build_relation_graph(items_database: List[Dict[str, Any]], traders_database:
                 image_urls=trader_data.get("image_urls")
             )
             
-            # Add edges from trader to items in shop
-            shop = trader_data.get("shop", [])
-            for item in shop:
-                item_name = item.get("name")
-                if not item_name:
-                    continue
-                
-                # Build dependency list with price/stock info
-                dependency = []
-                
-                # Add price information
-                if "price" in item or "currency" in item:
-                    price_dep = {"type": "price"}
-                    if "price" in item:
-                        price_dep["amount"] = item["price"]
-                    if "currency" in item:
-                        price_dep["currency"] = item["currency"]
-                    dependency.append(price_dep)
-                
-                # Add stock information
-                if "stock" in item or "is_limited" in item:
-                    stock_dep = {"type": "stock"}
-                    if "stock" in item:
-                        stock_dep["value"] = item["stock"]
-                    if "is_limited" in item:
-                        stock_dep["is_limited"] = item["is_limited"]
-                    dependency.append(stock_dep)
-                
-                # Add ammo count information
-                if "ammo_count" in item:
-                    dependency.append({
-                        "type": "ammo_count",
-                        "value": item["ammo_count"]
-                    })
-                
-                # Create edge from trader to item
-                edge = create_edge(
-                    name=item_name,
-                    direction="out",
-                    relation="trader",
-                    quantity=1,
-                    dependency=dependency if dependency else None
-                )
-                
+            # Add edges from trader to items in shop, and sold_by edges back
+            for edge, reverse_edge in process_trader_shop(trader_data, trader_name):
                 nodes[trader_name]["edges"].append(edge)
                 
-                # Add reverse edge from item to trader (sold_by)
+                item_name = edge["name"]
                 if item_name not in nodes:
                     nodes[item_name] = create_node(name=item_name, node_type="item")
                 
-                reverse_edge = create_edge(
-                    name=trader_name,
-                    direction="in",
-                    relation="sold_by",
-                    quantity=1,
-                    dependency=dependency if dependency else None
-                )
-                
                 nodes[item_name]["edges"].append(reverse_edge)
     
     # Third pass: add reverse edges
@@ -429,57 +494,9 @@ def build_relation_graph(items_database: List[Dict[str, Any]], traders_database:
     # Collect all reverse edges first (don't modify nodes dict during iteration)
     for node_name, node in list(nodes.items()):
         for edge in node["edges"]:
-            target_name = edge["name"]
-            
-            # Determine reverse relation
-            relation = edge["relation"]
-            reverse_relation = None
-            reverse_direction = None
-            
-            if relation == "craft_from":
-                reverse_relation = "craft_to"
-                reverse_direction = "out"
-            elif relation == "craft_to":
-                reverse_relation = "craft_from"
-                reverse_direction = "in"
-            elif relation == "upgrade_from":
-                reverse_relation = "upgrade_to"
-                reverse_direction = "out"
-            elif relation == "upgrade_to":
-                reverse_relation = "upgrade_from"
-                reverse_direction = "in"
-            elif relation == "repair_from":
-                reverse_relation = "repair_to"
-                reverse_direction = "out"
-            elif relation == "repair_to":
-                reverse_relation = "repair_from"
-                reverse_direction = "in"
-            elif relation == "recycle_to":
-                reverse_relation = "recycle_from"
-                reverse_direction = "in"
-            elif relation == "recycle_from":
-                reverse_relation = "recycle_to"
-                reverse_direction = "out"
-            elif relation == "salvage_to":
-                reverse_relation = "salvage_from"
-                reverse_direction = "in"
-            elif relation == "salvage_from":
-                reverse_relation = "salvage_to"
-                reverse_direction = "out"
-            
-            if reverse_relation:
-                # Create reverse edge
-                reverse_edge = create_edge(
-                    name=node_name,
-                    direction=reverse_direction,
-                    relation=reverse_relation,
-                    quantity=edge.get("quantity"),
-                    dependency=edge.get("dependency"),
-                    input_level=edge.get("output_level"),  # Swap levels for reverse
-                    output_level=edge.get("input_level")
-                )
-                
-                reverse_edges.append((target_name, reverse_edge))
+            reverse_edge = create_reverse_edge(node_name, edge)
+            if reverse_edge:
+                reverse_edges.append((edge["name"], reverse_edge))
     
     # Create any missing nodes and add reverse edges
     for target_name, edge in reverse_edges:
@@ -490,6 +507,425 @@ def build_relation_graph(items_database: List[Dict[str, Any]], traders_database:
     return nodes
 
 
+def get_forward_edges(records: List[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+    """Forward edges of a node built from all of its item records, in build order."""
+    edges = []
+    for item_data in records:
+        edges.extend(process_item(item_data, name))
+    return edges
+
+
+def split_node_edges(
+    node: Dict[str, Any],
+    own_edge_count: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split a node's edges into the segments a full build appends in order:
+    the node's own edges, sold_by edges from traders, then reverse edges
+    mirrored from other nodes.
+    """
+    edges = node["edges"]
+    rest = edges[own_edge_count:]
+    sold_by = [edge for edge in rest if edge["relation"] == "sold_by"]
+    reverse = [edge for edge in rest if edge["relation"] != "sold_by"]
+    return edges[:own_edge_count], sold_by, reverse
+
+
+def diff_records(old_records: List[Dict[str, Any]], new_records: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Compare two versions of items_database (or traders_database).
+    Returns name -> previous record for every changed, added (None) or removed record,
+    the shape update_relation_graph expects.
+    """
+    old_by_name = {record.get("name"): record for record in old_records if record.get("name")}
+    new_by_name = {record.get("name"): record for record in new_records if record.get("name")}
+    
+    changes = {}
+    for name, record in new_by_name.items():
+        if old_by_name.get(name) != record:
+            changes[name] = old_by_name.get(name)
+    for name, record in old_by_name.items():
+        if name not in new_by_name:
+            changes[name] = record
+    return changes
+
+
+def update_relation_graph(
+    nodes: Dict[str, Dict[str, Any]],
+    items_database: List[Dict[str, Any]],
+    traders_database: List[Dict[str, Any]] = None,
+    previous_items: Dict[str, Optional[Dict[str, Any]]] = None,
+    previous_traders: Dict[str, Optional[Dict[str, Any]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Update a relation graph in place after some items or traders changed.
+    nodes is the graph built from the previous data; items_database and
+    traders_database are the new data. previous_items / previous_traders map
+    the name of every changed, added or removed record to its previous record
+    (None if it was added), e.g. as returned by diff_records.
+    
+    Only the changed nodes and the nodes their old and new edges point to are
+    rebuilt. The result (including node and edge order) is identical to
+    build_relation_graph(items_database, traders_database).
+    """
+    traders_database = traders_database or []
+    previous_items = previous_items or {}
+    previous_traders = previous_traders or {}
+    
+    # Name indexes for the new data, used for ordering
+    records_by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for item_data in items_database:
+        base_name = get_base_item_name(item_data)
+        if base_name:
+            records_by_name.setdefault(base_name, []).append(item_data)
+    item_positions = {name: i for i, name in enumerate(records_by_name)}
+    traders_by_name = {trader.get("name"): trader for trader in traders_database if trader.get("name")}
+    trader_positions = {name: i for i, name in enumerate(traders_by_name)}
+    
+    node_count = len(nodes)
+    nodes_removed = False
+    # Added items and traders that already exist as bare edge-target nodes sit
+    # where their first reference put them; a full build moves them to the front
+    placeholders_promoted = any(
+        previous is None and name in nodes
+        for name, previous in list(previous_items.items()) + list(previous_traders.items())
+    )
+    
+    def own_edge_count(name: str) -> int:
+        """Number of edges a full build puts at the front of the node."""
+        if name in traders_by_name:
+            return len(process_trader_shop(traders_by_name[name], name))
+        return len(get_forward_edges(records_by_name.get(name, []), name))
+    
+    # Rebuild changed item nodes and collect the reverse edges they create
+    reverse_targets: Set[str] = set()
+    new_reverse_edges: Dict[str, List[Dict[str, Any]]] = {}
+    
+    for name in sorted(previous_items, key=lambda n: item_positions.get(n, len(item_positions))):
+        previous = previous_items[name]
+        old_forward = get_forward_edges([previous] if previous else [], name)
+        new_records = records_by_name.get(name, [])
+        new_forward = get_forward_edges(new_records, name)
+        
+        sold_by, reverse = [], []
+        if name in nodes:
+            _, sold_by, reverse = split_node_edges(nodes[name], len(old_forward))
+        
+        if new_records:
+            node = create_node(
+                name=name,
+                node_type="item",
+                wiki_url=new_records[0].get("wiki_url"),
+                source_url=new_records[0].get("source_url"),
+                infobox=new_records[0].get("infobox"),
+                image_urls=new_records[0].get("image_urls")
+            )
+        else:
+            # Removed item: kept as a bare node while something still points to it
+            node = create_node(name=name, node_type="item")
+        node["edges"] = new_forward + sold_by + reverse
+        nodes[name] = node
+        
+        for edge in old_forward:
+            if edge["relation"] in REVERSE_RELATIONS:
+                reverse_targets.add(edge["name"])
+        for edge in new_forward:
+            reverse_edge = create_reverse_edge(name, edge)
+            if reverse_edge:
+                reverse_targets.add(edge["name"])
+                new_reverse_edges.setdefault(edge["name"], []).append(reverse_edge)
+    
+    # Rebuild changed trader nodes and collect their sold_by edges
+    sold_by_targets: Set[str] = set()
+    new_sold_by_edges: Dict[str, List[Dict[str, Any]]] = {}
+    
+    for trader_name, previous in previous_traders.items():
+        old_pairs = process_trader_shop(previous, trader_name) if previous else []
+        trader_data = traders_by_name.get(trader_name)
+        new_pairs = process_trader_shop(trader_data, trader_name) if trader_data else []
+        
+        reverse = []
+        if trader_name in nodes:
+            _, _, reverse = split_node_edges(nodes[trader_name], len(old_pairs))
+        
+        if trader_data:
+            node = create_node(
+                name=trader_name,
+                node_type="trader",
+                wiki_url=trader_data.get("wiki_url"),
+                source_url=trader_data.get("source_url"),
+                image_urls=trader_data.get("image_urls")
+            )
+        else:
+            node = create_node(name=trader_name, node_type="item")
+        node["edges"] = [edge for edge, _ in new_pairs] + reverse
+        nodes[trader_name] = node
+        
+        for edge, _ in old_pairs:
+            sold_by_targets.add(edge["name"])
+        for edge, reverse_edge in new_pairs:
+            sold_by_targets.add(edge["name"])
+            new_sold_by_edges.setdefault(edge["name"], []).append(reverse_edge)
+    
+    # Replace the sold_by edges that came from changed traders
+    for item_name in sold_by_targets:
+        if item_name not in nodes:
+            nodes[item_name] = create_node(name=item_name, node_type="item")
+        own, sold_by, reverse = split_node_edges(nodes[item_name], own_edge_count(item_name))
+        sold_by = [edge for edge in sold_by if edge["name"] not in previous_traders]
+        sold_by.extend(new_sold_by_edges.get(item_name, []))
+        sold_by.sort(key=lambda edge: trader_positions[edge["name"]])
+        nodes[item_name]["edges"] = own + sold_by + reverse
+    
+    # Replace the reverse edges that came from changed items
+    for target_name in reverse_targets:
+        if target_name not in nodes:
+            nodes[target_name] = create_node(name=target_name, node_type="item")
+        own, sold_by, reverse = split_node_edges(nodes[target_name], own_edge_count(target_name))
+        reverse = [edge for edge in reverse if edge["name"] not in previous_items]
+        reverse.extend(new_reverse_edges.get(target_name, []))
+        # A full build appends reverse edges in source node order
+        reverse.sort(key=lambda edge: item_positions[edge["name"]])
+        nodes[target_name]["edges"] = own + sold_by + reverse
+    
+    # Drop bare nodes nothing points to anymore
+    touched = set(previous_items) | set(previous_traders) | reverse_targets | sold_by_targets
+    placeholder_touched = False
+    for name in touched:
+        if name in records_by_name or name in traders_by_name or name not in nodes:
+            continue
+        if nodes[name]["edges"]:
+            placeholder_touched = True
+        else:
+            del nodes[name]
+            nodes_removed = True
+    
+    if nodes_removed or placeholder_touched or placeholders_promoted or len(nodes) != node_count:
+        reorder_nodes(nodes, records_by_name, traders_database)
+    
+    return nodes
+
+
+def reorder_nodes(
+    nodes: Dict[str, Dict[str, Any]],
+    records_by_name: Dict[str, List[Dict[str, Any]]],
+    traders_database: List[Dict[str, Any]]
+) -> None:
+    """
+    Put nodes in the order build_relation_graph creates them: items, then each
+    trader followed by shop items not seen before, then nodes only created as
+    edge targets, in order of the first edge pointing to them.
+    """
+    order = list(records_by_name)
+    seen = set(order)
+    
+    for trader_data in traders_database:
+        trader_name = trader_data.get("name")
+        if not trader_name:
+            continue
+        for name in [trader_name] + [edge["name"] for edge, _ in process_trader_shop(trader_data, trader_name)]:
+            if name not in seen:
+                order.append(name)
+                seen.add(name)
+    
+    item_positions = {name: i for i, name in enumerate(records_by_name)}
+    
+    def first_reference(name: str) -> Tuple[int, int]:
+        # Reverse edges are sorted by source, so the first one is the earliest source
+        source = nodes[name]["edges"][0]["name"]
+        forward = get_forward_edges(records_by_name[source], source)
+        index = next(
+            i for i, edge in enumerate(forward)
+            if edge["name"] == name and edge["relation"] in REVERSE_RELATIONS
+        )
+        return item_positions[source], index
+    
+    order.extend(sorted((name for name in nodes if name not in seen), key=first_reference))
+    
+    ordered = {name: nodes[name] for name in order if name in nodes}
+    nodes.clear()
+    nodes.update(ordered)
+
+
+def update_relation_file(
+    relation_file: Path,
+    items_database: List[Dict[str, Any]],
+    traders_database: List[Dict[str, Any]] = None,
+    previous_items: Dict[str, Optional[Dict[str, Any]]] = None,
+    previous_traders: Dict[str, Optional[Dict[str, Any]]] = None
+) -> None:
+    """
+    Apply an incremental update to an existing relation graph file.
+    Falls back to a full build if the file does not exist yet.
+    """
+    if relation_file.exists():
+        nodes = {node["name"]: node for node in load_relation_graph(relation_file)}
+        update_relation_graph(nodes, items_database, traders_database, previous_items, previous_traders)
+        print(f"Updated relation graph for {len(previous_items or {})} items "
+              f"and {len(previous_traders or {})} traders")
+    else:
+        nodes = build_relation_graph(items_database, traders_database)
+        print(f"Built relation graph with {len(nodes)} nodes")
+    
+    write_json(relation_file, list(nodes.values()))
+    
+    print(f"[OK] Relation graph saved to: {relation_file}")
+
+
+def intern_dependencies(items_relation: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert a relation graph to the interned format: every distinct dependency
+    list is stored once in a shared table and edges refer to it by index.
+    """
+    dependencies: List[List[Dict[str, Any]]] = []
+    dependency_ids: Dict[str, int] = {}
+    nodes = []
+    
+    for node in items_relation:
+        edges = []
+        for edge in node["edges"]:
+            dependency = edge.get("dependency")
+            if dependency is not None:
+                key = json.dumps(dependency, ensure_ascii=False, separators=(',', ':'))
+                if key not in dependency_ids:
+                    dependency_ids[key] = len(dependencies)
+                    dependencies.append(dependency)
+                edge = {k: (dependency_ids[key] if k == "dependency" else v) for k, v in edge.items()}
+            edges.append(edge)
+        nodes.append({**node, "edges": edges})
+    
+    return {"dependencies": dependencies, "nodes": nodes}
+
+
+def rehydrate_relation_graph(interned: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convert an interned relation graph back to the items_relation.json shape.
+    Edges with the same dependency share one list object, so treat them as read-only.
+    """
+    dependencies = interned["dependencies"]
+    items_relation = []
+    for node in interned["nodes"]:
+        edges = [
+            {k: (dependencies[v] if k == "dependency" else v) for k, v in edge.items()}
+            if "dependency" in edge else edge
+            for edge in node["edges"]
+        ]
+        items_relation.append({**node, "edges": edges})
+    return items_relation
+
+
+def load_relation_graph(relation_file: Path) -> List[Dict[str, Any]]:
+    """Read a relation graph file in either the plain or the interned format."""
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return rehydrate_relation_graph(data)
+    return data
+
+
+def get_neighborhood(nodes: Dict[str, Dict[str, Any]], name: str, hops: int = 1) -> List[str]:
+    """
+    Names of the nodes within hops edges of a node (the node first, then breadth-first order).
+    Every edge has a mirrored edge on its target, so following edges reaches both directions.
+    """
+    order = [name]
+    seen = {name}
+    frontier = [name]
+    for _ in range(hops):
+        next_frontier = []
+        for current in frontier:
+            for edge in nodes[current]["edges"]:
+                neighbor = edge["name"]
+                if neighbor not in seen and neighbor in nodes:
+                    seen.add(neighbor)
+                    order.append(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return order
+
+
+def shard_filename(name: str, shard: List[Dict[str, Any]]) -> str:
+    """
+    File name of a node's shard: a URL-safe slug of the name plus a hash of
+    the shard's content, so a shard's URL changes whenever its content does.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "node"
+    content = json.dumps(shard, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return f"{slug}.{hashlib.sha256(content).hexdigest()[:10]}.json"
+
+
+def write_relation_shards(
+    items_relation: List[Dict[str, Any]],
+    shard_dir: Path,
+    hops: int = 1
+) -> Dict[str, Any]:
+    """
+    Write one file per node with the subgraph of every node within hops edges
+    of it (node records plus the edges between them), and index.json mapping
+    node name -> shard file.
+    Returns the index.
+    """
+    nodes = {node["name"]: node for node in items_relation}
+    files_dir = shard_dir / "shards"
+    files_dir.mkdir(parents=True, exist_ok=True)
+    
+    index = {"hops": hops, "nodes": {}}
+    written = set()
+    for name, node in nodes.items():
+        neighborhood = get_neighborhood(nodes, name, hops)
+        members = set(neighborhood)
+        # Induced subgraph: nodes at the edge of the neighborhood keep only edges inside it
+        shard = [
+            {**nodes[member], "edges": [edge for edge in nodes[member]["edges"] if edge["name"] in members]}
+            for member in neighborhood
+        ]
+        filename = shard_filename(name, shard)
+        write_json(files_dir / filename, shard)
+        written.add(filename)
+        index["nodes"][name] = {
+            "file": f"shards/{filename}",
+            "node_type": node.get("node_type", "item"),
+            "edge_count": len(node["edges"])
+        }
+    
+    # Remove shards of earlier builds
+    for path in files_dir.glob('*.json'):
+        if path.name not in written:
+            path.unlink()
+    
+    write_json(shard_dir / "index.json", index)
+    return index
+
+
+def print_graph_statistics(items_relation: List[Dict[str, Any]]) -> None:
+    """Print node and edge counts of a relation graph."""
+    total_edges = sum(len(node["edges"]) for node in items_relation)
+    
+    # Count node types
+    node_types = {}
+    for node in items_relation:
+        node_type = node.get("node_type", "unknown")
+        node_types[node_type] = node_types.get(node_type, 0) + 1
+    
+    print(f"\nStatistics:")
+    print(f"  Total nodes: {len(items_relation)}")
+    for node_type, count in sorted(node_types.items()):
+        print(f"    {node_type}: {count}")
+    print(f"  Total edges: {total_edges}")
+    print(f"  Average edges per node: {total_edges / len(items_relation):.1f}")
+    
+    # Count edge types
+    edge_types = {}
+    for node in items_relation:
+        for edge in node["edges"]:
+            relation = edge["relation"]
+            edge_types[relation] = edge_types.get(relation, 0) + 1
+    
+    print(f"\nEdge types:")
+    for edge_type, count in sorted(edge_types.items()):
+        print(f"  {edge_type}: {count}")
+
+
 def main():
     """Main function to build relation graph."""
     data_dir = Path(__file__).parent.parent / "data"
@@ -497,6 +933,8 @@ def main():
     items_file = data_dir / "items_database.json"
     traders_file = data_dir / "traders_database.json"
     output_file = data_dir / "items_relation.json"
+    interned_file = data_dir / "items_relation_interned.json"
+    shard_dir = Path(__file__).parent.parent / "public" / "relation"
     
     # Check if input file exists
     if not items_file.exists():
@@ -531,38 +969,27 @@ def main():
     items_relation = list(nodes.values())
     
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(items_relation, f, indent=2, ensure_ascii=False)
+    write_json(output_file, items_relation)
     
     print(f"\n[OK] Relation graph saved to: {output_file}")
     print(f"  Total size: {output_file.stat().st_size / 1024:.1f} KB")
     
-    # Print some statistics
-    total_edges = sum(len(node["edges"]) for node in items_relation)
-    
-    # Count node types
-    node_types = {}
-    for node in items_relation:
-        node_type = node.get("node_type", "unknown")
-        node_types[node_type] = node_types.get(node_type, 0) + 1
-    
-    print(f"\nStatistics:")
-    print(f"  Total nodes: {len(items_relation)}")
-    for node_type, count in sorted(node_types.items()):
-        print(f"    {node_type}: {count}")
-    print(f"  Total edges: {total_edges}")
-    print(f"  Average edges per node: {total_edges / len(items_relation):.1f}")
-    
-    # Count edge types
-    edge_types = {}
-    for node in items_relation:
-        for edge in node["edges"]:
-            relation = edge["relation"]
-            edge_types[relation] = edge_types.get(relation, 0) + 1
-    
-    print(f"\nEdge types:")
-    for edge_type, count in sorted(edge_types.items()):
-        print(f"  {edge_type}: {count}")
+    if has_flag('interned'):
+        write_json(interned_file, intern_dependencies(items_relation))
+        print(f"[OK] Interned relation graph saved to: {interned_file}")
+        print(f"  Total size: {interned_file.stat().st_size / 1024:.1f} KB")
+    
+    if has_flag('shards'):
+        hops = int(get_cli_option('hops', '1'))
+        shard_dir = Path(get_cli_option('shard-dir', str(shard_dir)))
+        index = write_relation_shards(items_relation, shard_dir, hops)
+        shard_files = list((shard_dir / "shards").glob('*.json'))
+        total_kb = sum(path.stat().st_size for path in shard_files) / 1024
+        print(f"[OK] {len(index['nodes'])} relation shards ({hops}-hop) saved to: {shard_dir}")
+        print(f"  Average shard size: {total_kb / max(len(shard_files), 1):.1f} KB")
+        print(f"  Index size: {(shard_dir / 'index.json').stat().st_size / 1024:.1f} KB")
+    
+    print_graph_statistics(items_relation)
 
 
 if __name__ == "__main__":
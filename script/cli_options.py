@@ -0,0 +1,26 @@
+"""
+Command-line option helpers shared by the scripts
+Reads --name=value options, --flags and positional arguments from sys.argv without other imports
+"""
+
+import sys
+from typing import List
+
+
+def get_cli_option(name: str, default: str) -> str:
+    """Read a --name=value option from the command line."""
+    prefix = f"--{name}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def has_flag(name: str) -> bool:
+    """Whether --name was passed on the command line."""
+    return f"--{name}" in sys.argv[1:]
+
+
+def get_positional_args() -> List[str]:
+    """Command-line arguments that are not --options (e.g. item names)."""
+    return [arg for arg in sys.argv[1:] if not arg.startswith('--')]
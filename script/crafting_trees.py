@@ -0,0 +1,224 @@
+"""
+Precompute crafting trees and recycle/salvage closures from the relation graph
+Writes data/crafting_trees.json so the transitive traversals run once at build time instead of in the viewer
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from json_output import write_json
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Edge relation followed to break an item down, per closure type
+BREAKDOWN_RELATIONS = {
+    "recycle": "recycle_to",
+    "salvage": "salvage_to"
+}
+
+
+def get_dependency_value(dependency: List[Dict[str, Any]], dependency_type: str) -> Any:
+    """The "value" of the first dependency entry of a type (e.g. output_quantity, ammo_count), or None."""
+    return next((entry.get("value") for entry in dependency or [] if entry.get("type") == dependency_type), None)
+
+
+def group_recipes(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Group an item's craft_from edges into recipes (edges of one recipe share
+    their result level and dependency), in edge order. A recipe that makes
+    more than one unit per craft has its "output_quantity".
+    """
+    recipes: Dict[str, Dict[str, Any]] = {}
+    for edge in node["edges"]:
+        if edge["relation"] != "craft_from":
+            continue
+        key = json.dumps([edge.get("output_level"), edge.get("dependency")], ensure_ascii=False)
+        if key not in recipes:
+            recipe = {}
+            if edge.get("output_level"):
+                recipe["output_level"] = edge["output_level"]
+            if edge.get("dependency"):
+                recipe["dependency"] = edge["dependency"]
+                output_quantity = get_dependency_value(edge["dependency"], "output_quantity")
+                if output_quantity:
+                    recipe["output_quantity"] = output_quantity
+            recipe["materials"] = []
+            recipes[key] = recipe
+        recipes[key]["materials"].append((edge["name"], edge.get("quantity") or 1))
+    return list(recipes.values())
+
+
+def get_breakdown_outputs(node: Dict[str, Any], relation: str) -> List[Tuple[str, int]]:
+    """
+    (item, quantity) produced by recycling or salvaging an item.
+    Items with per-level outputs use their first listed level (the level it is found at).
+    """
+    edges = [edge for edge in node["edges"] if edge["relation"] == relation]
+    if not edges:
+        return []
+    first_level = edges[0].get("input_level")
+    return [
+        (edge["name"], edge.get("quantity") or 1)
+        for edge in edges if edge.get("input_level") == first_level
+    ]
+
+
+class TreeBuilder:
+    """
+    Builds crafting trees and breakdown closures over a relation graph.
+    Subtrees are memoized per item unless they contain a cycle, in which case
+    their shape depends on the path taken to reach them.
+    """
+
+    def __init__(self, nodes: Dict[str, Dict[str, Any]]):
+        self.nodes = nodes
+        self.recipes = {name: group_recipes(node) for name, node in nodes.items()}
+        self.tree_cache: Dict[str, Tuple[List[Dict[str, Any]], int]] = {}
+        self.yield_cache: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def crafting_recipes(self, name: str, path: List[str]) -> Tuple[List[Dict[str, Any]], int, float]:
+        """
+        Recipes of an item with every craftable material expanded recursively.
+        Returns (recipes, crafting depth, lowest path index of a cycle hit or inf).
+        A material already on the path is marked "cycle" and not expanded.
+        """
+        if name in self.tree_cache:
+            recipes, depth = self.tree_cache[name]
+            return recipes, depth, float('inf')
+
+        path.append(name)
+        lowest_cycle = float('inf')
+        depth = 0
+        recipes = []
+        for recipe in self.recipes.get(name, []):
+            materials = []
+            for material_name, quantity in recipe["materials"]:
+                material = {"name": material_name, "quantity": quantity}
+                if material_name in path:
+                    material["cycle"] = True
+                    lowest_cycle = min(lowest_cycle, path.index(material_name))
+                elif self.recipes.get(material_name):
+                    material["recipes"], sub_depth, sub_cycle = self.crafting_recipes(material_name, path)
+                    depth = max(depth, sub_depth)
+                    lowest_cycle = min(lowest_cycle, sub_cycle)
+                materials.append(material)
+            recipes.append({**recipe, "materials": materials})
+        path.pop()
+
+        depth = depth + 1 if recipes else 0
+        # Only cycle-free subtrees are the same on every path
+        if lowest_cycle == float('inf'):
+            self.tree_cache[name] = (recipes, depth)
+        return recipes, depth, lowest_cycle
+
+    def crafting_tree(self, name: str) -> Tuple[List[Dict[str, Any]], int]:
+        """Expanded recipes of an item and its crafting depth (1 if it is made from raw materials only)."""
+        recipes, depth, _ = self.crafting_recipes(name, [])
+        return recipes, depth
+
+    def breakdown_closure(self, name: str, kind: str) -> Dict[str, Any]:
+        """
+        Everything reachable by repeatedly recycling (or salvaging) an item:
+        each reachable item with the step it is first produced at, and the
+        final yield when every output that can be broken down further is.
+        """
+        relation = BREAKDOWN_RELATIONS[kind]
+        items: Dict[str, int] = {}
+        frontier = [name]
+        step = 0
+        while frontier:
+            step += 1
+            next_frontier = []
+            for current in frontier:
+                for output, _ in get_breakdown_outputs(self.nodes[current], relation):
+                    if output not in items and output != name and output in self.nodes:
+                        items[output] = step
+                        next_frontier.append(output)
+            frontier = next_frontier
+
+        final_yield, _ = self.breakdown_yield(name, relation, [])
+        return {
+            "items": [{"name": item, "step": item_step} for item, item_step in items.items()],
+            "yield": [{"name": item, "quantity": quantity} for item, quantity in final_yield.items()]
+        }
+
+    def breakdown_yield(self, name: str, relation: str, path: List[str]) -> Tuple[Dict[str, int], float]:
+        """
+        Total items left after breaking an item down as far as possible.
+        Returns (item -> quantity, lowest path index of a cycle hit or inf). Outputs
+        already on the path are kept as they are instead of being broken down again.
+        """
+        key = (name, relation)
+        if key in self.yield_cache:
+            return self.yield_cache[key], float('inf')
+
+        path.append(name)
+        lowest_cycle = float('inf')
+        totals: Dict[str, int] = {}
+        for output, quantity in get_breakdown_outputs(self.nodes[name], relation):
+            if output in path:
+                lowest_cycle = min(lowest_cycle, path.index(output))
+                sub_yield = {output: 1}
+            elif output in self.nodes and get_breakdown_outputs(self.nodes[output], relation):
+                sub_yield, sub_cycle = self.breakdown_yield(output, relation, path)
+                lowest_cycle = min(lowest_cycle, sub_cycle)
+            else:
+                sub_yield = {output: 1}
+            for item, count in sub_yield.items():
+                totals[item] = totals.get(item, 0) + count * quantity
+        path.pop()
+
+        if lowest_cycle == float('inf'):
+            self.yield_cache[key] = totals
+        return totals, lowest_cycle
+
+
+def build_crafting_trees(items_relation: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Precompute, for every item node, its crafting tree and its recycle and
+    salvage closures. Items with none of these are left out.
+    """
+    nodes = {node["name"]: node for node in items_relation}
+    builder = TreeBuilder(nodes)
+
+    trees = []
+    for name, node in nodes.items():
+        if node.get("node_type") != "item":
+            continue
+        entry: Dict[str, Any] = {"name": name}
+
+        recipes, depth = builder.crafting_tree(name)
+        if recipes:
+            entry["crafting_depth"] = depth
+            entry["crafting_tree"] = recipes
+
+        for kind, relation in BREAKDOWN_RELATIONS.items():
+            if get_breakdown_outputs(node, relation):
+                entry[f"{kind}_closure"] = builder.breakdown_closure(name, kind)
+
+        if len(entry) > 1:
+            trees.append(entry)
+    return trees
+
+
+def main():
+    relation_file = DATA_DIR / "items_relation.json"
+    output_file = DATA_DIR / "crafting_trees.json"
+
+    if not relation_file.exists():
+        print(f"Error: {relation_file} not found!")
+        return
+
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        items_relation = json.load(f)
+
+    trees = build_crafting_trees(items_relation)
+    write_json(output_file, trees)
+
+    print(f"[OK] Crafting trees for {len(trees)} items saved to: {output_file}")
+    print(f"  Total size: {output_file.stat().st_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
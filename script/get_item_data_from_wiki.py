@@ -3,16 +3,77 @@ Fetch and parse item data from ARC Raiders Wiki
 Reads item names from a text file and constructs detailed JSON database
 """
 
-import html
 import json
-import re
+import multiprocessing
+import os
+import queue
+import threading
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from urllib.parse import quote
 
 import requests
-from bs4 import BeautifulSoup
+
+from cli_options import get_cli_option
+from html_extract import configure_backend_from_argv, extract_infobox_image, extract_textarea
+from instrumentation import get_recorder
+from json_output import write_json
+from raw_store import DEFAULT_RAW_STORE, load_raw_sources, save_raw_source, snapshot_corpus
+from wiki_api import MAX_TITLES_PER_REQUEST, chunked, fetch_revision_ids, fetch_wikitext_batch, resolve_image_urls
+from wiki_client import DEFAULT_MIN_INTERVAL, RateLimiter, configure_client_from_argv, get_client
+from wikitext import (
+    BOLD_TEXT,
+    INFOBOX_TEMPLATE,
+    LINE_BREAK,
+    LINK,
+    PAGENAME_QUANTITY,
+    PIPES,
+    PLUS_SEPARATOR,
+    PRICE_TEMPLATE,
+    QUANTITY_LINK,
+    QUANTITY_NAME,
+    QUANTITY_PREFIX,
+    RECYCLING_TEMPLATE,
+    ROMAN_LEVEL,
+    STYLE_ATTRIBUTE,
+    WORKSHOP,
+    build_section_index,
+    tokenize_lines,
+    unescape_and_normalize,
+)
+
+# =============================================================================
+# UPDATE SPECIFIC WEAPONS - Modify this list to update specific items
+# (also used by run_pipeline.py; leave it empty for a full rebuild)
+# =============================================================================
+ITEMS_TO_UPDATE = [
+    # Add item names here to update them
+    # "Light Ammo",
+    # "Medium Ammo",
+    # "Heavy Ammo",
+    # "Shotgun Ammo",
+    # "Launcher Ammo",
+    # "Energy Clip",
+    # "Ruined Augment"
+    # "Firecracker",
+    # "Fireworks Box",
+    "Candleberries"
+]
+
+# Pages waiting between the fetch and parse stages
+PARSE_QUEUE_SIZE = 64
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+# Below this many pages per worker, starting a process costs more than it saves
+MIN_PAGES_PER_PARSE_WORKER = 16
 
 
 def sanitize_item_name_for_url(item_name: str) -> str:
@@ -24,15 +85,10 @@ def clean_text(text: str) -> str:
     """Clean text by decoding HTML entities and normalizing whitespace."""
     if not text:
         return text
-    # Decode HTML entities like &nbsp;, &amp;, etc.
-    text = html.unescape(text)
-    # Remove MediaWiki bold (''') and italic ('') markup
-    text = re.sub(r"'{2,}", '', text)
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    # Remove any text in between < and >, to account for errors with importing data (like if extra hmtl data gets imported accidentally, should be a catch all for it)
-    text = re.sub(r'<[^>]*>', '', text)
-    return text.strip()
+    # Decode HTML entities, remove bold/italic markup, normalize whitespace and
+    # remove any text in between < and >, to account for errors with importing data
+    # (like if extra hmtl data gets imported accidentally, should be a catch all for it)
+    return unescape_and_normalize(text)
 
 
 def parse_infobox(source_text: str, item_name: str) -> Dict[str, Any]:
@@ -40,7 +96,7 @@ def parse_infobox(source_text: str, item_name: str) -> Dict[str, Any]:
     infobox_data = {}
     
     # Find the infobox section
-    infobox_match = re.search(r'\{\{Infobox[^\n]*\n(.*?)\n\}\}', source_text, re.DOTALL)
+    infobox_match = INFOBOX_TEMPLATE.search(source_text)
     
     if not infobox_match:
         return infobox_data
@@ -57,93 +113,90 @@ def parse_infobox(source_text: str, item_name: str) -> Dict[str, Any]:
     function_fields = {}
     
     # Parse each parameter (|key=value)
-    lines = infobox_content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('|') and '=' in line:
-            # Remove leading pipe and split on first =
-            line = line[1:]
-            parts = line.split('=', 1)
-            if len(parts) == 2:
-                key = parts[0].strip()
-                value = parts[1].strip()
-                
-                if not value:
-                    infobox_data[key] = None
-                    continue
-                
-                # Clean up MediaWiki syntax - replace PAGENAME with actual item name
-                value = re.sub(r'\{\{PAGENAME\}\}', item_name, value)
-                
-                # Handle sellprice specially - may have multiple Price tags for weapon levels
-                if key == 'sellprice':
-                    # Extract all prices from {{Price|value}} patterns
-                    prices = re.findall(r'\{\{Price\|([^}]+)\}\}', value)
-                    if prices:
-                        # Convert to integers, removing commas
-                        price_list = []
-                        for p in prices:
-                            p_clean = p.replace(',', '').strip()
-                            try:
-                                price_list.append(int(p_clean))
-                            except ValueError:
-                                pass
-                        
-                        # Store as single value or array
-                        if len(price_list) == 1:
-                            infobox_data[key] = price_list[0]
-                        elif len(price_list) > 1:
-                            infobox_data[key] = price_list
-                        else:
-                            # Fallback if no prices parsed
-                            value_clean = value.replace(',', '').strip()
-                            try:
-                                infobox_data[key] = int(value_clean)
-                            except ValueError:
-                                infobox_data[key] = value
-                    else:
-                        # No Price tags, just parse as integer
-                        value_clean = value.replace(',', '').strip()
-                        try:
-                            infobox_data[key] = int(value_clean)
-                        except ValueError:
-                            infobox_data[key] = value
-                    continue
-                
-                # Remove any remaining Price tags
-                value = re.sub(r'\{\{Price\|([^}]+)\}\}', r'\1', value)
-                
-                # Handle weapon mod function fields (fun1, fun2, fun3, etc.)
-                if key.startswith('fun') and key[3:].isdigit():
-                    function_fields[int(key[3:])] = clean_text(value)
-                    continue
-                
-                # Handle warning field (contains compatible weapons for mods)
-                if key == 'warning':
-                    # Extract weapon names from wiki links [[Weapon]]
-                    weapon_links = re.findall(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', value)
-                    if weapon_links:
-                        infobox_data['compatible_weapons'] = [clean_text(w) for w in weapon_links]
-                    # Also keep the original text
-                    infobox_data[key] = clean_text(value)
-                    continue
-                
-                # Convert numeric fields to appropriate types
-                if key in float_fields:
-                    # Remove percentage signs and try to convert
-                    value_clean = value.replace('%', '').replace(',', '').strip()
+    for token in tokenize_lines(infobox_content):
+        if token.key is None:
+            continue
+        
+        key = token.key
+        value = token.value
+        
+        if not value:
+            infobox_data[key] = None
+            continue
+        
+        # Clean up MediaWiki syntax - replace PAGENAME with actual item name
+        value = value.replace('{{PAGENAME}}', item_name)
+        
+        # Handle sellprice specially - may have multiple Price tags for weapon levels
+        if key == 'sellprice':
+            # Extract all prices from {{Price|value}} patterns
+            prices = PRICE_TEMPLATE.findall(value)
+            if prices:
+                # Convert to integers, removing commas
+                price_list = []
+                for p in prices:
+                    p_clean = p.replace(',', '').strip()
                     try:
-                        infobox_data[key] = float(value_clean)
+                        price_list.append(int(p_clean))
                     except ValueError:
-                        infobox_data[key] = clean_text(value)
-                elif key in int_fields:
+                        pass
+                
+                # Store as single value or array
+                if len(price_list) == 1:
+                    infobox_data[key] = price_list[0]
+                elif len(price_list) > 1:
+                    infobox_data[key] = price_list
+                else:
+                    # Fallback if no prices parsed
                     value_clean = value.replace(',', '').strip()
                     try:
                         infobox_data[key] = int(value_clean)
                     except ValueError:
-                        infobox_data[key] = clean_text(value)
-                else:
-                    infobox_data[key] = clean_text(value)
+                        infobox_data[key] = value
+            else:
+                # No Price tags, just parse as integer
+                value_clean = value.replace(',', '').strip()
+                try:
+                    infobox_data[key] = int(value_clean)
+                except ValueError:
+                    infobox_data[key] = value
+            continue
+        
+        # Remove any remaining Price tags
+        if '{{Price|' in value:
+            value = PRICE_TEMPLATE.sub(r'\1', value)
+        
+        # Handle weapon mod function fields (fun1, fun2, fun3, etc.)
+        if key.startswith('fun') and key[3:].isdigit():
+            function_fields[int(key[3:])] = clean_text(value)
+            continue
+        
+        # Handle warning field (contains compatible weapons for mods)
+        if key == 'warning':
+            # Extract weapon names from wiki links [[Weapon]]
+            weapon_links = LINK.findall(value)
+            if weapon_links:
+                infobox_data['compatible_weapons'] = [clean_text(w) for w in weapon_links]
+            # Also keep the original text
+            infobox_data[key] = clean_text(value)
+            continue
+        
+        # Convert numeric fields to appropriate types
+        if key in float_fields:
+            # Remove percentage signs and try to convert
+            value_clean = value.replace('%', '').replace(',', '').strip()
+            try:
+                infobox_data[key] = float(value_clean)
+            except ValueError:
+                infobox_data[key] = clean_text(value)
+        elif key in int_fields:
+            value_clean = value.replace(',', '').strip()
+            try:
+                infobox_data[key] = int(value_clean)
+            except ValueError:
+                infobox_data[key] = clean_text(value)
+        else:
+            infobox_data[key] = clean_text(value)
     
     # Group function fields into a list (for weapon mods)
     if function_fields:
@@ -157,13 +210,12 @@ def parse_infobox(source_text: str, item_name: str) -> Dict[str, Any]:
 def parse_list_items(section_text: str) -> List[str]:
     """Parse bullet point list items from a section."""
     items = []
-    lines = section_text.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('*'):
+    for token in tokenize_lines(section_text):
+        if token.text.startswith('*'):
             # Remove leading asterisk and wiki links
-            item = line[1:].strip()
-            item = re.sub(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', r'\1', item)
+            item = token.text[1:].strip()
+            if '[[' in item:
+                item = LINK.sub(r'\1', item)
             if item:
                 items.append(clean_text(item))
     return items
@@ -173,15 +225,12 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
     """Parse crafting/upgrade/repair table."""
     recipes = []
     
-    lines = table_text.split('\n')
     current_recipe = {}
     in_row = False
     column_index = 0
     
-    for line in lines:
-        line = line.strip()
-        
-        if line == '|-':
+    for token in tokenize_lines(table_text):
+        if token.kind == "row":
             if current_recipe and any(current_recipe.values()):
                 recipes.append(current_recipe)
             current_recipe = {}
@@ -189,11 +238,11 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
             column_index = 0
             continue
         
-        if not in_row or not line.startswith('|'):
+        if not in_row or token.cell is None:
             continue
         
-        # Remove leading pipe
-        line = line[1:].strip()
+        # Cell content without the leading pipe
+        line = token.cell
         
         # Skip header rows and arrow columns
         if line.startswith('!') or line == "'''→'''" or line == '→':
@@ -202,7 +251,7 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
         # For repair tables, the first column is the item name
         if table_type == 'repair' and column_index == 0:
             # Extract item name from repair table
-            item_match = re.search(r"'''([^']+)'''", line)
+            item_match = BOLD_TEXT.search(line)
             if item_match:
                 current_recipe['item_name'] = clean_text(item_match.group(1))
             column_index += 1
@@ -211,7 +260,7 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
         # Parse the cell content
         # For upgrade tables, first check if this is an input/output level (e.g., "Kettle I")
         # These appear as plain text without wiki links
-        if table_type == 'upgrade' and not '[[' in line and not 'style=' in line and re.search(r'\b(I{1,3}|IV)\b', line):
+        if table_type == 'upgrade' and not '[[' in line and not 'style=' in line and ROMAN_LEVEL.search(line):
             # This might be an input or output level
             level_text = clean_text(line.strip())
             if 'input_level' not in current_recipe:
@@ -227,24 +276,24 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
             materials = []
             input_level = None
             
-            parts = re.split(r'<br>|<br/>', line)
+            parts = LINE_BREAK.split(line)
             for part in parts:
                 # Extract quantity and item name
                 part = part.strip()
                 
                 # Check if this part is an input level (e.g., "Kettle I" for upgrades)
-                if table_type == 'upgrade' and not '[[' in part and re.search(r'\b(I{1,3}|IV)\b', part):
+                if table_type == 'upgrade' and not '[[' in part and ROMAN_LEVEL.search(part):
                     input_level = clean_text(part)
                     continue
                 
-                match = re.search(r"(\d+)x\s*\[\[([^\]|]+)(?:\|[^\]]+)?\]\]", part)
+                match = QUANTITY_LINK.search(part)
                 if match:
                     materials.append({
                         "quantity": int(match.group(1)),
                         "item": clean_text(match.group(2))
                     })
                 elif '[[' in part:
-                    item_match = re.search(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', part)
+                    item_match = LINK.search(part)
                     if item_match:
                         materials.append({"item": clean_text(item_match.group(1))})
             
@@ -258,7 +307,7 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
                     current_recipe['result'] = materials
         
         # Check for workshop level
-        workshop_match = re.search(r'(Workbench|Gunsmith|Medical Lab|Gear Bench|Explosives Station|Utility Station|Refiner|Inventory)\s*(\d+)?', line, re.IGNORECASE)
+        workshop_match = WORKSHOP.search(line)
         if workshop_match:
             workshop = clean_text(workshop_match.group(1))
             level = workshop_match.group(2)
@@ -272,9 +321,9 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
         # Parse upgrade perks (only for upgrade table, not repair)
         if table_type == 'upgrade' and ('style="text-align:left;"' in line or 
                                         ('Increased' in line or 'Reduced' in line) and '[[' not in line):
-            perks_text = re.sub(r'<br>|<br/>', '\n', line)
-            perks_text = re.sub(r'style="[^"]*"', '', perks_text)
-            perks_text = re.sub(r'\|+', '', perks_text)  # Remove leading pipes
+            perks_text = LINE_BREAK.sub('\n', line)
+            perks_text = STYLE_ATTRIBUTE.sub('', perks_text)
+            perks_text = PIPES.sub('', perks_text)  # Remove leading pipes
             perks_text = perks_text.strip()
             if perks_text and '→' not in perks_text:
                 # Split into list of perks
@@ -282,13 +331,13 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
                 current_recipe['upgrade_perks'] = perks_list
         
         # For craft tables that result in specific levels (e.g., "Kettle I")
-        if table_type == 'craft' and not '[[' in line and not 'style=' in line and re.search(r'\b(I{1,3}|IV)\b', line):
+        if table_type == 'craft' and not '[[' in line and not 'style=' in line and ROMAN_LEVEL.search(line):
             current_recipe['result_level'] = clean_text(line.strip())
         
         # Parse output quantity for craft tables (e.g., "25x Light Ammo", "5x {{PAGENAME}}")
         if table_type == 'craft' and not '[[' in line:
             # Check for quantity pattern like "25x Light Ammo" or "6x {{PAGENAME}}"
-            quantity_match = re.search(r'(\d+)x\s*(.+)', line.strip())
+            quantity_match = QUANTITY_PREFIX.search(line.strip())
             if quantity_match:
                 output_quantity = int(quantity_match.group(1))
                 output_item = quantity_match.group(2).strip()
@@ -318,20 +367,16 @@ def parse_recipe_table(table_text: str, table_type: str) -> List[Dict[str, Any]]
 def parse_recycling_wiki_table(table_text: str) -> List[Dict[str, Any]]:
     """Parse a regular wiki table for recycling/salvaging materials."""
     # For simple tables without |- row separators, collect all cells in order
-    lines = table_text.split('\n')
     cells = []
     
-    for line in lines:
-        line = line.strip()
-        
+    for token in tokenize_lines(table_text):
         # Skip table start/end and empty lines
-        if not line or line.startswith('{|') or line == '|}':
+        if token.kind in ("blank", "table_start", "table_end"):
             continue
         
         # Cell lines start with |
-        if line.startswith('|'):
-            # Remove leading pipe
-            cell_content = line[1:].strip()
+        if token.cell is not None:
+            cell_content = token.cell
             
             # Skip arrow cells
             if cell_content == "'''→'''" or cell_content == '→':
@@ -354,34 +399,34 @@ def parse_recycling_wiki_table(table_text: str) -> List[Dict[str, Any]]:
             # Parse input (should contain {{PAGENAME}} or item link)
             input_item = None
             if '{{PAGENAME}}' in input_cell:
-                quantity_match = re.search(r'(\d+)x\s*\{\{PAGENAME\}\}', input_cell)
+                quantity_match = PAGENAME_QUANTITY.search(input_cell)
                 if quantity_match:
                     input_item = f"{quantity_match.group(1)}x {{PAGENAME}}"
                 else:
                     input_item = "1x {{PAGENAME}}"
             else:
                 # Try to extract item from wiki link
-                quantity_match = re.search(r'(\d+)x\s*\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', input_cell)
+                quantity_match = QUANTITY_LINK.search(input_cell)
                 if quantity_match:
                     input_item = f"{quantity_match.group(1)}x {clean_text(quantity_match.group(2))}"
                 else:
-                    item_match = re.search(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', input_cell)
+                    item_match = LINK.search(input_cell)
                     if item_match:
                         input_item = f"1x {clean_text(item_match.group(1))}"
             
             # Parse output materials (may have multiple items separated by <br>)
             output_materials = []
-            parts = re.split(r'<br>|<br/>', output_cell)
+            parts = LINE_BREAK.split(output_cell)
             for part in parts:
                 part = part.strip()
-                match = re.search(r'(\d+)x\s*\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', part)
+                match = QUANTITY_LINK.search(part)
                 if match:
                     output_materials.append({
                         "quantity": int(match.group(1)),
                         "item": clean_text(match.group(2))
                     })
                 elif '[[' in part:
-                    item_match = re.search(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', part)
+                    item_match = LINK.search(part)
                     if item_match:
                         output_materials.append({
                             "quantity": 1,
@@ -409,7 +454,7 @@ def parse_recycling_table(source_text: str) -> Dict[str, Any]:
     }
     
     # Find {{Recycling table ... }}
-    recycling_match = re.search(r'\{\{Recycling table(.*?)\}\}', source_text, re.DOTALL)
+    recycling_match = RECYCLING_TEMPLATE.search(source_text)
     
     if not recycling_match:
         return recycling_data
@@ -417,21 +462,14 @@ def parse_recycling_table(source_text: str) -> Dict[str, Any]:
     content = recycling_match.group(1)
     
     # Parse parameters
-    lines = content.split('\n')
     current_input = None
     
-    for line in lines:
-        line = line.strip()
-        if not line.startswith('|'):
+    for token in tokenize_lines(content):
+        if token.key is None:
             continue
         
-        line = line[1:].strip()
-        if '=' not in line:
-            continue
-        
-        key, value = line.split('=', 1)
-        key = key.strip()
-        value = value.strip()
+        key = token.key
+        value = token.value
         
         if not value:
             continue
@@ -444,9 +482,9 @@ def parse_recycling_table(source_text: str) -> Dict[str, Any]:
         elif key.startswith('recycling'):
             # Parse materials
             materials = []
-            parts = re.split(r'\s*\+\s*', value)
+            parts = PLUS_SEPARATOR.split(value)
             for part in parts:
-                match = re.match(r'(\d+)\s+(.+)', part.strip())
+                match = QUANTITY_NAME.match(part.strip())
                 if match:
                     materials.append({
                         "quantity": int(match.group(1)),
@@ -464,9 +502,9 @@ def parse_recycling_table(source_text: str) -> Dict[str, Any]:
             if not value:
                 continue
             materials = []
-            parts = re.split(r'\s*\+\s*', value)
+            parts = PLUS_SEPARATOR.split(value)
             for part in parts:
-                match = re.match(r'(\d+)\s+(.+)', part.strip())
+                match = QUANTITY_NAME.match(part.strip())
                 if match:
                     materials.append({
                         "quantity": int(match.group(1)),
@@ -482,14 +520,22 @@ def parse_recycling_table(source_text: str) -> Dict[str, Any]:
     return recycling_data
 
 
-def extract_section(source_text: str, section_title: str) -> Optional[str]:
-    """Extract a specific section from MediaWiki source."""
-    # Look for === Section Title ===
-    pattern = rf'===\s*{re.escape(section_title)}\s*===\s*\n(.*?)(?=\n===|\n==|\Z)'
-    match = re.search(pattern, source_text, re.DOTALL | re.IGNORECASE)
+def extract_section(
+    source_text: str,
+    section_title: str,
+    section_index: Optional[Dict[Tuple[int, str], Tuple[int, int]]] = None
+) -> Optional[str]:
+    """
+    Extract a specific === Section Title === from MediaWiki source.
+    Pass the page's build_section_index() result to avoid re-scanning the source per section.
+    """
+    if section_index is None:
+        section_index = build_section_index(source_text)
     
-    if match:
-        return match.group(1).strip()
+    bounds = section_index.get((3, section_title.lower()))
+    if bounds:
+        start, end = bounds
+        return source_text[start:end].strip()
     
     return None
 
@@ -497,26 +543,17 @@ def extract_section(source_text: str, section_title: str) -> Optional[str]:
 def extract_image_url_from_wiki_page(wiki_url: str) -> Optional[Dict[str, str]]:
     """Fetch the wiki page and extract the actual image URL from the infobox."""
     try:
-        response = requests.get(wiki_url)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = get_client().get(wiki_url)
         
-        # Find the infobox image
-        infobox_image = soup.find('tr', class_=lambda x: x and 'infobox-image' in x)
+        # Find the img tag in the infobox image row
+        infobox_image = extract_infobox_image(response.content)
         
         if not infobox_image:
             return None
         
-        # Find the img tag
-        img_tag = infobox_image.find('img')
-        
-        if not img_tag:
-            return None
-        
         # Get the src (webp thumb) and srcset (higher resolution)
-        src = img_tag.get('src', '')
-        srcset = img_tag.get('srcset', '')
+        src = infobox_image['src']
+        srcset = infobox_image['srcset']
         
         image_urls = {}
         
@@ -533,9 +570,8 @@ def extract_image_url_from_wiki_page(wiki_url: str) -> Optional[Dict[str, str]]:
                 image_urls['original'] = f"https://arcraiders.wiki{original_path}"
         
         # Also try to get the file page link
-        file_link = infobox_image.find('a', href=lambda x: x and '/wiki/File:' in x)
-        if file_link:
-            image_urls['file_page'] = f"https://arcraiders.wiki{file_link.get('href', '')}"
+        if infobox_image['file_href']:
+            image_urls['file_page'] = f"https://arcraiders.wiki{infobox_image['file_href']}"
         
         return image_urls if image_urls else None
         
@@ -544,8 +580,127 @@ def extract_image_url_from_wiki_page(wiki_url: str) -> Optional[Dict[str, str]]:
         return None
 
 
-def parse_item_from_wiki(item_name: str, delay: float = 0.5, include_raw: bool = False) -> Optional[Dict[str, Any]]:
-    """Fetch and parse a single item from the wiki."""
+def fetch_item_source(source_url: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    """Fetch the edit page and return the wikitext from its source textarea."""
+    if rate_limiter:
+        rate_limiter.wait()
+    response = get_client().get(source_url)
+    
+    # Find the textarea with source code
+    return extract_textarea(response.content)
+
+
+def parse_item_source(item_name: str, source_text: str, include_raw: bool = False) -> Dict[str, Any]:
+    """
+    Parse an item page's wikitext into an item record (without image URLs).
+    Pure CPU work with no network access, so it can run in a worker process.
+    """
+    url_name = sanitize_item_name_for_url(item_name)
+    source_url = f"https://arcraiders.wiki/w/index.php?title={quote(url_name)}&action=edit"
+    wiki_url = f"https://arcraiders.wiki/wiki/{quote(url_name)}"
+    
+    # Parse the data
+    item_data = {
+        "name": item_name,
+        "wiki_url": wiki_url,
+        "source_url": source_url,
+    }
+    
+    # Index the page's sections once for all section lookups below
+    section_index = build_section_index(source_text)
+    
+    # Parse infobox
+    infobox = parse_infobox(source_text, item_name)
+    if infobox:
+        item_data["infobox"] = infobox
+    
+    # Parse sources section
+    sources_section = extract_section(source_text, 'Sources', section_index)
+    if sources_section:
+        item_data["sources"] = parse_list_items(sources_section)
+    
+    # Parse crafting section
+    crafting_section = extract_section(source_text, 'Required Materials to Craft', section_index)
+    if crafting_section:
+        recipes = parse_recipe_table(crafting_section, 'craft')
+        if recipes:
+            item_data["crafting"] = recipes
+    
+    # Parse upgrade section (for weapons/augments)
+    upgrade_section = extract_section(source_text, 'Required Materials to Upgrade', section_index)
+    if upgrade_section:
+        upgrades = parse_recipe_table(upgrade_section, 'upgrade')
+        if upgrades:
+            item_data["upgrades"] = upgrades
+    
+    # Parse repair section
+    repair_section = extract_section(source_text, 'Required Materials to Repair', section_index)
+    if repair_section:
+        repairs = parse_recipe_table(repair_section, 'repair')
+        if repairs:
+            item_data["repairs"] = repairs
+    
+    # Parse recycling section (template format)
+    recycling_data = parse_recycling_table(source_text)
+    if recycling_data['recycling'] or recycling_data['salvaging']:
+        item_data["recycling"] = recycling_data
+    
+    # Parse recycling section (wiki table format)
+    if not recycling_data['recycling']:
+        recycled_section = extract_section(source_text, 'Recycled Material', section_index)
+        if recycled_section:
+            recycled_materials = parse_recycling_wiki_table(recycled_section)
+            if recycled_materials:
+                if "recycling" not in item_data:
+                    item_data["recycling"] = {"recycling": [], "salvaging": []}
+                item_data["recycling"]["recycling"] = recycled_materials
+    
+    # Parse salvaging section (wiki table format)
+    if not recycling_data['salvaging']:
+        salvaged_section = extract_section(source_text, 'Salvaged Material', section_index)
+        if salvaged_section:
+            salvaged_materials = parse_recycling_wiki_table(salvaged_section)
+            if salvaged_materials:
+                if "recycling" not in item_data:
+                    item_data["recycling"] = {"recycling": [], "salvaging": []}
+                item_data["recycling"]["salvaging"] = salvaged_materials
+    
+    # Replace {PAGENAME} placeholders with actual item name in recycling data
+    if "recycling" in item_data:
+        for recycle_entry in item_data["recycling"].get("recycling", []):
+            if "input" in recycle_entry:
+                recycle_entry["input"] = recycle_entry["input"].replace("{PAGENAME}", item_name)
+        for salvage_entry in item_data["recycling"].get("salvaging", []):
+            if "input" in salvage_entry:
+                salvage_entry["input"] = salvage_entry["input"].replace("{PAGENAME}", item_name)
+    
+    # Replace {{PAGENAME}} placeholders in crafting output
+    if "crafting" in item_data:
+        for craft_entry in item_data["crafting"]:
+            if "output_item" in craft_entry and craft_entry["output_item"] == "{{PAGENAME}}":
+                craft_entry["output_item"] = item_name
+    
+    # Store raw source for reference (optional, makes file much larger)
+    if include_raw:
+        item_data["raw_source"] = source_text
+    
+    return item_data
+
+
+def parse_item_from_wiki(
+    item_name: str,
+    delay: float = 0.5,
+    include_raw: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    source_text: Optional[str] = None,
+    fetch_images: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch and parse a single item from the wiki.
+    If a rate_limiter is given it replaces the fixed per-item sleeps.
+    If source_text is given (e.g. from the API backend) the edit page is not fetched.
+    With fetch_images=False image URLs are left for the caller to resolve in batch.
+    """
     print(f"Processing: {item_name}")
     
     url_name = sanitize_item_name_for_url(item_name)
@@ -553,116 +708,33 @@ def parse_item_from_wiki(item_name: str, delay: float = 0.5, include_raw: bool =
     wiki_url = f"https://arcraiders.wiki/wiki/{quote(url_name)}"
     
     try:
-        # Fetch the edit page to get source
-        response = requests.get(source_url)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the textarea with source code
-        textarea = soup.find('textarea', {'id': 'wpTextbox1'})
+        if source_text is None:
+            source_text = fetch_item_source(source_url, rate_limiter)
         
-        if not textarea:
+        if source_text is None:
             print(f"  [!] Could not find source for {item_name}")
             return None
         
-        source_text = textarea.get_text()
+        item_data = parse_item_source(item_name, source_text, include_raw)
         
-        # Parse the data
-        item_data = {
-            "name": item_name,
-            "wiki_url": wiki_url,
-            "source_url": source_url,
-        }
-        
-        # Parse infobox
-        infobox = parse_infobox(source_text, item_name)
-        if infobox:
-            item_data["infobox"] = infobox
-            
-            # Fetch actual image URLs from the wiki page
-            if 'image' in infobox and infobox['image']:
-                # Small delay between requests to be respectful
+        # Fetch actual image URLs from the wiki page
+        infobox = item_data.get("infobox")
+        if fetch_images and infobox and infobox.get('image'):
+            # Small delay between requests to be respectful
+            if rate_limiter:
+                rate_limiter.wait()
+            else:
                 time.sleep(0.2)
-                print(f"  -> Fetching image URL from wiki page...")
-                image_urls = extract_image_url_from_wiki_page(wiki_url)
-                if image_urls:
-                    item_data["image_urls"] = image_urls
-        
-        # Parse sources section
-        sources_section = extract_section(source_text, 'Sources')
-        if sources_section:
-            item_data["sources"] = parse_list_items(sources_section)
-        
-        # Parse crafting section
-        crafting_section = extract_section(source_text, 'Required Materials to Craft')
-        if crafting_section:
-            recipes = parse_recipe_table(crafting_section, 'craft')
-            if recipes:
-                item_data["crafting"] = recipes
-        
-        # Parse upgrade section (for weapons/augments)
-        upgrade_section = extract_section(source_text, 'Required Materials to Upgrade')
-        if upgrade_section:
-            upgrades = parse_recipe_table(upgrade_section, 'upgrade')
-            if upgrades:
-                item_data["upgrades"] = upgrades
-        
-        # Parse repair section
-        repair_section = extract_section(source_text, 'Required Materials to Repair')
-        if repair_section:
-            repairs = parse_recipe_table(repair_section, 'repair')
-            if repairs:
-                item_data["repairs"] = repairs
-        
-        # Parse recycling section (template format)
-        recycling_data = parse_recycling_table(source_text)
-        if recycling_data['recycling'] or recycling_data['salvaging']:
-            item_data["recycling"] = recycling_data
-        
-        # Parse recycling section (wiki table format)
-        if not recycling_data['recycling']:
-            recycled_section = extract_section(source_text, 'Recycled Material')
-            if recycled_section:
-                recycled_materials = parse_recycling_wiki_table(recycled_section)
-                if recycled_materials:
-                    if "recycling" not in item_data:
-                        item_data["recycling"] = {"recycling": [], "salvaging": []}
-                    item_data["recycling"]["recycling"] = recycled_materials
-        
-        # Parse salvaging section (wiki table format)
-        if not recycling_data['salvaging']:
-            salvaged_section = extract_section(source_text, 'Salvaged Material')
-            if salvaged_section:
-                salvaged_materials = parse_recycling_wiki_table(salvaged_section)
-                if salvaged_materials:
-                    if "recycling" not in item_data:
-                        item_data["recycling"] = {"recycling": [], "salvaging": []}
-                    item_data["recycling"]["salvaging"] = salvaged_materials
-        
-        # Replace {PAGENAME} placeholders with actual item name in recycling data
-        if "recycling" in item_data:
-            for recycle_entry in item_data["recycling"].get("recycling", []):
-                if "input" in recycle_entry:
-                    recycle_entry["input"] = recycle_entry["input"].replace("{PAGENAME}", item_name)
-            for salvage_entry in item_data["recycling"].get("salvaging", []):
-                if "input" in salvage_entry:
-                    salvage_entry["input"] = salvage_entry["input"].replace("{PAGENAME}", item_name)
-        
-        # Replace {{PAGENAME}} placeholders in crafting output
-        if "crafting" in item_data:
-            for craft_entry in item_data["crafting"]:
-                if "output_item" in craft_entry and craft_entry["output_item"] == "{{PAGENAME}}":
-                    craft_entry["output_item"] = item_name
-        
-        # Store raw source for reference (optional, makes file much larger)
-        if include_raw:
-            item_data["raw_source"] = source_text
+            print(f"  -> Fetching image URL for {item_name}...")
+            image_urls = extract_image_url_from_wiki_page(wiki_url)
+            if image_urls:
+                attach_image_urls(item_data, image_urls)
         
         print(f"  [OK] Successfully parsed {item_name}")
         
         # Be respectful to the server (we made 2 requests: source + wiki page)
-        time.sleep(delay)
+        if not rate_limiter:
+            time.sleep(delay)
         
         return item_data
         
@@ -676,7 +748,336 @@ def parse_item_from_wiki(item_name: str, delay: float = 0.5, include_raw: bool =
         return None
 
 
-def update_specific_items(item_names: List[str], include_raw: bool = False) -> None:
+def attach_image_urls(item_data: Dict[str, Any], image_urls: Dict[str, str]) -> None:
+    """Set item_data["image_urls"] right after the infobox, where the scraper puts it."""
+    entries = list(item_data.items())
+    item_data.clear()
+    for key, value in entries:
+        if key != "image_urls":
+            item_data[key] = value
+        if key == "infobox":
+            item_data["image_urls"] = image_urls
+
+
+def resolve_item_images(
+    items: List[Dict[str, Any]],
+    rate_limiter: Optional[RateLimiter] = None,
+    use_api: bool = True
+) -> None:
+    """
+    Resolve infobox images for many items with batched imageinfo queries.
+    Items the API cannot resolve (or all items, with use_api=False) fall back
+    to scraping their wiki page.
+    """
+    wanted = [item for item in items if item.get("infobox", {}).get("image")]
+    if not wanted:
+        return
+    
+    image_urls = {}
+    if use_api:
+        print(f"\nResolving {len(wanted)} image URLs via the MediaWiki API...")
+        try:
+            image_urls = resolve_image_urls(
+                [item["infobox"]["image"] for item in wanted],
+                rate_limiter=rate_limiter
+            )
+        except (requests.RequestException, ValueError) as e:
+            print(f"  [WARNING] Image API failed, falling back to wiki pages: {e}")
+    else:
+        print(f"\nFetching {len(wanted)} image URLs from wiki pages...")
+    
+    for item_data in wanted:
+        urls = image_urls.get(item_data["infobox"]["image"])
+        if not urls:
+            print(f"  -> Fetching image URL for {item_data['name']}...")
+            if rate_limiter:
+                rate_limiter.wait()
+            urls = extract_image_url_from_wiki_page(item_data["wiki_url"])
+        if urls:
+            attach_image_urls(item_data, urls)
+
+
+def fetch_edit_source(item_name: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    """Fetch one item's wikitext from its edit page, or None if it could not be loaded."""
+    url_name = sanitize_item_name_for_url(item_name)
+    source_url = f"https://arcraiders.wiki/w/index.php?title={quote(url_name)}&action=edit"
+    try:
+        source_text = fetch_item_source(source_url, rate_limiter)
+    except requests.RequestException as e:
+        print(f"  [ERROR] Error fetching {item_name}: {e}")
+        return None
+    if source_text is None:
+        print(f"  [!] Could not find source for {item_name}")
+    return source_text
+
+
+def fetch_sources(
+    item_names: List[str],
+    source_queue: queue.Queue,
+    backend: str = "api",
+    workers: int = 1,
+    rate_limiter: Optional[RateLimiter] = None,
+    revisions: Optional[Dict[str, int]] = None,
+    raw_store: Optional[Path] = DEFAULT_RAW_STORE
+) -> None:
+    """
+    Fetch stage: put (item name, wikitext or None) on source_queue for every
+    name, followed by None once all pages are fetched.
+    The "api" backend loads pages 50 at a time and falls back to the edit page
+    for titles it could not resolve; "edit" scrapes every edit page.
+    Every page is also written to raw_store for --parse-only runs.
+    """
+    def emit(item_name: str, source_text: Optional[str]) -> None:
+        if source_text is not None and raw_store is not None:
+            save_raw_source(item_name, source_text, raw_store)
+        source_queue.put((item_name, source_text))
+    
+    try:
+        remaining = item_names
+        if backend == "api":
+            print(f"Fetching wikitext for {len(item_names)} pages via the MediaWiki API...")
+            remaining = []
+            for batch in chunked(item_names, MAX_TITLES_PER_REQUEST):
+                pages = {}
+                try:
+                    pages = fetch_wikitext_batch(batch, rate_limiter=rate_limiter)
+                except (requests.RequestException, ValueError) as e:
+                    print(f"  [WARNING] API fetch failed, falling back to edit pages: {e}")
+                for item_name in batch:
+                    page = pages.get(item_name)
+                    if not page:
+                        remaining.append(item_name)
+                        continue
+                    if revisions is not None and page.get("revid"):
+                        revisions[item_name] = page["revid"]
+                    emit(item_name, page["source"])
+            if remaining:
+                print(f"  -> {len(remaining)} pages will use the edit page")
+        
+        if workers <= 1:
+            for item_name in remaining:
+                emit(item_name, fetch_edit_source(item_name, rate_limiter))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sources = executor.map(lambda name: fetch_edit_source(name, rate_limiter), remaining)
+                for item_name, source_text in zip(remaining, sources):
+                    emit(item_name, source_text)
+    finally:
+        source_queue.put(None)
+
+
+def plan_parse_workers(parse_workers: int, total: int) -> int:
+    """Number of parse processes worth starting for total pages (1 means parse inline)."""
+    return max(1, min(parse_workers, total // MIN_PAGES_PER_PARSE_WORKER))
+
+
+def get_parse_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for parse processes. The fetch thread is already running when
+    the pool starts, so workers must not be forked from this process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def parse_sources(
+    source_queue: queue.Queue,
+    total: int,
+    include_raw: bool = False,
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Parse stage: parse every (item name, wikitext) taken from source_queue until None.
+    With parse_workers > 1 and enough pages, pages are parsed in a process pool while
+    the fetch stage keeps filling the queue; small runs are parsed inline.
+    Returns item name -> parsed item, or None if it failed.
+    """
+    parse_workers = plan_parse_workers(parse_workers, total)
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    
+    def record(item_name: str, parse: Optional[Callable[[], Dict[str, Any]]]) -> None:
+        item_data = None
+        if parse is not None:
+            try:
+                item_data = parse()
+            except Exception as e:
+                print(f"  [ERROR] Error parsing {item_name}: {e}")
+        results[item_name] = item_data
+        status = "[OK] Parsed" if item_data else "[FAILED]"
+        print(f"[{len(results)}/{total}] {status} {item_name}")
+    
+    if parse_workers <= 1:
+        while True:
+            entry = source_queue.get()
+            if entry is None:
+                break
+            item_name, source_text = entry
+            if source_text is None:
+                record(item_name, None)
+            else:
+                record(item_name, lambda: parse_item_source(item_name, source_text, include_raw))
+        return results
+    
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=get_parse_context()) as pool:
+        pending: Dict[Future, str] = {}
+        while True:
+            entry = source_queue.get()
+            if entry is None:
+                break
+            item_name, source_text = entry
+            if source_text is None:
+                record(item_name, None)
+                continue
+            pending[pool.submit(parse_item_source, item_name, source_text, include_raw)] = item_name
+            # Keep a couple of pages per worker in flight, the queue holds the rest
+            if len(pending) >= parse_workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(pending.pop(future), future.result)
+        for future in as_completed(pending):
+            record(pending[future], future.result)
+    
+    return results
+
+
+def collect_results(
+    item_names: List[str],
+    results: Dict[str, Optional[Dict[str, Any]]]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Split parse results into (items in the order of item_names, names that failed)."""
+    items = []
+    failed_items = []
+    for item_name in item_names:
+        item_data = results.get(item_name)
+        if item_data:
+            items.append(item_data)
+        else:
+            failed_items.append(item_name)
+    return items, failed_items
+
+
+def fetch_items(
+    item_names: List[str],
+    include_raw: bool = False,
+    workers: int = 1,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    backend: str = "api",
+    revisions: Optional[Dict[str, int]] = None,
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Fetch and parse items.
+    A fetch thread (with workers concurrent edit-page requests) feeds page
+    sources through a bounded queue to the parse stage, which runs in
+    parse_workers processes; image URLs are resolved once parsing is done.
+    If revisions is given it is filled with item name -> revision ID for pages
+    loaded through the API.
+    Returns (parsed items in the order of item_names, names that failed).
+    """
+    if get_client().offline:
+        # Everything is replayed from the cache, no need to be polite
+        rate_limiter = RateLimiter(0)
+    else:
+        rate_limiter = RateLimiter(min_interval)
+    
+    if workers > 1:
+        print(f"Fetching with {workers} workers (min {min_interval:.2f}s between requests)")
+    parse_workers = plan_parse_workers(parse_workers, len(item_names))
+    if parse_workers > 1:
+        print(f"Parsing with {parse_workers} processes")
+    print()
+    
+    def fetch() -> None:
+        with get_recorder().span("fetch") as span:
+            fetch_sources(item_names, source_queue, backend, workers, rate_limiter, revisions)
+            span["pages"] = len(item_names)
+    
+    source_queue: queue.Queue = queue.Queue(maxsize=PARSE_QUEUE_SIZE)
+    fetcher = threading.Thread(target=fetch, daemon=True)
+    fetcher.start()
+    # The fetch thread's requests are counted in its own span
+    with get_recorder().span("parse", http=False) as span:
+        results = parse_sources(source_queue, len(item_names), include_raw, parse_workers)
+        span["pages"] = len(results)
+    fetcher.join()
+    
+    items, failed_items = collect_results(item_names, results)
+    with get_recorder().span("images"):
+        resolve_item_images(items, rate_limiter=rate_limiter, use_api=backend == "api")
+    
+    return items, failed_items
+
+
+def parse_raw_store(
+    item_names: List[str],
+    raw_store: Path = DEFAULT_RAW_STORE,
+    include_raw: bool = False,
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Re-parse items from the local raw-source store without any network access.
+    Returns (parsed items in the order of item_names, names that failed).
+    """
+    sources = load_raw_sources(raw_store, item_names)
+    print(f"Loaded {len(sources)} page sources from {raw_store}")
+    parse_workers = plan_parse_workers(parse_workers, len(item_names))
+    if parse_workers > 1:
+        print(f"Parsing with {parse_workers} processes")
+    print()
+    
+    source_queue: queue.Queue = queue.Queue(maxsize=PARSE_QUEUE_SIZE)
+    
+    def feed() -> None:
+        for item_name in item_names:
+            source_queue.put((item_name, sources.get(item_name)))
+        source_queue.put(None)
+    
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    with get_recorder().span("parse", http=False) as span:
+        results = parse_sources(source_queue, len(item_names), include_raw, parse_workers)
+        span["pages"] = len(results)
+    feeder.join()
+    
+    return collect_results(item_names, results)
+
+
+def get_revisions_file(database_file: Path) -> Path:
+    """Path of the file recording the wiki revision each database entry was parsed from."""
+    return database_file.with_name(database_file.name.replace('_database.json', '_revisions.json'))
+
+
+def load_revisions(revisions_file: Path) -> Dict[str, int]:
+    """Load the item name -> revision ID map, or an empty map if there is none."""
+    if not revisions_file.exists():
+        return {}
+    with open(revisions_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_revisions(revisions_file: Path, revisions: Dict[str, int]) -> None:
+    """Save the item name -> revision ID map."""
+    write_json(revisions_file, dict(sorted(revisions.items())))
+
+
+def merge_items(items_database: List[Dict[str, Any]], fetched_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Update or add fetched items in a database list; new items are appended."""
+    # Create a dictionary for quick lookup
+    items_dict = {item['name']: item for item in items_database}
+    for item_data in fetched_items:
+        items_dict[item_data['name']] = item_data
+    return list(items_dict.values())
+
+
+def update_specific_items(
+    item_names: List[str],
+    include_raw: bool = False,
+    workers: int = 1,
+    backend: str = "api",
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+) -> None:
     """Update specific items in the database."""
     data_dir = Path(__file__).parent.parent / "data"
     database_file = data_dir / "items_database.json"
@@ -690,32 +1091,22 @@ def update_specific_items(item_names: List[str], include_raw: bool = False) -> N
         items_database = []
         print("No existing database found, creating new one")
     
-    # Create a dictionary for quick lookup
-    items_dict = {item['name']: item for item in items_database}
-    
     print(f"\nUpdating {len(item_names)} specific items:\n")
     
-    updated_items = []
-    failed_items = []
-    
-    for i, item_name in enumerate(item_names, 1):
-        print(f"[{i}/{len(item_names)}] ", end='')
-        
-        item_data = parse_item_from_wiki(item_name, include_raw=include_raw)
-        
-        if item_data:
-            # Update or add the item
-            items_dict[item_data['name']] = item_data
-            updated_items.append(item_data['name'])
-        else:
-            failed_items.append(item_name)
+    fetched_items, failed_items = fetch_items(
+        item_names,
+        include_raw=include_raw,
+        workers=workers,
+        backend=backend,
+        min_interval=min_interval,
+        parse_workers=parse_workers
+    )
     
-    # Convert back to list
-    items_database = list(items_dict.values())
+    items_database = merge_items(items_database, fetched_items)
+    updated_items = [item_data['name'] for item_data in fetched_items]
     
     # Save to JSON
-    with open(database_file, 'w', encoding='utf-8') as f:
-        json.dump(items_database, f, indent=2, ensure_ascii=False)
+    write_json(database_file, items_database)
     
     print(f"\n{'='*60}")
     print(f"[OK] Successfully updated: {len(updated_items)} items")
@@ -731,6 +1122,123 @@ def update_specific_items(item_names: List[str], include_raw: bool = False) -> N
     print(f"\n[OK] Database saved to: {database_file}")
     print(f"  Total items: {len(items_database)}")
     print(f"  Total size: {database_file.stat().st_size / 1024:.1f} KB")
+    
+    get_client().print_stats()
+
+
+def update_changed_items(
+    include_raw: bool = False,
+    workers: int = 1,
+    backend: str = "api",
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+) -> List[str]:
+    """
+    Incrementally refresh items_database.json.
+    Compares the current wiki revision of every page in names.txt with the
+    revision each item was last parsed from, re-parses only pages that changed
+    (or are new), then re-applies manual adjustments and updates the relation graph
+    for just those items.
+    Returns the names of the items that were updated.
+    """
+    from adjust_item_data import apply_item_adjustments, load_special_types_map
+    import build_relation_graph
+    
+    data_dir = Path(__file__).parent.parent / "data"
+    names_file = data_dir / "names.txt"
+    database_file = data_dir / "items_database.json"
+    revisions_file = get_revisions_file(database_file)
+    
+    with open(names_file, 'r', encoding='utf-8') as f:
+        item_names = [line.strip() for line in f if line.strip()]
+    
+    items_database = []
+    if database_file.exists():
+        with open(database_file, 'r', encoding='utf-8') as f:
+            items_database = json.load(f)
+    items_dict = {item['name']: item for item in items_database}
+    stored_revisions = load_revisions(revisions_file)
+    
+    print(f"Checking revisions of {len(item_names)} pages...")
+    current_revisions = fetch_revision_ids(item_names)
+    
+    changed_names = [
+        name for name in item_names
+        if name not in items_dict
+        or name not in current_revisions
+        or stored_revisions.get(name) != current_revisions[name]
+    ]
+    listed_names = set(item_names)
+    removed_names = [name for name in items_dict if name not in listed_names]
+    
+    print(f"  -> {len(changed_names)} changed, {len(removed_names)} removed, "
+          f"{len(item_names) - len(changed_names)} unchanged")
+    
+    if not changed_names and not removed_names:
+        print("\n[OK] Database is up to date")
+        return []
+    
+    fetched_revisions = {}
+    fetched_items, failed_items = fetch_items(
+        changed_names,
+        include_raw=include_raw,
+        workers=workers,
+        backend=backend,
+        min_interval=min_interval,
+        revisions=fetched_revisions,
+        parse_workers=parse_workers
+    )
+    
+    # New items get the same manual corrections as a full pipeline run
+    apply_item_adjustments(fetched_items, load_special_types_map(data_dir))
+    
+    # Previous record of every changed/added/removed item, for the graph update
+    previous_items = {item_data['name']: items_dict.get(item_data['name']) for item_data in fetched_items}
+    previous_items.update({name: items_dict[name] for name in removed_names})
+    
+    for item_data in fetched_items:
+        items_dict[item_data['name']] = item_data
+        stored_revisions[item_data['name']] = fetched_revisions.get(
+            item_data['name'],
+            current_revisions.get(item_data['name'])
+        )
+    for name in removed_names:
+        del items_dict[name]
+        stored_revisions.pop(name, None)
+    
+    # Keep names.txt order, like a full rebuild
+    items_database = [items_dict[name] for name in item_names if name in items_dict]
+    
+    write_json(database_file, items_database)
+    save_revisions(revisions_file, stored_revisions)
+    
+    print(f"\n{'='*60}")
+    print(f"[OK] Updated {len(fetched_items)} items, removed {len(removed_names)}")
+    for item_data in fetched_items:
+        print(f"  + {item_data['name']}")
+    for name in removed_names:
+        print(f"  - {name}")
+    if failed_items:
+        print(f"\n[FAILED] Failed: {len(failed_items)} items (will be retried next run)")
+        for item in failed_items:
+            print(f"  - {item}")
+    
+    print("\nUpdating relation graph...")
+    traders_file = data_dir / "traders_database.json"
+    traders_database = None
+    if traders_file.exists():
+        with open(traders_file, 'r', encoding='utf-8') as f:
+            traders_database = json.load(f)
+    build_relation_graph.update_relation_file(
+        data_dir / "items_relation.json",
+        items_database,
+        traders_database,
+        previous_items=previous_items
+    )
+    
+    get_client().print_stats()
+    
+    return [item_data['name'] for item_data in fetched_items]
 
 
 def main():
@@ -740,6 +1248,10 @@ def main():
     # Parse command line arguments
     import sys
     include_raw = '--include-raw' in sys.argv
+    workers = int(get_cli_option('workers', '1'))
+    min_interval = float(get_cli_option('min-interval', str(DEFAULT_MIN_INTERVAL)))
+    backend = get_cli_option('backend', 'api')
+    parse_workers = int(get_cli_option('parse-workers', str(DEFAULT_PARSE_WORKERS)))
     args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
     
     if args:
@@ -762,22 +1274,28 @@ def main():
     print(f"Found {len(item_names)} items to process\n")
     
     # Process each item
-    items_database = []
-    failed_items = []
-    
-    for i, item_name in enumerate(item_names, 1):
-        print(f"[{i}/{len(item_names)}] ", end='')
-        
-        item_data = parse_item_from_wiki(item_name, include_raw=include_raw)
-        
-        if item_data:
-            items_database.append(item_data)
-        else:
-            failed_items.append(item_name)
+    revisions = {}
+    items_database, failed_items = fetch_items(
+        item_names,
+        include_raw=include_raw,
+        workers=workers,
+        min_interval=min_interval,
+        backend=backend,
+        revisions=revisions,
+        parse_workers=parse_workers
+    )
     
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(items_database, f, indent=2, ensure_ascii=False)
+    write_json(output_file, items_database)
+    
+    # Snapshot every page's wikitext as the offline parser corpus
+    if include_raw:
+        corpus_dir = snapshot_corpus(
+            "items",
+            {item['name']: item['raw_source'] for item in items_database if 'raw_source' in item},
+            revisions=revisions
+        )
+        print(f"[OK] Wikitext corpus saved to: {corpus_dir}")
     
     print(f"\n{'='*60}")
     print(f"[OK] Successfully processed: {len(items_database)} items")
@@ -788,40 +1306,108 @@ def main():
         for item in failed_items:
             print(f"  - {item}")
     
+    # Record which revision each item came from for --incremental runs
+    parsed_names = {item['name'] for item in items_database}
+    save_revisions(
+        get_revisions_file(output_file),
+        {name: revid for name, revid in revisions.items() if name in parsed_names}
+    )
+    
     print(f"\n[OK] Database saved to: {output_file}")
     print(f"  Total size: {output_file.stat().st_size / 1024:.1f} KB")
+    
+    get_client().print_stats()
+
+
+def parse_only():
+    """
+    Rebuild items_database.json from the raw-source store without any network access.
+    Image URLs are carried over from the existing database.
+    """
+    data_dir = Path(__file__).parent.parent / "data"
+    names_file = data_dir / "names.txt"
+    output_file = data_dir / "items_database.json"
+    
+    import sys
+    include_raw = '--include-raw' in sys.argv
+    parse_workers = int(get_cli_option('parse-workers', str(DEFAULT_PARSE_WORKERS)))
+    raw_store = Path(get_cli_option('raw-store', str(DEFAULT_RAW_STORE)))
+    
+    with open(names_file, 'r', encoding='utf-8') as f:
+        item_names = [line.strip() for line in f if line.strip()]
+    
+    previous_items = {}
+    if output_file.exists():
+        with open(output_file, 'r', encoding='utf-8') as f:
+            previous_items = {item['name']: item for item in json.load(f)}
+    
+    items_database, failed_items = parse_raw_store(
+        item_names,
+        raw_store=raw_store,
+        include_raw=include_raw,
+        parse_workers=parse_workers
+    )
+    
+    for item_data in items_database:
+        previous = previous_items.get(item_data['name'])
+        if previous and previous.get('image_urls') and item_data.get('infobox'):
+            attach_image_urls(item_data, previous['image_urls'])
+    
+    write_json(output_file, items_database)
+    
+    print(f"\n{'='*60}")
+    print(f"[OK] Successfully parsed: {len(items_database)} items")
+    print(f"[FAILED] Failed: {len(failed_items)} items")
+    if failed_items:
+        print("\nFailed items (not in the raw store or could not be parsed):")
+        for item in failed_items:
+            print(f"  - {item}")
+    
+    print(f"\n[OK] Database saved to: {output_file}")
 
 
 if __name__ == "__main__":
-    # =============================================================================
-    # UPDATE SPECIFIC WEAPONS - Modify this list to update specific items
-    # =============================================================================
-    ITEMS_TO_UPDATE = [
-        # Add item names here to update them
-        # "Light Ammo",
-        # "Medium Ammo",
-        # "Heavy Ammo",
-        # "Shotgun Ammo",
-        # "Launcher Ammo",
-        # "Energy Clip",
-        # "Ruined Augment"
-        # "Firecracker",
-        # "Fireworks Box",
-        "Candleberries"
-    ]
+    import sys
+    configure_client_from_argv(sys.argv)
+    configure_backend_from_argv(sys.argv)
     
     # Choose mode:
     # 1. Update specific items (recommended for incremental updates)
     # 2. Process entire names.txt file (full rebuild)
+    # Pass --incremental to only re-parse pages whose wiki revision changed,
+    # or --parse-only to re-parse the local raw-source store without the network
     
-    if ITEMS_TO_UPDATE:
+    parse_workers = int(get_cli_option('parse-workers', str(DEFAULT_PARSE_WORKERS)))
+    
+    if '--parse-only' in sys.argv:
+        print("=" * 60)
+        print("MODE: PARSE RAW STORE (OFFLINE)")
+        print("=" * 60)
+        parse_only()
+    elif '--incremental' in sys.argv:
+        print("=" * 60)
+        print("MODE: INCREMENTAL UPDATE")
+        print("=" * 60)
+        update_changed_items(
+            workers=int(get_cli_option('workers', '1')),
+            backend=get_cli_option('backend', 'api'),
+            min_interval=float(get_cli_option('min-interval', str(DEFAULT_MIN_INTERVAL))),
+            parse_workers=parse_workers
+        )
+    elif ITEMS_TO_UPDATE:
         print("=" * 60)
         print("MODE: UPDATE SPECIFIC ITEMS")
         print("=" * 60)
-        update_specific_items(ITEMS_TO_UPDATE, include_raw=False)
+        update_specific_items(
+            ITEMS_TO_UPDATE,
+            include_raw=False,
+            workers=int(get_cli_option('workers', '1')),
+            backend=get_cli_option('backend', 'api'),
+            min_interval=float(get_cli_option('min-interval', str(DEFAULT_MIN_INTERVAL))),
+            parse_workers=parse_workers
+        )
     else:
         print("=" * 60)
         print("MODE: FULL DATABASE REBUILD")
         print("=" * 60)
         main()
-
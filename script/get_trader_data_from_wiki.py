@@ -3,16 +3,32 @@ Fetch and parse trader data from ARC Raiders Wiki
 Reads trader names from traders.txt and constructs detailed JSON database
 """
 
-import html
-import json
-import re
+import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import quote
 
 import requests
-from bs4 import BeautifulSoup
+
+from cli_options import get_cli_option
+from html_extract import configure_backend_from_argv, extract_image, extract_textarea
+from json_output import write_json
+from raw_store import snapshot_corpus
+from wiki_api import fetch_wikitext_batch, resolve_image_urls
+from wiki_client import configure_client_from_argv, get_client
+from wikitext import (
+    COUNT_MULTIPLIER,
+    FILE_LINK,
+    FRACTION,
+    ITEMGRID_TEMPLATE,
+    LINK_PARAMETER,
+    NUMBERED_KEY,
+    PRICE_TEMPLATE,
+    TRADER_FILE_LINK,
+    tokenize_lines,
+    unescape_and_normalize,
+)
 
 
 def sanitize_trader_name_for_url(trader_name: str) -> str:
@@ -24,20 +40,14 @@ def clean_text(text: str) -> str:
     """Clean text by decoding HTML entities and normalizing whitespace."""
     if not text:
         return text
-    # Decode HTML entities like &nbsp;, &amp;, etc.
-    text = html.unescape(text)
-    # Remove MediaWiki bold (''') and italic ('') markup
-    text = re.sub(r"'{2,}", '', text)
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    return text.strip()
+    # Decode HTML entities, remove bold/italic markup and normalize whitespace
+    return unescape_and_normalize(text, strip_tags=False)
 
 
 def extract_trader_image_from_source(source_text: str, trader_name: str) -> Optional[str]:
     """Extract trader image filename from MediaWiki source."""
     # Look for [[File:Trader_...png|...]] pattern
-    pattern = r'\[\[File:(Trader_[^\]|]+\.png)'
-    match = re.search(pattern, source_text, re.IGNORECASE)
+    match = TRADER_FILE_LINK.search(source_text)
     
     if match:
         return match.group(1)
@@ -48,28 +58,21 @@ def extract_trader_image_from_source(source_text: str, trader_name: str) -> Opti
 def extract_image_url_from_wiki_page(wiki_url: str, image_filename: str) -> Optional[Dict[str, str]]:
     """Fetch the wiki page and extract the actual image URL."""
     try:
-        response = requests.get(wiki_url)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find img tag with the specific filename in src or data-src
-        img_tag = soup.find('img', src=lambda x: x and image_filename.replace(' ', '_') in x)
+        response = get_client().get(wiki_url)
         
-        if not img_tag:
-            # Try searching in all img tags
-            for img in soup.find_all('img'):
-                src = img.get('src', '')
-                if 'Trader' in src and trader_name_match(src, image_filename):
-                    img_tag = img
-                    break
+        # Find the img tag with the specific filename in src,
+        # otherwise any trader image whose URL contains the filename
+        img_tag = extract_image(response.content, [
+            lambda src: image_filename.replace(' ', '_') in src,
+            lambda src: 'Trader' in src and trader_name_match(src, image_filename)
+        ])
         
         if not img_tag:
             return None
         
         # Get the src (webp thumb) and srcset (higher resolution)
-        src = img_tag.get('src', '')
-        srcset = img_tag.get('srcset', '')
+        src = img_tag['src']
+        srcset = img_tag['srcset']
         
         image_urls = {}
         
@@ -107,7 +110,7 @@ def parse_item_grid(source_text: str) -> List[Dict[str, Any]]:
     shop_items = []
     
     # Find {{ItemGrid ... }}
-    itemgrid_match = re.search(r'\{\{ItemGrid\s*\n(.*?)\n\}\}', source_text, re.DOTALL)
+    itemgrid_match = ITEMGRID_TEMPLATE.search(source_text)
     
     if not itemgrid_match:
         return shop_items
@@ -115,30 +118,22 @@ def parse_item_grid(source_text: str) -> List[Dict[str, Any]]:
     content = itemgrid_match.group(1)
     
     # Parse parameters - items are numbered (name1, name2, etc.)
-    lines = content.split('\n')
-    
     # Dictionary to collect all properties for each item
     items_dict: Dict[int, Dict[str, Any]] = {}
     
-    for line in lines:
-        line = line.strip()
-        if not line.startswith('|'):
-            continue
-        
-        line = line[1:].strip()
-        if '=' not in line:
+    for token in tokenize_lines(content):
+        if token.key is None:
             continue
         
-        key, value = line.split('=', 1)
-        key = key.strip()
-        value = value.strip()
+        key = token.key
+        value = token.value
         
         if not value:
             continue
         
         # Extract the property name and item number
         # Format: name1, image1, price1, etc.
-        match = re.match(r'([a-zA-Z-]+)(\d+)', key)
+        match = NUMBERED_KEY.match(key)
         if not match:
             continue
         
@@ -155,18 +150,18 @@ def parse_item_grid(source_text: str) -> List[Dict[str, Any]]:
         
         elif prop_name == 'image':
             # Extract image filename from [[File:...png|...]]
-            img_match = re.search(r'\[\[File:([^\]|]+\.(png|webp))', value, re.IGNORECASE)
+            img_match = FILE_LINK.search(value)
             if img_match:
                 items_dict[item_num]['image'] = img_match.group(1)
             
             # Also extract the link if present
-            link_match = re.search(r'\|link=([^\]|]+)', value)
+            link_match = LINK_PARAMETER.search(value)
             if link_match:
                 items_dict[item_num]['item_link'] = clean_text(link_match.group(1))
         
         elif prop_name == 'price':
             # Extract price from {{Price|value}} or {{Price|amount|currency}}
-            price_match = re.search(r'\{\{Price\|([^}]+)\}\}', value)
+            price_match = PRICE_TEMPLATE.search(value)
             if price_match:
                 price_content = price_match.group(1).strip()
                 
@@ -213,17 +208,17 @@ def parse_item_grid(source_text: str) -> List[Dict[str, Any]]:
         elif prop_name == 'category-icon':
             # Extract category icon and count
             # Format: [[File:Ammo Heavy.png|link=|22px]]x10
-            icon_match = re.search(r'\[\[File:([^\]|]+\.(png|webp))', value, re.IGNORECASE)
+            icon_match = FILE_LINK.search(value)
             if icon_match:
                 items_dict[item_num]['category_icon'] = icon_match.group(1)
             
             # Check for count multiplier (e.g., x10, x25)
-            count_match = re.search(r'x(\d+)', value)
+            count_match = COUNT_MULTIPLIER.search(value)
             if count_match:
                 items_dict[item_num]['ammo_count'] = int(count_match.group(1))
             
             # Check for fraction format (e.g., 1/1, 3/3)
-            fraction_match = re.search(r'(\d+)/(\d+)', value)
+            fraction_match = FRACTION.search(value)
             if fraction_match:
                 items_dict[item_num]['stock'] = f"{fraction_match.group(1)}/{fraction_match.group(2)}"
     
@@ -261,8 +256,26 @@ def parse_item_grid(source_text: str) -> List[Dict[str, Any]]:
     return shop_items
 
 
-def parse_trader_from_wiki(trader_name: str, delay: float = 0.5) -> Optional[Dict[str, Any]]:
-    """Fetch and parse a single trader from the wiki."""
+def fetch_trader_source(source_url: str) -> Optional[str]:
+    """Fetch the edit page and return the wikitext from its source textarea."""
+    response = get_client().get(source_url)
+    
+    # Find the textarea with source code
+    return extract_textarea(response.content)
+
+
+def parse_trader_from_wiki(
+    trader_name: str,
+    delay: float = 0.5,
+    source_text: Optional[str] = None,
+    image_urls: Optional[Dict[str, str]] = None,
+    include_raw: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch and parse a single trader from the wiki.
+    If source_text is given (e.g. from the API backend) the edit page is not fetched.
+    If image_urls is given (resolved in batch) the wiki page is not fetched for the image.
+    """
     print(f"Processing: {trader_name}")
     
     url_name = sanitize_trader_name_for_url(trader_name)
@@ -270,21 +283,13 @@ def parse_trader_from_wiki(trader_name: str, delay: float = 0.5) -> Optional[Dic
     wiki_url = f"https://arcraiders.wiki/wiki/{quote(url_name)}"
     
     try:
-        # Fetch the edit page to get source
-        response = requests.get(source_url)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the textarea with source code
-        textarea = soup.find('textarea', {'id': 'wpTextbox1'})
+        if source_text is None:
+            source_text = fetch_trader_source(source_url)
         
-        if not textarea:
+        if source_text is None:
             print(f"  [!] Could not find source for {trader_name}")
             return None
         
-        source_text = textarea.get_text()
-        
         # Parse the data
         trader_data = {
             "name": trader_name,
@@ -298,9 +303,11 @@ def parse_trader_from_wiki(trader_name: str, delay: float = 0.5) -> Optional[Dic
             trader_data["image_filename"] = image_filename
             
             # Fetch actual image URLs from the wiki page
-            print(f"  -> Fetching image URL from wiki page...")
-            time.sleep(0.2)
-            image_urls = extract_image_url_from_wiki_page(wiki_url, image_filename)
+            if not image_urls:
+                print(f"  -> Fetching image URL from wiki page...")
+                if not get_client().offline:
+                    time.sleep(0.2)
+                image_urls = extract_image_url_from_wiki_page(wiki_url, image_filename)
             if image_urls:
                 trader_data["image_urls"] = image_urls
         
@@ -310,10 +317,15 @@ def parse_trader_from_wiki(trader_name: str, delay: float = 0.5) -> Optional[Dic
             trader_data["shop"] = shop_items
             print(f"  -> Found {len(shop_items)} items in shop")
         
+        # Store raw source for reference (optional, makes file much larger)
+        if include_raw:
+            trader_data["raw_source"] = source_text
+        
         print(f"  [OK] Successfully parsed {trader_name}")
         
         # Be respectful to the server
-        time.sleep(delay)
+        if not get_client().offline:
+            time.sleep(delay)
         
         return trader_data
         
@@ -327,8 +339,62 @@ def parse_trader_from_wiki(trader_name: str, delay: float = 0.5) -> Optional[Dic
         return None
 
 
+def fetch_traders(
+    trader_names: List[str],
+    backend: str = "api",
+    include_raw: bool = False
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Fetch and parse traders.
+    Returns (parsed traders in the order of trader_names, names that failed).
+    """
+    # Batch-load wikitext through the API; missing pages fall back to the edit page
+    sources = {}
+    image_urls = {}
+    if backend != "edit":
+        try:
+            sources = fetch_wikitext_batch(trader_names)
+            # Trader portraits are shown at 100px on the wiki page
+            image_filenames = [
+                extract_trader_image_from_source(page["source"], name)
+                for name, page in sources.items()
+            ]
+            image_urls = resolve_image_urls(image_filenames, width=100, include_file_page=False)
+        except (requests.RequestException, ValueError) as e:
+            print(f"[WARNING] API fetch failed, falling back to edit pages: {e}")
+    
+    print("="*60)
+    
+    # Process each trader
+    traders_database = []
+    failed_traders = []
+    
+    for i, trader_name in enumerate(trader_names, 1):
+        print(f"\n[{i}/{len(trader_names)}] ", end='')
+        
+        page = sources.get(trader_name)
+        source_text = page["source"] if page else None
+        image_filename = extract_trader_image_from_source(source_text, trader_name) if source_text else None
+        trader_data = parse_trader_from_wiki(
+            trader_name,
+            source_text=source_text,
+            image_urls=image_urls.get(image_filename),
+            include_raw=include_raw
+        )
+        
+        if trader_data:
+            traders_database.append(trader_data)
+        else:
+            failed_traders.append(trader_name)
+    
+    return traders_database, failed_traders
+
+
 def main():
     """Main function to process traders from traders.txt file."""
+    configure_client_from_argv(sys.argv)
+    configure_backend_from_argv(sys.argv)
+    
     data_dir = Path(__file__).parent.parent / "data"
     traders_file = data_dir / "traders.txt"
     output_file = data_dir / "traders_database.json"
@@ -344,25 +410,21 @@ def main():
         trader_names = [line.strip() for line in f if line.strip()]
     
     print(f"Found {len(trader_names)} traders to process\n")
-    print("="*60)
-    
-    # Process each trader
-    traders_database = []
-    failed_traders = []
     
-    for i, trader_name in enumerate(trader_names, 1):
-        print(f"\n[{i}/{len(trader_names)}] ", end='')
-        
-        trader_data = parse_trader_from_wiki(trader_name)
-        
-        if trader_data:
-            traders_database.append(trader_data)
-        else:
-            failed_traders.append(trader_name)
+    backend = get_cli_option('backend', 'api')
+    include_raw = '--include-raw' in sys.argv
+    traders_database, failed_traders = fetch_traders(trader_names, backend=backend, include_raw=include_raw)
     
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(traders_database, f, indent=2, ensure_ascii=False)
+    write_json(output_file, traders_database)
+    
+    # Snapshot every page's wikitext as the offline parser corpus
+    if include_raw:
+        corpus_dir = snapshot_corpus(
+            "traders",
+            {trader['name']: trader['raw_source'] for trader in traders_database if 'raw_source' in trader}
+        )
+        print(f"[OK] Wikitext corpus saved to: {corpus_dir}")
     
     print(f"\n{'='*60}")
     print(f"[OK] Successfully processed: {len(traders_database)} traders")
@@ -375,6 +437,8 @@ def main():
     
     print(f"\n[OK] Database saved to: {output_file}")
     print(f"  Total size: {output_file.stat().st_size / 1024:.1f} KB")
+    
+    get_client().print_stats()
 
 
 if __name__ == "__main__":
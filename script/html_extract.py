@@ -0,0 +1,253 @@
+"""
+Targeted extraction from wiki HTML pages
+Finds the edit form's source textarea or an image without building a full BeautifulSoup
+tree, either with lxml and XPath or with a streaming scan that stops at the target element
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    # The "lxml" backend falls back to BeautifulSoup without it
+    lxml_html = None
+
+# "soup" is the original full-page BeautifulSoup parse, kept as the reference
+BACKENDS = ["stream", "lxml", "soup"]
+DEFAULT_BACKEND = "stream"
+
+SOURCE_TEXTAREA_ID = "wpTextbox1"
+
+# Start tags, allowing quoted attribute values that contain ">"
+TEXTAREA_START_TAG = re.compile(r"""<textarea\b((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.IGNORECASE)
+TEXTAREA_END_TAG = re.compile(r"</textarea\s*>", re.IGNORECASE)
+IMG_TAG = re.compile(r"""<img\b((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.IGNORECASE)
+INFOBOX_IMAGE_ROW = re.compile(r"""<tr\b[^>]*?\sclass\s*=\s*["']?[^"'>]*infobox-image""", re.IGNORECASE)
+ATTRIBUTE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+PageContent = Union[bytes, str]
+ImageMatcher = Callable[[str], bool]
+
+_backend = DEFAULT_BACKEND
+
+
+def decode_page(content: PageContent) -> str:
+    """Decode a response body; the wiki always serves UTF-8."""
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    return content
+
+
+def get_backend(backend: Optional[str] = None) -> str:
+    """Resolve a backend name (the configured one by default); "lxml" becomes "soup" when lxml is missing."""
+    backend = backend or _backend
+    if backend == "lxml" and lxml_html is None:
+        return "soup"
+    return backend
+
+
+def set_backend(name: str) -> str:
+    """Select the extraction backend; returns the backend actually used."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend '{name}' (expected one of {', '.join(BACKENDS)})")
+    _backend = name
+    if get_backend() != name:
+        print("[WARNING] lxml is not installed, extracting HTML with BeautifulSoup")
+    return get_backend()
+
+
+def configure_backend_from_argv(argv: List[str]) -> str:
+    """Select the extraction backend with --html-backend=stream|lxml|soup."""
+    for arg in argv:
+        if arg.startswith("--html-backend="):
+            return set_backend(arg.split("=", 1)[1])
+    return get_backend()
+
+
+def parse_attributes(text: str) -> Dict[str, str]:
+    """Parse the attributes of a start tag (the text after the tag name)."""
+    attributes = {}
+    for match in ATTRIBUTE.finditer(text):
+        name, double_quoted, single_quoted, unquoted = match.groups()
+        value = next((value for value in (double_quoted, single_quoted, unquoted) if value is not None), "")
+        attributes.setdefault(name.lower(), html.unescape(value))
+    return attributes
+
+
+def image_attributes(image: Optional[Dict[str, str]], file_href: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Shape the attributes of a found image as {"src", "srcset", "file_href"}; None if there is no image."""
+    if image is None:
+        return None
+    return {
+        "src": image.get("src") or "",
+        "srcset": image.get("srcset") or "",
+        "file_href": file_href or ""
+    }
+
+
+# Textarea
+
+def extract_textarea(content: PageContent, element_id: str = SOURCE_TEXTAREA_ID, backend: Optional[str] = None) -> Optional[str]:
+    """Return the text of the textarea with the given id, or None if the page has none."""
+    backend = get_backend(backend)
+    if backend == "lxml":
+        return textarea_with_lxml(content, element_id)
+    if backend == "soup":
+        return textarea_with_soup(content, element_id)
+    return textarea_with_scan(decode_page(content), element_id)
+
+
+def textarea_with_scan(page: str, element_id: str) -> Optional[str]:
+    """
+    Find the textarea start tag and cut out its content.
+    Textarea content cannot contain markup, so the text runs to the first
+    closing tag; only character references need decoding.
+    """
+    for start_tag in TEXTAREA_START_TAG.finditer(page):
+        if parse_attributes(start_tag.group(1)).get("id") != element_id:
+            continue
+        end_tag = TEXTAREA_END_TAG.search(page, start_tag.end())
+        end = end_tag.start() if end_tag else len(page)
+        return html.unescape(page[start_tag.end():end])
+    return None
+
+
+def textarea_with_lxml(content: PageContent, element_id: str) -> Optional[str]:
+    """Find the textarea with an XPath query over the lxml tree."""
+    matches = lxml_html.document_fromstring(decode_page(content)).xpath("//textarea[@id=$id]", id=element_id)
+    if not matches:
+        return None
+    return matches[0].text_content()
+
+
+def textarea_with_soup(content: PageContent, element_id: str) -> Optional[str]:
+    """Parse the whole page with BeautifulSoup."""
+    soup = BeautifulSoup(content, 'html.parser')
+    textarea = soup.find('textarea', {'id': element_id})
+    if not textarea:
+        return None
+    return textarea.get_text()
+
+
+# Infobox image
+
+def extract_infobox_image(content: PageContent, backend: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Return the first image in the infobox image row with the row's File: page link,
+    as {"src", "srcset", "file_href"} (empty strings when missing), or None.
+    """
+    backend = get_backend(backend)
+    if backend == "lxml":
+        return infobox_image_with_lxml(content)
+    if backend == "soup":
+        return infobox_image_with_soup(content)
+    return infobox_image_with_scan(decode_page(content))
+
+
+class StopExtraction(Exception):
+    """Raised by the streaming parser once the target element has been read."""
+
+
+class InfoboxImageParser(HTMLParser):
+    """
+    Streaming parser fed from the start of the infobox image row.
+    Records the first <img> and the first File: link in the row and
+    stops as soon as the row is closed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0
+        self.image: Optional[Dict[str, str]] = None
+        self.file_href: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self.depth += 1
+        elif tag == "img" and self.image is None:
+            self.image = {name: value or "" for name, value in attrs}
+        elif tag == "a" and self.file_href is None:
+            href = dict(attrs).get("href") or ""
+            if "/wiki/File:" in href:
+                self.file_href = href
+
+    def handle_endtag(self, tag):
+        if tag == "tr":
+            self.depth -= 1
+            if self.depth <= 0:
+                raise StopExtraction()
+
+
+def infobox_image_with_scan(page: str) -> Optional[Dict[str, str]]:
+    """Jump to the infobox image row and stream-parse only that row."""
+    row = INFOBOX_IMAGE_ROW.search(page)
+    if not row:
+        return None
+
+    parser = InfoboxImageParser()
+    try:
+        parser.feed(page[row.start():])
+        parser.close()
+    except StopExtraction:
+        pass
+    return image_attributes(parser.image, parser.file_href)
+
+
+def infobox_image_with_lxml(content: PageContent) -> Optional[Dict[str, str]]:
+    """Find the infobox image row, its image and its File: link with XPath."""
+    rows = lxml_html.document_fromstring(decode_page(content)).xpath("//tr[contains(@class, 'infobox-image')]")
+    if not rows:
+        return None
+    images = rows[0].xpath(".//img")
+    links = rows[0].xpath(".//a[contains(@href, '/wiki/File:')]/@href")
+    return image_attributes(dict(images[0].attrib) if images else None, links[0] if links else None)
+
+
+def infobox_image_with_soup(content: PageContent) -> Optional[Dict[str, str]]:
+    """Parse the whole page with BeautifulSoup."""
+    soup = BeautifulSoup(content, 'html.parser')
+    infobox_image = soup.find('tr', class_=lambda x: x and 'infobox-image' in x)
+    if not infobox_image:
+        return None
+    img_tag = infobox_image.find('img')
+    file_link = infobox_image.find('a', href=lambda x: x and '/wiki/File:' in x)
+    return image_attributes(
+        img_tag.attrs if img_tag else None,
+        file_link.get('href', '') if file_link else None
+    )
+
+
+# Any image
+
+def extract_image(content: PageContent, matchers: List[ImageMatcher], backend: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Return the first <img> whose src satisfies matchers[0]; failing that, the first
+    satisfying matchers[1], and so on. Returns {"src", "srcset", "file_href"} or None.
+    """
+    backend = get_backend(backend)
+    if backend == "lxml":
+        images = (dict(img.attrib) for img in lxml_html.document_fromstring(decode_page(content)).iter("img"))
+    elif backend == "soup":
+        images = (img.attrs for img in BeautifulSoup(content, 'html.parser').find_all('img'))
+    else:
+        images = (parse_attributes(tag.group(1)) for tag in IMG_TAG.finditer(decode_page(content)))
+
+    # One pass: stop at the first image the preferred matcher accepts,
+    # remembering the first match of each fallback matcher on the way
+    fallbacks: List[Optional[Dict[str, str]]] = [None] * len(matchers)
+    for image in images:
+        src = image.get("src") or ""
+        if not src:
+            continue
+        for rank, matches in enumerate(matchers):
+            if fallbacks[rank] is None and matches(src):
+                if rank == 0:
+                    return image_attributes(image)
+                fallbacks[rank] = image
+    return image_attributes(next((image for image in fallbacks if image is not None), None))
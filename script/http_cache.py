@@ -0,0 +1,187 @@
+"""
+On-disk HTTP response cache for the wiki scrapers
+Stores compressed response bodies in SQLite with validators for conditional
+requests, wikitext keyed by revision ID, and size-bounded LRU eviction
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / ".cache" / "http_cache.sqlite"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    headers TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    revid INTEGER,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def wikitext_key(title: str) -> str:
+    """Cache key for the stored wikitext of a page."""
+    return f"wikitext:{title}"
+
+
+class HttpCache:
+    """
+    SQLite-backed cache shared by all fetch threads.
+    Entries are keyed by full request URL (or wikitext:<title> for page sources)
+    and evicted least-recently-used once the compressed total exceeds max_bytes.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Lookups whose entry was sent back to the server for revalidation
+        self.revalidations = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached entry for key, or None. Marks the entry as recently used.
+        With count=False the lookup is not counted; the caller records it with
+        record_lookup once it knows whether the entry was actually used.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, etag, last_modified, revid FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                if count:
+                    self.misses += 1
+                return None
+
+            if count:
+                self.hits += 1
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        body, headers, etag, last_modified, revid = row
+        return {
+            "body": zlib.decompress(body),
+            "headers": json.loads(headers) if headers else {},
+            "etag": etag,
+            "last_modified": last_modified,
+            "revid": revid
+        }
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        revid: Optional[int] = None
+    ) -> None:
+        """Store a response body (and its validators) under key."""
+        headers = dict(headers or {})
+        compressed = zlib.compress(body)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, body, headers, etag, last_modified, revid, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    compressed,
+                    json.dumps(headers),
+                    headers.get("ETag") or headers.get("etag"),
+                    headers.get("Last-Modified") or headers.get("last-modified"),
+                    revid,
+                    len(compressed),
+                    now,
+                    now
+                )
+            )
+            self._evict()
+            self._conn.commit()
+
+    def record_lookup(self, hit: bool, revalidated: bool = False) -> None:
+        """Count a lookup made with get(count=False)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if revalidated:
+                self.revalidations += 1
+
+    def get_revision_id(self, title: str) -> Optional[int]:
+        """Return the revision ID of the cached wikitext for a page, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revid FROM entries WHERE key = ?",
+                (wikitext_key(title),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_wikitext(self, title: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        """Return {"revid", "source"} of the cached wikitext for a page, if any."""
+        entry = self.get(wikitext_key(title), count)
+        if entry is None:
+            return None
+        return {"revid": entry["revid"], "source": entry["body"].decode("utf-8")}
+
+    def put_wikitext(self, title: str, revid: Optional[int], source: str) -> None:
+        """Store the wikitext of a page at the given revision."""
+        self.put(wikitext_key(title), source.encode("utf-8"), revid=revid)
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Keys of all entries that start with prefix, sorted."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE substr(key, 1, ?) = ? ORDER BY key",
+                (len(prefix), prefix)
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def wikitext_titles(self) -> List[str]:
+        """Titles of all pages with cached wikitext."""
+        prefix = wikitext_key("")
+        return [key[len(prefix):] for key in self.keys(prefix)]
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache fits in max_bytes (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
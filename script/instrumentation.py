@@ -0,0 +1,176 @@
+"""
+Lightweight run instrumentation for the pipeline scripts
+Records wall/CPU time, HTTP requests, bytes downloaded, cache hit rate and peak RSS per stage,
+writes them as a JSON run report, and optionally profiles each stage with cProfile
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from json_output import write_json
+from wiki_client import get_client
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is left out of the report there
+    resource = None
+
+DEFAULT_REPORT_FILE = Path(__file__).parent / ".cache" / "run_report.json"
+DEFAULT_PROFILE_DIR = Path(__file__).parent / ".cache" / "profile"
+
+# Functions listed in the text summary written next to each .prof file
+PROFILE_TOP_FUNCTIONS = 30
+
+
+def peak_rss_mib(children: bool = False) -> Optional[float]:
+    """Peak resident set size of this process (or of its finished child processes) in MiB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def http_counters() -> Dict[str, Any]:
+    """Current totals of the shared WikiClient."""
+    return get_client().totals()
+
+
+class Recorder:
+    """
+    Collects timed spans for a run report.
+    A span is a stage of the pipeline (or a step inside one, like the fetch thread);
+    spans opened while a stage is running are nested under it in the report.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.profile_dir: Optional[Path] = None
+        self.current_stage: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, stage: bool = False, http: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Measure the enclosed block. The yielded dict is the span's report entry,
+        so the block can add its own counts (e.g. "pages") to it.
+        With stage=True the block is a pipeline stage: later spans are nested
+        under it and, with profiling on, it is run under cProfile.
+        cpu_seconds is process-wide, so spans that overlap in time (the fetch
+        thread and the parse loop) both count the CPU time of the other; pass
+        http=False for a span whose requests are made by another thread.
+        """
+        entry: Dict[str, Any] = {"name": name}
+        if not stage and self.current_stage:
+            entry["stage"] = self.current_stage
+        before = http_counters() if http else None
+        wall_start = time.perf_counter()
+        entry["start_seconds"] = round(wall_start - self.started, 4)
+        cpu_start = time.process_time()
+
+        profiler = None
+        if stage:
+            self.current_stage = name
+            if self.profile_dir is not None:
+                profiler = cProfile.Profile()
+                profiler.enable()
+        try:
+            yield entry
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                entry["profile"] = str(self.write_profile(name, profiler))
+            if stage:
+                self.current_stage = None
+
+            after = http_counters() if http else None
+            entry["wall_seconds"] = round(time.perf_counter() - wall_start, 4)
+            entry["cpu_seconds"] = round(time.process_time() - cpu_start, 4)
+            if http:
+                for key in ("requests", "bytes", "not_modified", "cache_hits", "cache_misses", "cache_revalidations"):
+                    entry[key] = after[key] - before[key]
+                lookups = entry["cache_hits"] + entry["cache_misses"]
+                entry["cache_hit_rate"] = round(entry["cache_hits"] / lookups, 3) if lookups else None
+            entry["peak_rss_mib"] = peak_rss_mib()
+            entry["children_peak_rss_mib"] = peak_rss_mib(children=True)
+            with self._lock:
+                self.spans.append(entry)
+                # Nested spans finish first; keep the list in start order
+                self.spans.sort(key=lambda span: span["start_seconds"])
+
+    def write_profile(self, name: str, profiler: cProfile.Profile) -> Path:
+        """Write <name>.prof (for pstats/snakeviz) and a <name>.txt summary sorted by cumulative time."""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        profile_file = self.profile_dir / f"{name}.prof"
+        profiler.dump_stats(str(profile_file))
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        profile_file.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+        return profile_file
+
+    def report(self) -> Dict[str, Any]:
+        """The run report: run metadata, every span, and HTTP totals per host."""
+        client = get_client()
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "argv": sys.argv[1:],
+            "python": sys.version.split()[0],
+            "wall_seconds": round(sum(span["wall_seconds"] for span in self.spans if "stage" not in span), 4),
+            "peak_rss_mib": peak_rss_mib(),
+            "children_peak_rss_mib": peak_rss_mib(children=True),
+            "spans": self.spans,
+            "http": {**client.totals(), "hosts": client.host_stats}
+        }
+
+    def write_report(self, path: Path = DEFAULT_REPORT_FILE) -> Path:
+        """Write the run report as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(path, self.report())
+        return path
+
+    def print_summary(self) -> None:
+        """Print one line per span."""
+        print("\nRun metrics:")
+        print(f"  {'span':<16} {'wall':>9} {'cpu':>9} {'requests':>9} {'KB':>9} {'cache':>6} {'RSS MiB':>8}")
+        for span in self.spans:
+            name = f"  {span['name']}" if "stage" in span else span["name"]
+            hit_rate = f"{span['cache_hit_rate']:.0%}" if span.get("cache_hit_rate") is not None else "-"
+            requests = span.get("requests", "-")
+            kilobytes = f"{span['bytes'] / 1024:.0f}" if "bytes" in span else "-"
+            rss = f"{span['peak_rss_mib']:.0f}" if span["peak_rss_mib"] is not None else "-"
+            print(f"  {name:<16} {span['wall_seconds']:>8.2f}s {span['cpu_seconds']:>8.2f}s "
+                  f"{requests:>9} {kilobytes:>9} {hit_rate:>6} {rss:>8}")
+        total = sum(span["wall_seconds"] for span in self.spans if "stage" not in span)
+        print(f"  {'total':<16} {total:>8.2f}s")
+
+
+_recorder = Recorder()
+
+
+def get_recorder() -> Recorder:
+    """Return the process-wide Recorder."""
+    return _recorder
+
+
+def configure_recorder_from_argv(argv: List[str]) -> Recorder:
+    """Turn on per-stage profiling with --profile (or --profile=DIR)."""
+    for arg in argv:
+        if arg == "--profile":
+            _recorder.profile_dir = DEFAULT_PROFILE_DIR
+        elif arg.startswith("--profile="):
+            _recorder.profile_dir = Path(arg.split("=", 1)[1])
+    return _recorder
@@ -0,0 +1,103 @@
+"""
+JSON writer for the pipeline artifacts
+Streams record lists to disk one element at a time, pretty-printed or compact, and reports artifact sizes
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Artifacts the frontend imports, plus the trader database the graph is built from
+REPORT_FILES = ["items_database.json", "items_relation.json", "traders_database.json"]
+
+COMPACT_SEPARATORS = (',', ':')
+
+
+def iter_json_records(records: Iterable[Any], compact: bool = False) -> Iterator[str]:
+    """
+    Yield the JSON text of a list one element at a time.
+    Pretty output is byte-identical to json.dump(records, indent=2, ensure_ascii=False);
+    compact output has no whitespace. Keys keep their insertion order.
+    """
+    first = True
+    for record in records:
+        if compact:
+            text = json.dumps(record, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+            yield ('[' if first else ',') + text
+        else:
+            # Strings never contain raw newlines, so every newline is indentation
+            text = json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            yield ('[\n  ' if first else ',\n  ') + text
+        first = False
+
+    if first:
+        yield '[]'
+    else:
+        yield ']' if compact else '\n]'
+
+
+def write_json(path: Path, value: Any, compact: Optional[bool] = None) -> None:
+    """
+    Write an artifact. Lists are streamed element by element; other values are dumped whole.
+    compact defaults to whether --compact was passed on the command line.
+    The file is replaced only once it has been written completely.
+    """
+    if compact is None:
+        compact = '--compact' in sys.argv
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if isinstance(value, list):
+            for chunk in iter_json_records(value, compact):
+                f.write(chunk)
+        elif compact:
+            json.dump(value, f, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+        else:
+            json.dump(value, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def measure_sizes(value: Any) -> Dict[str, Optional[int]]:
+    """Byte sizes of a value as pretty JSON, compact JSON, and gzip/brotli-compressed compact JSON."""
+    pretty = ''.join(iter_json_records(value)) if isinstance(value, list) else json.dumps(value, indent=2, ensure_ascii=False)
+    compact = json.dumps(value, ensure_ascii=False, separators=COMPACT_SEPARATORS).encode('utf-8')
+    return {
+        "pretty": len(pretty.encode('utf-8')),
+        "compact": len(compact),
+        "gzip": len(gzip.compress(compact, compresslevel=9)),
+        "brotli": len(brotli.compress(compact, quality=11)) if brotli else None
+    }
+
+
+def print_size_report(data_dir: Path = DATA_DIR, filenames: Iterable[str] = REPORT_FILES) -> None:
+    """Print pretty/compact/gzip/brotli sizes of each artifact."""
+    def kb(size: Optional[int]) -> str:
+        return f"{size / 1024:.1f} KB" if size is not None else "n/a"
+
+    print(f"{'file':<24} {'on disk':>10} {'pretty':>10} {'compact':>10} {'gzip':>10} {'brotli':>10}")
+    for filename in filenames:
+        path = Path(data_dir) / filename
+        if not path.exists():
+            print(f"{filename:<24} (not found)")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            sizes = measure_sizes(json.load(f))
+        print(f"{filename:<24} {kb(path.stat().st_size):>10} {kb(sizes['pretty']):>10} "
+              f"{kb(sizes['compact']):>10} {kb(sizes['gzip']):>10} {kb(sizes['brotli']):>10}")
+
+    if brotli is None:
+        print("\n(install the brotli package to include brotli sizes)")
+
+
+if __name__ == "__main__":
+    print_size_report()
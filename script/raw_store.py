@@ -0,0 +1,130 @@
+"""
+Local store of raw page wikitext for the wiki scrapers
+Keeps one <Page_Name>.wiki file per page so pages can be re-parsed without the network,
+and snapshots of every page as a versioned corpus for offline parser regression runs
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote, unquote
+
+DEFAULT_RAW_STORE = Path(__file__).parent / ".cache" / "raw"
+DEFAULT_CORPUS = Path(__file__).parent.parent / "data" / "wiki_corpus"
+CORPUS_INDEX = "index.json"
+
+# Punctuation that appears in item names and is safe in file names on every platform
+SAFE_FILENAME_CHARACTERS = "()',.!&+-"
+
+
+def raw_source_filename(title: str) -> str:
+    """File name of a page in the store (spaces to underscores, path and other unsafe characters escaped)."""
+    return quote(title.replace(' ', '_'), safe=SAFE_FILENAME_CHARACTERS) + '.wiki'
+
+
+def raw_source_title(path: Path) -> str:
+    """Page title of a stored file (inverse of raw_source_filename)."""
+    return unquote(path.stem).replace('_', ' ')
+
+
+def save_raw_source(title: str, source: str, store_dir: Path = DEFAULT_RAW_STORE) -> None:
+    """Write the wikitext of a page to the store."""
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    path = store_dir / raw_source_filename(title)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(source, encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def load_raw_sources(
+    store_dir: Path = DEFAULT_RAW_STORE,
+    titles: Optional[Iterable[str]] = None
+) -> Dict[str, str]:
+    """
+    Load stored wikitext as title -> source.
+    With titles, only those pages are loaded (in that order) and missing ones are left out.
+    """
+    store_dir = Path(store_dir)
+    if titles is None:
+        return {
+            raw_source_title(path): path.read_text(encoding='utf-8')
+            for path in sorted(store_dir.glob('*.wiki'))
+        }
+
+    sources = {}
+    for title in titles:
+        path = store_dir / raw_source_filename(title)
+        if path.exists():
+            sources[title] = path.read_text(encoding='utf-8')
+    return sources
+
+
+def source_digest(source: str) -> str:
+    """SHA-256 of a page source, recorded in the corpus index."""
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def load_corpus_index(corpus_dir: Path = DEFAULT_CORPUS) -> Dict[str, Dict[str, Dict[str, object]]]:
+    """Corpus index: kind ("items"/"traders") -> title -> {"file", "sha256", "revid"}."""
+    index_file = Path(corpus_dir) / CORPUS_INDEX
+    if not index_file.exists():
+        return {}
+    with open(index_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def snapshot_corpus(
+    kind: str,
+    sources: Dict[str, str],
+    corpus_dir: Path = DEFAULT_CORPUS,
+    revisions: Optional[Dict[str, int]] = None
+) -> Path:
+    """
+    Replace the kind ("items" or "traders") part of the corpus with sources (title -> wikitext).
+    Pages of that kind that are no longer in sources are removed. Returns the corpus directory.
+    """
+    corpus_dir = Path(corpus_dir)
+    kind_dir = corpus_dir / kind
+    for path in kind_dir.glob('*.wiki'):
+        if raw_source_title(path) not in sources:
+            path.unlink()
+
+    entries = {}
+    for title, source in sources.items():
+        save_raw_source(title, source, kind_dir)
+        entries[title] = {"file": f"{kind}/{raw_source_filename(title)}", "sha256": source_digest(source)}
+        if revisions and revisions.get(title):
+            entries[title]["revid"] = revisions[title]
+
+    index = load_corpus_index(corpus_dir)
+    index[kind] = entries
+    with open(corpus_dir / CORPUS_INDEX, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False, sort_keys=True)
+    return corpus_dir
+
+
+def load_corpus(kind: str, corpus_dir: Path = DEFAULT_CORPUS) -> Dict[str, str]:
+    """
+    Load the kind part of a corpus as title -> source, in index order.
+    Pages whose content no longer matches the index are reported and left out.
+    A directory without an index is read as a plain store of *.wiki files.
+    """
+    corpus_dir = Path(corpus_dir)
+    index = load_corpus_index(corpus_dir)
+    if not index:
+        return load_raw_sources(corpus_dir)
+
+    sources = {}
+    for title, entry in index.get(kind, {}).items():
+        path = corpus_dir / entry["file"]
+        if not path.exists():
+            print(f"[WARNING] Corpus page missing: {path}")
+            continue
+        source = path.read_text(encoding='utf-8')
+        if source_digest(source) != entry["sha256"]:
+            print(f"[WARNING] Corpus page changed since the snapshot: {path}")
+            continue
+        sources[title] = source
+    return sources
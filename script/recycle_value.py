@@ -0,0 +1,264 @@
+"""
+Recycle/salvage versus sell value analysis over the integer-indexed relation graph
+Finds the best thing to do with every item (sell, recycle or salvage, recursively) and writes a ranked recycle_value.json
+"""
+
+import json
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from bill_of_materials import level_number
+from json_output import write_json
+from relation_arrays import MISSING, CsrGraph, build_csr_graph, edge_range
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Action -> relation of the edges it produces items through
+ACTIONS = {
+    "recycle": "recycle_to",
+    "salvage": "salvage_to"
+}
+
+
+class BreakdownTable(NamedTuple):
+    """
+    Items as sellable variants (one per level for items with per-level outputs)
+    and the recycle/salvage outputs of each variant as parallel arrays.
+    """
+    names: List[str]
+    levels: List[Optional[str]]
+    sell: array                  # sell price per variant ('d')
+    edge_action: array           # index into ACTIONS ('B')
+    edge_source: array           # variant id ('I')
+    edge_target: array           # variant id of the output item ('I')
+    edge_quantity: array         # ('d')
+
+
+def get_sell_price(node: Dict[str, Any], level: Optional[str]) -> float:
+    """Sell price of an item (per-level prices are a list ordered I, II, ...)."""
+    price = node.get("infobox", {}).get("sellprice")
+    if isinstance(price, list):
+        number = level_number(level) or 1
+        price = price[number - 1] if number <= len(price) else None
+    return float(price) if isinstance(price, (int, float)) else 0.0
+
+
+def build_breakdown_table(graph: CsrGraph) -> BreakdownTable:
+    """Collect the recycle/salvage edges of a CsrGraph into a BreakdownTable."""
+    relation_actions = {
+        graph.relations.index(relation): action_id
+        for action_id, relation in enumerate(ACTIONS.values()) if relation in graph.relations
+    }
+
+    # One variant per distinct input level of an item's breakdown edges
+    variants: Dict[Tuple[int, int], int] = {}
+    names: List[str] = []
+    levels: List[Optional[str]] = []
+    sell = array('d')
+    base_variant: Dict[int, int] = {}
+
+    def add_variant(node_id: int, level_id: int) -> int:
+        key = (node_id, level_id)
+        if key not in variants:
+            level = graph.levels[level_id] if level_id != MISSING else None
+            variants[key] = len(names)
+            names.append(graph.nodes[node_id]["name"])
+            levels.append(level)
+            sell.append(get_sell_price(graph.nodes[node_id], level))
+            base_variant.setdefault(node_id, variants[key])
+        return variants[key]
+
+    breakdown_edges = []
+    for node_id in range(len(graph.nodes)):
+        if graph.nodes[node_id].get("node_type") != "item":
+            continue
+        positions = [p for p in edge_range(graph, node_id) if graph.relation[p] in relation_actions]
+        if not positions:
+            add_variant(node_id, MISSING)
+        for position in positions:
+            source = add_variant(node_id, graph.input_level[position])
+            breakdown_edges.append((relation_actions[graph.relation[position]], source, position))
+
+    edge_action, edge_source, edge_target, edge_quantity = array('B'), array('I'), array('I'), array('d')
+    for action_id, source, position in breakdown_edges:
+        target_node = graph.target[position]
+        if target_node not in base_variant:
+            add_variant(target_node, MISSING)
+        quantity = graph.quantity[position]
+        edge_action.append(action_id)
+        edge_source.append(source)
+        edge_target.append(base_variant[target_node])
+        edge_quantity.append(quantity if quantity != MISSING else 1)
+
+    return BreakdownTable(names, levels, sell, edge_action, edge_source, edge_target, edge_quantity)
+
+
+def evaluate_values(table: BreakdownTable, max_iterations: Optional[int] = None) -> Tuple[List[List[float]], int]:
+    """
+    Best value of every variant: the most of selling it, or recycling/salvaging
+    it and taking the best value of each output, iterated to a fixed point.
+    Returns (per action, value of each variant through that action or -1 if
+    it cannot be done; then the best value), and the iterations used.
+    """
+    count = len(table.names)
+    action_count = len(ACTIONS)
+    max_iterations = max_iterations or count + 1
+
+    if np is not None:
+        sell = np.frombuffer(table.sell, dtype=np.float64)
+        action = np.frombuffer(table.edge_action, dtype=np.uint8)
+        source = np.frombuffer(table.edge_source, dtype=np.uint32).astype(np.intp)
+        target = np.frombuffer(table.edge_target, dtype=np.uint32).astype(np.intp)
+        quantity = np.frombuffer(table.edge_quantity, dtype=np.float64)
+        has_action = [np.bincount(source[action == a], minlength=count) > 0 for a in range(action_count)]
+
+        best = sell.copy()
+        for iteration in range(1, max_iterations + 1):
+            contribution = quantity * best[target]
+            action_values = []
+            for a in range(action_count):
+                mask = action == a
+                totals = np.bincount(source[mask], weights=contribution[mask], minlength=count)
+                action_values.append(np.where(has_action[a], totals, -1.0))
+            updated = np.maximum.reduce([sell, *action_values])
+            if np.array_equal(updated, best):
+                break
+            best = updated
+        return [values.tolist() for values in action_values] + [best.tolist()], iteration
+
+    # Same computation without NumPy: one pass over the edge arrays per iteration
+    has_action = [[False] * count for _ in range(action_count)]
+    for a, s in zip(table.edge_action, table.edge_source):
+        has_action[a][s] = True
+
+    best = list(table.sell)
+    for iteration in range(1, max_iterations + 1):
+        action_values = [[0.0] * count for _ in range(action_count)]
+        for a, s, t, q in zip(table.edge_action, table.edge_source, table.edge_target, table.edge_quantity):
+            action_values[a][s] += q * best[t]
+        for a in range(action_count):
+            action_values[a] = [v if has_action[a][i] else -1.0 for i, v in enumerate(action_values[a])]
+        updated = [max(values) for values in zip(table.sell, *action_values)]
+        if updated == best:
+            break
+        best = updated
+    return action_values + [best], iteration
+
+
+def get_outputs(table: BreakdownTable) -> Dict[Tuple[int, int], List[Tuple[int, float]]]:
+    """(variant id, action id) -> (output variant id, quantity) of every breakdown."""
+    outputs: Dict[Tuple[int, int], List[Tuple[int, float]]] = {}
+    for a, s, t, q in zip(table.edge_action, table.edge_source, table.edge_target, table.edge_quantity):
+        outputs.setdefault((s, a), []).append((t, q))
+    return outputs
+
+
+def get_sell_plan(
+    outputs: Dict[Tuple[int, int], List[Tuple[int, float]]],
+    best_actions: List[Optional[int]],
+    variant: int
+) -> Dict[int, float]:
+    """
+    Items to sell when following the best action from a variant down:
+    variant id -> quantity. An output already being broken down above it is sold as it is.
+    """
+    plan: Dict[int, float] = {}
+
+    def follow(current: int, quantity: float, path: set) -> None:
+        action_id = best_actions[current]
+        if action_id is None or current in path:
+            plan[current] = plan.get(current, 0) + quantity
+            return
+        path.add(current)
+        for target, count in outputs.get((current, action_id), []):
+            follow(target, quantity * count, path)
+        path.discard(current)
+
+    follow(variant, 1, set())
+    return plan
+
+
+def as_number(value: float) -> Any:
+    """Whole numbers as int for the JSON output."""
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+
+def analyze_recycle_value(items_relation: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Rank every item variant that can be recycled or salvaged by how much more
+    its best action is worth than selling it. Returns (ranked records, iterations).
+    """
+    table = build_breakdown_table(build_csr_graph(items_relation))
+    values, iterations = evaluate_values(table)
+    action_values, best = values[:-1], values[-1]
+    action_names = list(ACTIONS)
+
+    # Best action id per variant (None: sell it; selling wins ties)
+    best_actions: List[Optional[int]] = []
+    for variant in range(len(table.names)):
+        action_id, value = None, table.sell[variant]
+        for a in range(len(action_names)):
+            if action_values[a][variant] > value:
+                action_id, value = a, action_values[a][variant]
+        best_actions.append(action_id)
+
+    outputs = get_outputs(table)
+    records = []
+    for variant in sorted(set(table.edge_source)):
+        record: Dict[str, Any] = {"name": table.names[variant]}
+        if table.levels[variant] and table.levels[variant] != table.names[variant]:
+            record["level"] = table.levels[variant]
+        record["sell_price"] = as_number(table.sell[variant])
+        for a, action in enumerate(action_names):
+            if action_values[a][variant] >= 0:
+                record[f"{action}_value"] = as_number(action_values[a][variant])
+        action_id = best_actions[variant]
+        record["best_action"] = action_names[action_id] if action_id is not None else "sell"
+        record["best_value"] = as_number(best[variant])
+        record["gain"] = as_number(best[variant] - table.sell[variant])
+        record["sell_plan"] = [
+            {"name": table.names[target], "quantity": as_number(quantity)}
+            for target, quantity in get_sell_plan(outputs, best_actions, variant).items()
+        ]
+        records.append(record)
+
+    records.sort(key=lambda record: (-record["gain"], record["name"]))
+    return records, iterations
+
+
+def main():
+    relation_file = DATA_DIR / "items_relation.json"
+    output_file = DATA_DIR / "recycle_value.json"
+
+    if not relation_file.exists():
+        print(f"Error: {relation_file} not found!")
+        return
+
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        items_relation = json.load(f)
+
+    start = time.perf_counter()
+    records, iterations = analyze_recycle_value(items_relation)
+    elapsed = time.perf_counter() - start
+
+    write_json(output_file, records)
+    print(f"[OK] Recycle value of {len(records)} items saved to: {output_file}")
+    print(f"  Evaluated in {elapsed * 1000:.1f} ms ({iterations} iterations, {'NumPy' if np is not None else 'pure Python'})")
+
+    print("\nBest to break down instead of selling:")
+    for record in records[:10]:
+        if record["gain"] <= 0:
+            break
+        name = record.get("level", record["name"])
+        print(f"  {name:<32} {record['best_action']:<8} {record['sell_price']:>7} -> {record['best_value']:>7}")
+
+
+if __name__ == "__main__":
+    main()
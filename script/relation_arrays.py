@@ -0,0 +1,262 @@
+"""
+Integer-indexed (CSR) form of the relation graph
+Stores node names once and the edges as parallel typed arrays, with exporters back to items_relation.json
+"""
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from build_relation_graph import create_edge
+from cli_options import get_cli_option
+from json_output import write_json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_BINARY_FILE = DATA_DIR / "items_relation.bin"
+
+# Marks a missing quantity, dependency or level in the edge arrays
+MISSING = -1
+
+BINARY_MAGIC = b"ARCG"
+BINARY_VERSION = 1
+
+# Edge arrays in file order: field -> array typecode
+EDGE_ARRAYS = {
+    "target": "I",
+    "relation": "B",
+    "direction": "B",
+    "quantity": "i",
+    "dependency": "i",
+    "input_level": "i",
+    "output_level": "i"
+}
+
+
+class CsrGraph(NamedTuple):
+    """
+    Relation graph in compressed sparse row form.
+    The edges of node i are offsets[i]:offsets[i + 1] in every edge array;
+    relation, direction, dependency and level arrays hold indexes into the string tables.
+    """
+    nodes: List[Dict[str, Any]]            # node records without their edges
+    node_ids: Dict[str, int]
+    relations: List[str]
+    directions: List[str]
+    levels: List[str]
+    dependencies: List[List[Dict[str, Any]]]
+    offsets: array
+    target: array
+    relation: array
+    direction: array
+    quantity: array
+    dependency: array
+    input_level: array
+    output_level: array
+
+
+def build_csr_graph(items_relation: List[Dict[str, Any]]) -> CsrGraph:
+    """Convert items_relation.json records to a CsrGraph."""
+    node_ids = {node["name"]: i for i, node in enumerate(items_relation)}
+    tables: Dict[str, Dict[str, int]] = {"relation": {}, "direction": {}, "level": {}, "dependency": {}}
+    dependencies: List[List[Dict[str, Any]]] = []
+
+    def intern(table: str, key: str) -> int:
+        ids = tables[table]
+        if key not in ids:
+            ids[key] = len(ids)
+        return ids[key]
+
+    def intern_optional(table: str, value: Optional[str]) -> int:
+        return intern(table, value) if value else MISSING
+
+    nodes = []
+    offsets = array("I", [0])
+    arrays = {field: array(typecode) for field, typecode in EDGE_ARRAYS.items()}
+
+    for node in items_relation:
+        nodes.append({key: value for key, value in node.items() if key != "edges"})
+        for edge in node["edges"]:
+            arrays["target"].append(node_ids[edge["name"]])
+            arrays["relation"].append(intern("relation", edge["relation"]))
+            arrays["direction"].append(intern("direction", edge["direction"]))
+            quantity = edge.get("quantity")
+            arrays["quantity"].append(MISSING if quantity is None else quantity)
+
+            dependency = edge.get("dependency")
+            dependency_id = MISSING
+            if dependency:
+                key = json.dumps(dependency, ensure_ascii=False, separators=(',', ':'))
+                dependency_id = intern("dependency", key)
+                if dependency_id == len(dependencies):
+                    dependencies.append(dependency)
+            arrays["dependency"].append(dependency_id)
+
+            arrays["input_level"].append(intern_optional("level", edge.get("input_level")))
+            arrays["output_level"].append(intern_optional("level", edge.get("output_level")))
+        offsets.append(len(arrays["target"]))
+
+    return CsrGraph(
+        nodes=nodes,
+        node_ids=node_ids,
+        relations=list(tables["relation"]),
+        directions=list(tables["direction"]),
+        levels=list(tables["level"]),
+        dependencies=dependencies,
+        offsets=offsets,
+        **arrays
+    )
+
+
+def edge_range(graph: CsrGraph, node_id: int) -> range:
+    """Positions of a node's edges in the edge arrays."""
+    return range(graph.offsets[node_id], graph.offsets[node_id + 1])
+
+
+def neighbors(graph: CsrGraph, node_id: int) -> memoryview:
+    """Target node ids of a node's edges, as a zero-copy slice."""
+    return memoryview(graph.target)[graph.offsets[node_id]:graph.offsets[node_id + 1]]
+
+
+def export_edge(graph: CsrGraph, position: int) -> Dict[str, Any]:
+    """The items_relation.json edge record at a position in the edge arrays."""
+    def lookup(table: List[Any], index: int) -> Any:
+        return table[index] if index != MISSING else None
+
+    quantity = graph.quantity[position]
+    return create_edge(
+        name=graph.nodes[graph.target[position]]["name"],
+        direction=graph.directions[graph.direction[position]],
+        relation=graph.relations[graph.relation[position]],
+        quantity=quantity if quantity != MISSING else None,
+        dependency=lookup(graph.dependencies, graph.dependency[position]),
+        input_level=lookup(graph.levels, graph.input_level[position]),
+        output_level=lookup(graph.levels, graph.output_level[position])
+    )
+
+
+def export_node(graph: CsrGraph, node_id: int) -> Dict[str, Any]:
+    """The items_relation.json record of a node."""
+    node = dict(graph.nodes[node_id])
+    node["edges"] = [export_edge(graph, position) for position in edge_range(graph, node_id)]
+    return node
+
+
+def export_relation_graph(graph: CsrGraph) -> List[Dict[str, Any]]:
+    """Convert a CsrGraph back to items_relation.json records (identical to the input of build_csr_graph)."""
+    return [export_node(graph, node_id) for node_id in range(len(graph.nodes))]
+
+
+def as_numpy(graph: CsrGraph) -> Dict[str, Any]:
+    """Zero-copy NumPy views of the offsets and edge arrays (requires numpy)."""
+    if np is None:
+        raise ImportError("numpy is required for as_numpy (pip install numpy)")
+    fields = {"offsets": "I", **EDGE_ARRAYS}
+    return {field: np.frombuffer(getattr(graph, field), dtype=np.dtype(typecode)) for field, typecode in fields.items()}
+
+
+def save_binary(path: Path, graph: CsrGraph) -> None:
+    """
+    Write a CsrGraph as: magic, version, header length, JSON header (node records
+    and string tables), then the offsets and edge arrays as little-endian integers.
+    """
+    header = {
+        "nodes": graph.nodes,
+        "relations": graph.relations,
+        "directions": graph.directions,
+        "levels": graph.levels,
+        "dependencies": graph.dependencies,
+        "node_count": len(graph.nodes),
+        "edge_count": len(graph.target)
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(BINARY_MAGIC + struct.pack("<II", BINARY_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for field in ["offsets", *EDGE_ARRAYS]:
+            values = getattr(graph, field)
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            f.write(values.tobytes())
+    tmp_path.replace(path)
+
+
+def load_binary(path: Path) -> CsrGraph:
+    """Read a CsrGraph written by save_binary."""
+    data = Path(path).read_bytes()
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError(f"{path} is not a relation graph binary")
+    version, header_length = struct.unpack_from("<II", data, 4)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported relation graph binary version {version}")
+
+    position = 12 + header_length
+    header = json.loads(data[12:position].decode('utf-8'))
+    lengths = {"offsets": header["node_count"] + 1}
+
+    arrays = {}
+    for field, typecode in {"offsets": "I", **EDGE_ARRAYS}.items():
+        values = array(typecode)
+        size = lengths.get(field, header["edge_count"]) * values.itemsize
+        values.frombytes(data[position:position + size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        arrays[field] = values
+        position += size
+
+    nodes = header["nodes"]
+    return CsrGraph(
+        nodes=nodes,
+        node_ids={node["name"]: i for i, node in enumerate(nodes)},
+        relations=header["relations"],
+        directions=header["directions"],
+        levels=header["levels"],
+        dependencies=header["dependencies"],
+        **arrays
+    )
+
+
+def main():
+    relation_file = Path(get_cli_option('input', str(DATA_DIR / "items_relation.json")))
+    binary_file = Path(get_cli_option('output', str(DEFAULT_BINARY_FILE)))
+    export_file = get_cli_option('to-json', '')
+
+    if export_file:
+        # Convert an existing binary back to items_relation.json
+        graph = load_binary(binary_file)
+        write_json(Path(export_file), export_relation_graph(graph))
+        print(f"[OK] Exported {len(graph.nodes)} nodes to: {export_file}")
+        return
+
+    if not relation_file.exists():
+        print(f"[ERROR] {relation_file} not found")
+        return
+
+    with open(relation_file, 'r', encoding='utf-8') as f:
+        items_relation = json.load(f)
+
+    graph = build_csr_graph(items_relation)
+    save_binary(binary_file, graph)
+
+    if export_relation_graph(load_binary(binary_file)) != items_relation:
+        print("[ERROR] Binary graph does not round-trip to the JSON graph")
+        return
+
+    print(f"[OK] {len(graph.nodes)} nodes and {len(graph.target)} edges saved to: {binary_file}")
+    print(f"  JSON size: {relation_file.stat().st_size / 1024:.1f} KB")
+    print(f"  Binary size: {binary_file.stat().st_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,453 @@
 #!/usr/bin/env python
-import subprocess
+"""
+Run the data pipeline in a single process
+Stages pass the item and trader lists in memory and every artifact is written once at the end
+"""
+
+import hashlib
+import json
 import sys
 from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import adjust_item_data
+import bill_of_materials
+import build_relation_graph
+import crafting_trees
+import get_item_data_from_wiki
+import get_trader_data_from_wiki
+import recycle_value
+import verify_relation_graph
+from cli_options import get_cli_option, has_flag
+from html_extract import configure_backend_from_argv
+from instrumentation import DEFAULT_REPORT_FILE, Recorder, configure_recorder_from_argv, get_recorder
+from json_output import write_json
+from raw_store import snapshot_corpus
+from wiki_client import DEFAULT_MIN_INTERVAL, configure_client_from_argv, get_client
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Artifact name -> file it is loaded from and saved to
+ARTIFACTS = {
+    "items": DATA_DIR / "items_database.json",
+    "revisions": DATA_DIR / "items_revisions.json",
+    "traders": DATA_DIR / "traders_database.json",
+    "relation": DATA_DIR / "items_relation.json",
+    "trees": DATA_DIR / "crafting_trees.json",
+    "bom": DATA_DIR / "bom.json",
+    "recycle_value": DATA_DIR / "recycle_value.json",
+    "special_types": DATA_DIR / "special_item_types.json"
+}
+
+# Fingerprints of the last run of every memoized stage
+MANIFEST_FILE = Path(__file__).parent / ".cache" / "pipeline_manifest.json"
+
+
+class PipelineContext:
+    """
+    Artifacts shared between stages.
+    Artifacts a stage reads but no earlier stage produced are loaded from disk;
+    artifacts set by a stage are written by save().
+    """
+
+    def __init__(self, artifacts: Dict[str, Path] = ARTIFACTS):
+        self.paths = artifacts
+        self.values: Dict[str, Any] = {}
+        self.dirty: List[str] = []
+
+    def get(self, name: str) -> Any:
+        """Return an artifact, loading it from disk on first use (None if the file does not exist)."""
+        if name not in self.values:
+            self.values[name] = self.load(name)
+        return self.values[name]
+
+    def load(self, name: str) -> Any:
+        """Read an artifact from disk, ignoring any in-memory version (None if the file does not exist)."""
+        path = self.paths[name]
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def discard(self, name: str) -> None:
+        """Drop the in-memory version of an artifact so the next get() reads it from disk."""
+        self.values.pop(name, None)
+        if name in self.dirty:
+            self.dirty.remove(name)
+
+    def set(self, name: str, value: Any) -> None:
+        """Replace an artifact and mark it for saving."""
+        self.values[name] = value
+        if name not in self.dirty:
+            self.dirty.append(name)
+
+    def save(self) -> None:
+        """Write every changed artifact once."""
+        for name in self.dirty:
+            path = self.paths[name]
+            write_json(path, self.values[name])
+            print(f"[OK] Saved {path.name} ({path.stat().st_size / 1024:.1f} KB)")
+        self.dirty = []
+
+
+class Stage(NamedTuple):
+    """
+    A pipeline step: run(context) reads its inputs and sets its outputs on the context.
+    Memoized stages are skipped when their inputs and code (the listed source
+    files) are unchanged since the last run and their outputs are untouched.
+    """
+    name: str
+    run: Callable[[PipelineContext], None]
+    requires: List[str]
+    inputs: List[str]
+    outputs: List[str]
+    code: List[str] = []
+    memoize: bool = False
+
+
+def hash_value(value: Any) -> Optional[str]:
+    """Content hash of an artifact (None for a missing one)."""
+    if value is None:
+        return None
+    data = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def hash_code(filenames: List[str]) -> str:
+    """Hash of the source files a stage runs."""
+    digest = hashlib.sha256()
+    for filename in filenames:
+        digest.update(filename.encode('utf-8'))
+        digest.update((Path(__file__).parent / filename).read_bytes())
+    return digest.hexdigest()
+
+
+def stage_fingerprint(stage: Stage, input_hashes: Dict[str, Optional[str]]) -> str:
+    """Fingerprint of a stage run: its code and the content of each input."""
+    data = json.dumps({"code": hash_code(stage.code), "inputs": input_hashes}, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> Dict[str, Any]:
+    """Load the stage manifest, or an empty one."""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict[str, Any], path: Path = MANIFEST_FILE) -> None:
+    """Save the stage manifest."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def get_input_hashes(stage: Stage, context: PipelineContext, record: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Hash every input of a stage.
+    A stage that rewrites one of its own inputs (adjust) sees its previous output
+    on the next run; that counts as the input it was produced from.
+    """
+    hashes = {}
+    for name in stage.inputs:
+        current = hash_value(context.get(name))
+        if record and name in stage.outputs and current == record["outputs"].get(name):
+            current = record["inputs"].get(name)
+        hashes[name] = current
+    return hashes
+
+
+def is_up_to_date(stage: Stage, context: PipelineContext, fingerprint: str, record: Optional[Dict[str, Any]]) -> bool:
+    """True if the stage last ran with this fingerprint and its saved outputs are unchanged."""
+    if not record or record.get("fingerprint") != fingerprint:
+        return False
+    return all(hash_value(context.load(name)) == record["outputs"].get(name) for name in stage.outputs)
+
+
+def read_names(path: Path) -> List[str]:
+    """Read one name per line, skipping blank lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_items(context: PipelineContext) -> None:
+    """Fetch and parse items (only ITEMS_TO_UPDATE if that list is not empty)."""
+    options = {
+        "workers": int(get_cli_option('workers', '1')),
+        "backend": get_cli_option('backend', 'api'),
+        "min_interval": float(get_cli_option('min-interval', str(DEFAULT_MIN_INTERVAL))),
+        "parse_workers": int(get_cli_option('parse-workers', str(get_item_data_from_wiki.DEFAULT_PARSE_WORKERS))),
+        "include_raw": has_flag('include-raw')
+    }
+
+    if get_item_data_from_wiki.ITEMS_TO_UPDATE:
+        item_names = get_item_data_from_wiki.ITEMS_TO_UPDATE
+        print(f"Updating {len(item_names)} specific items\n")
+        fetched_items, failed_items = get_item_data_from_wiki.fetch_items(item_names, **options)
+        items_database = get_item_data_from_wiki.merge_items(context.get("items") or [], fetched_items)
+    else:
+        item_names = read_names(DATA_DIR / "names.txt")
+        print(f"Found {len(item_names)} items to process\n")
+        revisions = {}
+        items_database, failed_items = get_item_data_from_wiki.fetch_items(
+            item_names,
+            revisions=revisions,
+            **options
+        )
+        parsed_names = {item['name'] for item in items_database}
+        context.set("revisions", dict(sorted(
+            (name, revid) for name, revid in revisions.items() if name in parsed_names
+        )))
+        if options["include_raw"]:
+            snapshot_corpus(
+                "items",
+                {item['name']: item['raw_source'] for item in items_database if 'raw_source' in item},
+                revisions=revisions
+            )
+
+    context.set("items", items_database)
+    if failed_items:
+        print(f"\n[FAILED] Failed: {len(failed_items)} items")
+        for item in failed_items:
+            print(f"  - {item}")
+
+
+def run_traders(context: PipelineContext) -> None:
+    """Fetch and parse traders."""
+    trader_names = read_names(DATA_DIR / "traders.txt")
+    backend = get_cli_option('backend', 'api')
+    include_raw = has_flag('include-raw')
+    traders_database, failed_traders = get_trader_data_from_wiki.fetch_traders(
+        trader_names, backend=backend, include_raw=include_raw
+    )
+    context.set("traders", traders_database)
+    if include_raw:
+        snapshot_corpus(
+            "traders",
+            {trader['name']: trader['raw_source'] for trader in traders_database if 'raw_source' in trader}
+        )
+    if failed_traders:
+        print(f"\n[FAILED] Failed: {len(failed_traders)} traders")
+        for trader in failed_traders:
+            print(f"  - {trader}")
+
+
+def run_adjust(context: PipelineContext) -> None:
+    """Apply manual corrections to the items."""
+    items_database = context.get("items")
+    if items_database is None:
+        raise FileNotFoundError(f"{ARTIFACTS['items']} not found")
+    special_types_map = adjust_item_data.load_special_types_map(DATA_DIR)
+    updated = adjust_item_data.apply_item_adjustments(items_database, special_types_map)
+    context.set("items", items_database)
+    print(f"Updated {updated} item fields")
+
+
+def run_graph(context: PipelineContext) -> None:
+    """Build the relation graph from the items and traders."""
+    items_database = context.get("items")
+    if items_database is None:
+        raise FileNotFoundError(f"{ARTIFACTS['items']} not found")
+    nodes = build_relation_graph.build_relation_graph(items_database, context.get("traders"))
+    items_relation = list(nodes.values())
+    context.set("relation", items_relation)
+    print(f"Created {len(items_relation)} nodes in graph")
+    build_relation_graph.print_graph_statistics(items_relation)
+
+
+def run_trees(context: PipelineContext) -> None:
+    """Precompute crafting trees and recycle/salvage closures from the relation graph."""
+    items_relation = context.get("relation")
+    if items_relation is None:
+        raise FileNotFoundError(f"{ARTIFACTS['relation']} not found")
+    trees = crafting_trees.build_crafting_trees(items_relation)
+    context.set("trees", trees)
+    print(f"Precomputed crafting trees for {len(trees)} items")
+
+
+def run_bom(context: PipelineContext) -> None:
+    """Compute the raw-material bill of materials of every craftable item."""
+    items_relation = context.get("relation")
+    if items_relation is None:
+        raise FileNotFoundError(f"{ARTIFACTS['relation']} not found")
+    bom = bill_of_materials.build_bom(items_relation)
+    context.set("bom", bom)
+    print(f"Computed bills of materials for {len(bom)} items")
+
+
+def run_value(context: PipelineContext) -> None:
+    """Rank items by the value of recycling or salvaging them instead of selling."""
+    items_relation = context.get("relation")
+    if items_relation is None:
+        raise FileNotFoundError(f"{ARTIFACTS['relation']} not found")
+    records, iterations = recycle_value.analyze_recycle_value(items_relation)
+    context.set("recycle_value", records)
+    print(f"Evaluated recycle value of {len(records)} items ({iterations} iterations)")
+
+
+def run_verify(context: PipelineContext) -> None:
+    """Check the relation graph (required fields and reverse edges); problems are reported, not fatal."""
+    items_relation = context.get("relation")
+    if items_relation is None:
+        raise FileNotFoundError(f"{ARTIFACTS['relation']} not found")
+    verify_relation_graph.check_relation_graph(items_relation)
+
+
+# The fetch stages read the wiki, so they always run; the local stages are memoized
+STAGES = [
+    Stage("items", run_items, requires=[], inputs=["items"], outputs=["items", "revisions"]),
+    Stage("traders", run_traders, requires=[], inputs=[], outputs=["traders"]),
+    Stage(
+        "adjust", run_adjust, requires=["items"],
+        inputs=["items", "special_types"], outputs=["items"],
+        code=["adjust_item_data.py"], memoize=True
+    ),
+    Stage(
+        "graph", run_graph, requires=["adjust", "traders"],
+        inputs=["items", "traders"], outputs=["relation"],
+        code=["build_relation_graph.py"], memoize=True
+    ),
+    Stage("verify", run_verify, requires=["graph"], inputs=["relation"], outputs=[]),
+    Stage(
+        "trees", run_trees, requires=["graph"],
+        inputs=["relation"], outputs=["trees"],
+        code=["crafting_trees.py"], memoize=True
+    ),
+    Stage(
+        "bom", run_bom, requires=["graph"],
+        inputs=["relation"], outputs=["bom"],
+        code=["bill_of_materials.py", "crafting_trees.py"], memoize=True
+    ),
+    Stage(
+        "value", run_value, requires=["graph"],
+        inputs=["relation"], outputs=["recycle_value"],
+        code=["recycle_value.py", "relation_arrays.py", "bill_of_materials.py"], memoize=True
+    )
+]
+
+
+def topological_order(stages: List[Stage]) -> List[Stage]:
+    """Order stages so each runs after the stages it requires (declaration order otherwise)."""
+    by_name = {stage.name: stage for stage in stages}
+    ordered: List[Stage] = []
+    visiting = set()
+
+    def visit(stage: Stage) -> None:
+        if stage in ordered:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Pipeline stages form a cycle at '{stage.name}'")
+        visiting.add(stage.name)
+        for name in stage.requires:
+            visit(by_name[name])
+        visiting.discard(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+def select_stages(
+    stages: List[Stage],
+    names: Optional[List[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None
+) -> List[Stage]:
+    """Pick stages by name (--stages) or as a from/to range of the execution order."""
+    ordered = topological_order(stages)
+    known = [stage.name for stage in ordered]
+    for name in (names or []) + [name for name in (start, end) if name]:
+        if name not in known:
+            raise ValueError(f"Unknown stage '{name}' (stages: {', '.join(known)})")
+
+    if names:
+        return [stage for stage in ordered if stage.name in names]
+    first = known.index(start) if start else 0
+    last = known.index(end) if end else len(known) - 1
+    return ordered[first:last + 1]
+
+
+def run_pipeline(
+    stages: List[Stage],
+    context: Optional[PipelineContext] = None,
+    force: bool = False,
+    manifest_file: Path = MANIFEST_FILE,
+    recorder: Optional[Recorder] = None
+) -> Dict[str, float]:
+    """
+    Run stages in order, save the artifacts and return stage name -> seconds.
+    Memoized stages whose fingerprint matches the manifest are skipped unless force is set.
+    Every stage (and the final save) is measured as a span of recorder.
+    """
+    context = context or PipelineContext()
+    recorder = recorder or get_recorder()
+    manifest = load_manifest(manifest_file)
+    completed: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    try:
+        for stage in stages:
+            print(f"\n{'='*60}\nSTAGE: {stage.name}\n{'='*60}")
+            
+            with recorder.span(stage.name, stage=True) as span:
+                if stage.memoize:
+                    record = manifest.get(stage.name)
+                    input_hashes = get_input_hashes(stage, context, record)
+                    fingerprint = stage_fingerprint(stage, input_hashes)
+                    if not force and is_up_to_date(stage, context, fingerprint, record):
+                        # Use the saved outputs in place of anything produced in memory
+                        for name in stage.outputs:
+                            context.discard(name)
+                        print("[OK] Up to date, skipped (use --force to run anyway)")
+                        span["skipped"] = True
+                        continue
+                
+                stage.run(context)
+                
+                if stage.memoize:
+                    completed[stage.name] = {
+                        "fingerprint": fingerprint,
+                        "inputs": input_hashes,
+                        "outputs": {name: hash_value(context.get(name)) for name in stage.outputs}
+                    }
+    finally:
+        # Keep the results of the stages that finished, even if a later one failed
+        print()
+        with recorder.span("save", stage=True):
+            context.save()
+            if completed:
+                manifest.update(completed)
+                save_manifest(manifest, manifest_file)
+        timings = {span["name"]: span["wall_seconds"] for span in recorder.spans if "stage" not in span}
+    return timings
+
+
+def main():
+    names = [name for name in get_cli_option('stages', '').split(',') if name]
+    start = get_cli_option('from', '') or None
+    end = get_cli_option('to', '') or None
+
+    try:
+        stages = select_stages(STAGES, names, start, end)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    print(f"Running stages: {', '.join(stage.name for stage in stages)}")
+    configure_client_from_argv(sys.argv)
+    configure_backend_from_argv(sys.argv)
+    recorder = configure_recorder_from_argv(sys.argv)
+    try:
+        run_pipeline(stages, force=has_flag('force'), recorder=recorder)
+    finally:
+        get_client().print_stats()
+        recorder.print_summary()
+        report_file = recorder.write_report(Path(get_cli_option('report', str(DEFAULT_REPORT_FILE))))
+        print(f"\n[OK] Run report saved to: {report_file}")
+        if recorder.profile_dir is not None:
+            print(f"[OK] Stage profiles saved to: {recorder.profile_dir}")
+
 
-subprocess.run([sys.executable, "get_item_data_from_wiki.py"], check=True, cwd=Path(__file__).parent)
-subprocess.run([sys.executable, "get_trader_data_from_wiki.py"], check=True, cwd=Path(__file__).parent)
-subprocess.run([sys.executable, "adjust_item_data.py"], check=True, cwd=Path(__file__).parent)
-subprocess.run([sys.executable, "build_relation_graph.py"], check=True, cwd=Path(__file__).parent)
+if __name__ == "__main__":
+    main()
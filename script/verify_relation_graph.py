@@ -4,8 +4,15 @@ Checks that all items have required fields and edges are bidirectional
 """
 
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from cli_options import get_cli_option
+
+# (source, target, relation, input_level, output_level) as interned string ids
+EdgeTuple = Tuple[int, int, int, int, int]
 
 
 def check_required_fields(node: Dict[str, Any]) -> List[str]:
@@ -44,104 +51,133 @@ def check_required_fields(node: Dict[str, Any]) -> List[str]:
     return missing
 
 
-def get_edge_key(source: str, target: str, relation: str, 
-                 input_level: str = None, output_level: str = None) -> str:
-    """Create a unique key for an edge."""
-    parts = [source, target, relation]
-    if input_level:
-        parts.append(f"in:{input_level}")
-    if output_level:
-        parts.append(f"out:{output_level}")
-    return "||".join(parts)
+REVERSE_RELATIONS = {
+    "craft_from": "craft_to",
+    "craft_to": "craft_from",
+    "upgrade_from": "upgrade_to",
+    "upgrade_to": "upgrade_from",
+    "repair_from": "repair_to",
+    "repair_to": "repair_from",
+    "recycle_to": "recycle_from",
+    "recycle_from": "recycle_to",
+    "salvage_to": "salvage_from",
+    "salvage_from": "salvage_to",
+    "trader": "sold_by",
+    "sold_by": "trader"
+}
 
 
 def get_reverse_relation(relation: str) -> str:
     """Get the reverse relation type."""
-    reverse_map = {
-        "craft_from": "craft_to",
-        "craft_to": "craft_from",
-        "upgrade_from": "upgrade_to",
-        "upgrade_to": "upgrade_from",
-        "repair_from": "repair_to",
-        "repair_to": "repair_from",
-        "recycle_to": "recycle_from",
-        "recycle_from": "recycle_to",
-        "salvage_to": "salvage_from",
-        "salvage_from": "salvage_to",
-        "trader": "sold_by",
-        "sold_by": "trader"
-    }
-    return reverse_map.get(relation)
+    return REVERSE_RELATIONS.get(relation)
 
 
-def verify_bidirectional_edges(nodes: List[Dict[str, Any]]) -> Tuple[List[str], int]:
+def encode_edges(nodes: List[Dict[str, Any]]) -> Tuple[List[EdgeTuple], List[str], List[str]]:
     """
-    Verify that all edges have corresponding reverse edges.
-    Returns (list of errors, total edge count).
+    Encode every edge as (source, target, relation, input_level, output_level)
+    with each string interned to an int (0 stands for a missing level).
+    Returns (edge tuples, string table, errors for edges that cannot be encoded).
     """
-    errors = []
-    
-    # Build index of all edges
-    edge_map = {}  # edge_key -> (source_node, edge_data)
+    # setdefault(value, len(ids)) interns a string in a single call
+    ids: Dict[Optional[str], int] = {None: 0}
+    intern = ids.setdefault
     
+    edges = []
+    errors = []
     for node in nodes:
         node_name = node.get("name")
         if not node_name:
             continue
+        source = intern(node_name, len(ids))
         
-        edges = node.get("edges", [])
-        for edge in edges:
+        for edge in node.get("edges", []):
             target_name = edge.get("name")
             relation = edge.get("relation")
-            input_level = edge.get("input_level")
-            output_level = edge.get("output_level")
-            
             if not target_name or not relation:
                 errors.append(f"Invalid edge in node '{node_name}': missing name or relation")
                 continue
-            
-            # Create edge key
-            edge_key = get_edge_key(node_name, target_name, relation, input_level, output_level)
-            edge_map[edge_key] = (node_name, edge)
+            if relation not in REVERSE_RELATIONS:
+                errors.append(f"Unknown relation type '{relation}' in edge {node_name} -> {target_name}")
+                continue
+            edges.append((
+                source,
+                intern(target_name, len(ids)),
+                intern(relation, len(ids)),
+                intern(edge.get("input_level") or None, len(ids)),
+                intern(edge.get("output_level") or None, len(ids))
+            ))
     
-    # Check for reverse edges
-    checked_edges = set()
+    return edges, list(ids), errors
+
+
+def find_unmatched_edges(edges: List[EdgeTuple], reverse_relations: Dict[int, int]) -> List[Tuple[EdgeTuple, int, int]]:
+    """
+    Compare the edge multiset with its mirror image in one pass.
+    Returns (edge, count, reverse count) for every edge that occurs more often
+    than its reverse, so duplicates without a matching duplicate are reported too.
+    """
+    counts = Counter(edges)
+    unmatched = []
+    for edge, count in counts.items():
+        source, target, relation, input_level, output_level = edge
+        reverse = (target, source, reverse_relations[relation], output_level, input_level)
+        reverse_count = counts.get(reverse, 0)
+        if count > reverse_count:
+            unmatched.append((edge, count, reverse_count))
+    return unmatched
+
+
+def shard_edges(edges: List[EdgeTuple], shards: int) -> List[List[EdgeTuple]]:
+    """Split edges so that every edge lands in the same shard as its reverse."""
+    buckets: List[List[EdgeTuple]] = [[] for _ in range(shards)]
+    for edge in edges:
+        buckets[(edge[0] ^ edge[1]) % shards].append(edge)
+    return buckets
+
+
+def verify_bidirectional_edges(nodes: List[Dict[str, Any]], workers: int = 1) -> Tuple[List[str], int]:
+    """
+    Verify that all edges have corresponding reverse edges.
+    Every edge must be matched by its own reverse edge, so an edge listed twice
+    needs two reverse edges. With workers > 1 the comparison is split across processes.
+    Returns (list of errors, total edge count).
+    """
+    edges, strings, errors = encode_edges(nodes)
+    string_ids = {value: i for i, value in enumerate(strings)}
+    reverse_relations = {
+        string_ids[value]: string_ids.setdefault(get_reverse_relation(value), len(string_ids))
+        for value in strings[1:] if get_reverse_relation(value)
+    }
     
-    for edge_key, (source_node, edge) in edge_map.items():
-        if edge_key in checked_edges:
-            continue
-        
-        target_name = edge.get("name")
-        relation = edge.get("relation")
-        input_level = edge.get("input_level")
-        output_level = edge.get("output_level")
-        
-        # Get reverse relation
-        reverse_relation = get_reverse_relation(relation)
-        
-        if not reverse_relation:
-            errors.append(f"Unknown relation type '{relation}' in edge {source_node} -> {target_name}")
-            continue
-        
-        # Create reverse edge key (swap input/output levels)
-        reverse_key = get_edge_key(target_name, source_node, reverse_relation, 
-                                   output_level, input_level)
-        
-        # Check if reverse edge exists
-        if reverse_key not in edge_map:
-            errors.append(
-                f"Missing reverse edge: {source_node} -{relation}-> {target_name} "
-                f"(expected {target_name} -{reverse_relation}-> {source_node})"
+    if workers > 1 and len(edges) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                find_unmatched_edges,
+                shard_edges(edges, workers),
+                [reverse_relations] * workers
             )
-        else:
-            # Mark both edges as checked
-            checked_edges.add(edge_key)
-            checked_edges.add(reverse_key)
+            unmatched = [item for result in results for item in result]
+        # Report in edge order, as a single process would
+        first_seen = {edge: i for i, edge in reversed(list(enumerate(edges)))}
+        unmatched.sort(key=lambda item: first_seen[item[0]])
+    else:
+        unmatched = find_unmatched_edges(edges, reverse_relations)
+    
+    for (source, target, relation, _, _), count, reverse_count in unmatched:
+        source_name, target_name, relation_name = strings[source], strings[target], strings[relation]
+        reverse_relation = get_reverse_relation(relation_name)
+        message = (
+            f"Missing reverse edge: {source_name} -{relation_name}-> {target_name} "
+            f"(expected {target_name} -{reverse_relation}-> {source_name})"
+        )
+        if count > 1:
+            message += f" [{count} edges, {reverse_count} reverse edges]"
+        errors.append(message)
     
-    return errors, len(edge_map)
+    return errors, len(edges)
 
 
-def verify_relation_graph(relation_file: Path) -> bool:
+def verify_relation_graph(relation_file: Path, workers: int = 1) -> bool:
     """
     Verify relation graph structure.
     Returns True if all checks pass, False otherwise.
@@ -160,6 +196,14 @@ def verify_relation_graph(relation_file: Path) -> bool:
     print(f"[OK] Loaded {len(nodes)} nodes from graph")
     print()
     
+    return check_relation_graph(nodes, workers)
+
+
+def check_relation_graph(nodes: List[Dict[str, Any]], workers: int = 1) -> bool:
+    """
+    Run and print every check on a loaded relation graph.
+    Returns True if all checks pass, False otherwise.
+    """
     # Statistics
     total_nodes = len(nodes)
     nodes_with_edges = sum(1 for n in nodes if n.get("edges"))
@@ -192,7 +236,7 @@ def verify_relation_graph(relation_file: Path) -> bool:
     print("Check 2: Bidirectional edges")
     print("-" * 70)
     
-    edge_errors, total_edges = verify_bidirectional_edges(nodes)
+    edge_errors, total_edges = verify_bidirectional_edges(nodes, workers)
     
     if edge_errors:
         print(f"[FAIL] Found {len(edge_errors)} edge errors:")
@@ -259,7 +303,9 @@ def main():
     data_dir = Path(__file__).parent.parent / "data"
     relation_file = data_dir / "items_relation.json"
     
-    success = verify_relation_graph(relation_file)
+    workers = int(get_cli_option('workers', '1'))
+    
+    success = verify_relation_graph(relation_file, workers)
     
     exit(0 if success else 1)
 
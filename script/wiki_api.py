@@ -0,0 +1,231 @@
+"""
+MediaWiki API helpers for the wiki scrapers
+Fetches raw wikitext for many pages per request instead of one edit page per item
+"""
+
+from typing import Dict, List, Optional, Any
+
+from wiki_client import RateLimiter, get_client
+
+API_URL = "https://arcraiders.wiki/w/api.php"
+
+# MediaWiki accepts at most 50 titles per query for regular clients
+MAX_TITLES_PER_REQUEST = 50
+
+# The wiki serves every scaled thumbnail as a WebP rendition next to the
+# plain-format thumb that imageinfo reports; original files are served as-is
+THUMB_PATH = "/w/images/thumb/"
+WEBP_SUFFIX = ".webp"
+
+
+def chunked(values: List[str], size: int) -> List[List[str]]:
+    """Split a list into consecutive chunks of at most size elements."""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def query_api(
+    params: Dict[str, Any],
+    rate_limiter: Optional[RateLimiter] = None,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Run an action=query request, following continuation.
+    Returns the "query" block of every response page.
+    """
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        **params
+    }
+
+    results = []
+    continue_params: Dict[str, Any] = {}
+    while True:
+        if rate_limiter:
+            rate_limiter.wait()
+        response = get_client().get(API_URL, params={**params, **continue_params}, use_cache=use_cache)
+        data = response.json()
+
+        if "error" in data:
+            raise ValueError(f"MediaWiki API error: {data['error'].get('info', data['error'])}")
+        if "query" in data:
+            results.append(data["query"])
+
+        if "continue" not in data:
+            return results
+        continue_params = data["continue"]
+
+
+def map_requested_titles(titles: List[str], query: Dict[str, Any]) -> Dict[str, str]:
+    """Map each normalized page title in a query result back to the title we asked for."""
+    requested = {title: title for title in titles}
+    for entry in query.get("normalized", []):
+        if entry.get("from") in requested:
+            requested[entry["to"]] = requested.pop(entry["from"])
+    return requested
+
+
+def fetch_revision_ids(
+    titles: List[str],
+    rate_limiter: Optional[RateLimiter] = None,
+    batch_size: int = MAX_TITLES_PER_REQUEST
+) -> Dict[str, int]:
+    """
+    Look up the current revision ID of many pages without downloading content.
+    Returns requested title -> revid; missing pages are left out.
+    """
+    revids: Dict[str, int] = {}
+
+    for batch in chunked(titles, batch_size):
+        queries = query_api({
+            "prop": "revisions",
+            "rvprop": "ids",
+            "titles": "|".join(batch)
+        }, rate_limiter=rate_limiter)
+
+        for query in queries:
+            requested = map_requested_titles(batch, query)
+            for page in query.get("pages", []):
+                revisions = page.get("revisions")
+                if page.get("missing") or page.get("invalid") or not revisions:
+                    continue
+                title = requested.get(page["title"], page["title"])
+                revids[title] = revisions[0].get("revid")
+
+    return revids
+
+
+def fetch_wikitext_batch(
+    titles: List[str],
+    rate_limiter: Optional[RateLimiter] = None,
+    batch_size: int = MAX_TITLES_PER_REQUEST
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the current wikitext of many pages.
+    Returns requested title -> {"title", "revid", "source"}.
+    Missing pages are left out so callers can fall back to the edit page.
+    When the shared client has a cache, only pages whose revision changed are
+    downloaded; offline, every page is served from the cache.
+    """
+    client = get_client()
+    cache = client.cache
+    pages: Dict[str, Dict[str, Any]] = {}
+
+    to_fetch = titles
+    if cache is not None:
+        if client.offline:
+            current_revids = {}
+        else:
+            current_revids = fetch_revision_ids(titles, rate_limiter=rate_limiter, batch_size=batch_size)
+
+        to_fetch = []
+        for title in titles:
+            if not client.offline and title not in current_revids:
+                continue
+            # A stored source at an older revision is fetched again, so it counts as a miss
+            cached = cache.get_wikitext(title, count=False)
+            usable = bool(cached) and (client.offline or cached["revid"] == current_revids[title])
+            cache.record_lookup(hit=usable)
+            if usable:
+                pages[title] = {"title": title, "revid": cached["revid"], "source": cached["source"]}
+            elif not client.offline:
+                to_fetch.append(title)
+
+    for batch in chunked(to_fetch, batch_size):
+        queries = query_api({
+            "prop": "revisions",
+            "rvprop": "ids|content",
+            "rvslots": "main",
+            "titles": "|".join(batch)
+        }, rate_limiter=rate_limiter, use_cache=False)
+
+        for query in queries:
+            requested = map_requested_titles(batch, query)
+            for page in query.get("pages", []):
+                if page.get("missing") or page.get("invalid"):
+                    continue
+                revisions = page.get("revisions")
+                if not revisions:
+                    continue
+
+                revision = revisions[0]
+                content = revision.get("slots", {}).get("main", {}).get("content")
+                if content is None:
+                    continue
+
+                title = requested.get(page["title"], page["title"])
+                pages[title] = {
+                    "title": page["title"],
+                    "revid": revision.get("revid"),
+                    "source": content
+                }
+                if cache is not None:
+                    cache.put_wikitext(title, revision.get("revid"), content)
+
+    return pages
+
+
+def page_rendition(url: str) -> str:
+    """Rewrite an imageinfo thumb URL to the WebP rendition the rendered page links to."""
+    if THUMB_PATH in url and not url.endswith(WEBP_SUFFIX):
+        return url + WEBP_SUFFIX
+    return url
+
+
+def resolve_image_urls(
+    filenames: List[str],
+    width: int = 348,
+    include_file_page: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
+    batch_size: int = MAX_TITLES_PER_REQUEST
+) -> Dict[str, Dict[str, str]]:
+    """
+    Resolve image URLs for many files with prop=imageinfo.
+    Returns filename -> {"thumb", "original", "file_page"} in the form the page
+    scrape stores them: "thumb" is the width px image and "original" the first
+    higher-resolution srcset candidate, if any. imageinfo reports plain-format
+    thumbs, so scaled thumbs are rewritten to the page's .webp rendition;
+    images no wider than a candidate keep the original file URL.
+    """
+    image_urls: Dict[str, Dict[str, str]] = {}
+    titles = {f"File:{filename}": filename for filename in dict.fromkeys(filenames) if filename}
+
+    for batch in chunked(list(titles), batch_size):
+        queries = query_api({
+            "prop": "imageinfo",
+            "iiprop": "url",
+            "iiurlwidth": str(width),
+            "titles": "|".join(batch)
+        }, rate_limiter=rate_limiter)
+
+        for query in queries:
+            requested = map_requested_titles(batch, query)
+            for page in query.get("pages", []):
+                info_list = page.get("imageinfo")
+                if not info_list:
+                    continue
+
+                info = info_list[0]
+                thumb = info.get("thumburl") or info.get("url")
+                if not thumb:
+                    continue
+
+                thumb = page_rendition(thumb)
+                urls = {"thumb": thumb}
+                # Same candidates the page's srcset would list, in order
+                for scale in ("1.5", "2"):
+                    candidate = info.get("responsiveUrls", {}).get(scale)
+                    if candidate:
+                        candidate = page_rendition(candidate)
+                    if candidate and candidate != thumb:
+                        urls["original"] = candidate
+                        break
+                if include_file_page and info.get("descriptionurl"):
+                    urls["file_page"] = info["descriptionurl"]
+
+                filename = titles.get(requested.get(page["title"], page["title"]))
+                if filename:
+                    image_urls[filename] = urls
+
+    return image_urls
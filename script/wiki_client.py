@@ -0,0 +1,285 @@
+"""
+Shared HTTP client for the wiki scrapers
+Keeps pooled keep-alive connections, applies timeouts and retries transient errors
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from http_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, HttpCache
+
+# Average gap between two requests in the sequential crawler
+# (0.2s before the image request + 0.5s after each item, two requests per item)
+DEFAULT_MIN_INTERVAL = 0.35
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+USER_AGENT = "arcforge-data-pipeline (+https://github.com/wangyz1999/arcforge)"
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces requests at least min_interval seconds apart.
+    Shared by all fetch workers so total load on the wiki stays the same
+    regardless of concurrency.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller is allowed to send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        remaining = slot - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class WikiClient:
+    """
+    requests.Session wrapper used by every scraper.
+    Retries 429/5xx responses and connection errors with exponential backoff
+    and jitter, honors Retry-After, and records per-host latency statistics.
+    With a cache, requests are revalidated with ETag/Last-Modified; in offline
+    mode every response is replayed from the cache.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        pool_size: int = 16,
+        cache: Optional[HttpCache] = None,
+        offline: bool = False
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.offline = offline
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.host_stats: Dict[str, Dict[str, Any]] = {}
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before retry number attempt (0-based)."""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay + random.uniform(0, self.backoff_base)
+
+    def _record(
+        self,
+        url: str,
+        elapsed: float,
+        retried: bool = False,
+        failed: bool = False,
+        response: Optional[requests.Response] = None
+    ) -> None:
+        """Record one request attempt in the per-host statistics."""
+        host = urlparse(url).netloc
+        with self._stats_lock:
+            stats = self.host_stats.setdefault(host, {
+                "requests": 0,
+                "retries": 0,
+                "errors": 0,
+                "not_modified": 0,
+                "bytes": 0,
+                "total_time": 0.0,
+                "max_time": 0.0
+            })
+            stats["requests"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+            if response is not None:
+                stats["bytes"] += len(response.content)
+                if response.status_code == 304:
+                    stats["not_modified"] += 1
+            if retried:
+                stats["retries"] += 1
+            if failed:
+                stats["errors"] += 1
+
+    def get(self, url: str, use_cache: bool = True, **kwargs) -> requests.Response:
+        """
+        GET a URL, retrying transient failures.
+        Raises requests.RequestException once retries are exhausted, or when
+        offline and the URL is not cached.
+        """
+        if self.cache is None or not use_cache:
+            if self.offline:
+                raise requests.ConnectionError(f"Offline mode: not cached: {url}")
+            return self._fetch(url, **kwargs)
+
+        params = kwargs.pop("params", None)
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        # Counted below: an entry sent for revalidation is a hit only if the server answers 304
+        cached = self.cache.get(cache_key, count=False)
+
+        if self.offline:
+            self.cache.record_lookup(hit=cached is not None)
+            if cached is None:
+                raise requests.ConnectionError(f"Offline mode: not cached: {cache_key}")
+            return build_cached_response(cache_key, cached)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._fetch(cache_key, headers=headers, **kwargs)
+        self.cache.record_lookup(hit=response.status_code == 304 and bool(cached), revalidated=bool(cached))
+        if response.status_code == 304 and cached:
+            return build_cached_response(cache_key, cached)
+
+        self.cache.put(cache_key, response.content, {
+            key: value for key, value in response.headers.items()
+            if key.lower() in ("content-type", "etag", "last-modified")
+        })
+        return response
+
+    def _fetch(self, url: str, **kwargs) -> requests.Response:
+        """Send the request over the network with retries."""
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, time.monotonic() - start, retried=not last_attempt, failed=last_attempt)
+                if last_attempt:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            elapsed = time.monotonic() - start
+            if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+                self._record(url, elapsed, retried=True)
+                time.sleep(self._backoff_delay(attempt, response))
+                continue
+
+            self._record(url, elapsed, failed=not response.ok, response=response)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+
+    def totals(self) -> Dict[str, Any]:
+        """Request, byte and cache counters summed over all hosts."""
+        with self._stats_lock:
+            totals = {
+                key: sum(stats[key] for stats in self.host_stats.values())
+                for key in ("requests", "retries", "errors", "not_modified", "bytes", "total_time")
+            }
+        totals["cache_hits"] = self.cache.hits if self.cache is not None else 0
+        totals["cache_misses"] = self.cache.misses if self.cache is not None else 0
+        totals["cache_revalidations"] = self.cache.revalidations if self.cache is not None else 0
+        return totals
+
+    def print_stats(self) -> None:
+        """Print per-host request latency statistics."""
+        if self.cache is not None:
+            print(f"\nHTTP cache: {self.cache.hits} hits, {self.cache.misses} misses "
+                  f"({self.cache.hit_rate():.0%} hit rate), {self.cache.revalidations} revalidated")
+        if not self.host_stats:
+            return
+        print("\nHTTP statistics:")
+        for host, stats in sorted(self.host_stats.items()):
+            average = stats["total_time"] / stats["requests"] if stats["requests"] else 0.0
+            print(f"  {host}: {stats['requests']} requests, {stats['bytes'] / 1024:.0f} KB, "
+                  f"avg {average * 1000:.0f} ms, max {stats['max_time'] * 1000:.0f} ms, "
+                  f"{stats['retries']} retries, {stats['errors']} errors")
+
+
+def build_cached_response(url: str, cached: Dict[str, Any]) -> requests.Response:
+    """Build a requests.Response from a cache entry."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = cached["body"]
+    response.headers = CaseInsensitiveDict(cached["headers"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+_default_client: Optional[WikiClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> WikiClient:
+    """Return the process-wide shared WikiClient."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = WikiClient()
+        return _default_client
+
+
+def configure_client(
+    use_cache: bool = True,
+    offline: bool = False,
+    cache_path: Path = DEFAULT_CACHE_PATH,
+    max_cache_bytes: int = DEFAULT_MAX_BYTES
+) -> WikiClient:
+    """Replace the shared WikiClient, optionally backed by the on-disk cache."""
+    global _default_client
+    cache = HttpCache(cache_path, max_cache_bytes) if use_cache or offline else None
+    with _default_client_lock:
+        _default_client = WikiClient(cache=cache, offline=offline)
+        return _default_client
+
+
+def configure_client_from_argv(argv: List[str]) -> WikiClient:
+    """Configure the shared client from --offline, --no-cache and --cache-size=MB flags."""
+    max_cache_bytes = DEFAULT_MAX_BYTES
+    for arg in argv:
+        if arg.startswith("--cache-size="):
+            max_cache_bytes = int(float(arg.split("=", 1)[1]) * 1024 * 1024)
+    return configure_client(
+        use_cache="--no-cache" not in argv,
+        offline="--offline" in argv,
+        max_cache_bytes=max_cache_bytes
+    )
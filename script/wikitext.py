@@ -0,0 +1,138 @@
+"""
+Small MediaWiki wikitext lexer shared by the wiki scrapers
+Precompiled patterns for templates, links and table markup, and a line
+tokenizer that classifies table rows, cells and |key=value parameters once
+"""
+
+import html
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Template blocks (non-greedy: a block ends at the first closing braces line)
+INFOBOX_TEMPLATE = re.compile(r'\{\{Infobox[^\n]*\n(.*?)\n\}\}', re.DOTALL)
+RECYCLING_TEMPLATE = re.compile(r'\{\{Recycling table(.*?)\}\}', re.DOTALL)
+ITEMGRID_TEMPLATE = re.compile(r'\{\{ItemGrid\s*\n(.*?)\n\}\}', re.DOTALL)
+
+# == Heading == / === Heading === lines, and the whitespace that follows one
+SECTION_HEADING = re.compile(r'(={2,3})[ \t]*([^=\n](?:[^\n]*?[^=\n])?)[ \t]*\1(?=\s*\n)')
+WHITESPACE = re.compile(r'\s*')
+
+# Inline templates and links
+PRICE_TEMPLATE = re.compile(r'\{\{Price\|([^}]+)\}\}')
+PAGENAME_QUANTITY = re.compile(r'(\d+)x\s*\{\{PAGENAME\}\}')
+LINK = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]')
+QUANTITY_LINK = re.compile(r'(\d+)x\s*\[\[([^\]|]+)(?:\|[^\]]+)?\]\]')
+FILE_LINK = re.compile(r'\[\[File:([^\]|]+\.(png|webp))', re.IGNORECASE)
+TRADER_FILE_LINK = re.compile(r'\[\[File:(Trader_[^\]|]+\.png)', re.IGNORECASE)
+LINK_PARAMETER = re.compile(r'\|link=([^\]|]+)')
+
+# Formatting
+BOLD_ITALIC = re.compile(r"'{2,}")
+BOLD_TEXT = re.compile(r"'''([^']+)'''")
+HTML_TAG = re.compile(r'<[^>]*>')
+LINE_BREAK = re.compile(r'<br>|<br/>')
+STYLE_ATTRIBUTE = re.compile(r'style="[^"]*"')
+PIPES = re.compile(r'\|+')
+
+# Cell contents
+ROMAN_LEVEL = re.compile(r'\b(I{1,3}|IV)\b')
+QUANTITY_PREFIX = re.compile(r'(\d+)x\s*(.+)')
+QUANTITY_NAME = re.compile(r'(\d+)\s+(.+)')
+PLUS_SEPARATOR = re.compile(r'\s*\+\s*')
+NUMBERED_KEY = re.compile(r'([a-zA-Z-]+)(\d+)')
+COUNT_MULTIPLIER = re.compile(r'x(\d+)')
+FRACTION = re.compile(r'(\d+)/(\d+)')
+WORKSHOP = re.compile(
+    r'(Workbench|Gunsmith|Medical Lab|Gear Bench|Explosives Station|Utility Station|Refiner|Inventory)\s*(\d+)?',
+    re.IGNORECASE
+)
+
+
+class LineToken(NamedTuple):
+    """
+    One stripped line of wikitext.
+    kind is "blank", "table_start" ({|...), "table_end" (|}), "row" (|-),
+    "cell" (any other line starting with a pipe) or "text".
+    cell is the content after the leading pipe for every pipe line (None otherwise);
+    key/value are set for pipe lines of the form |key=value.
+    """
+    kind: str
+    text: str
+    cell: Optional[str]
+    key: Optional[str]
+    value: Optional[str]
+
+
+# Tokens are built with tuple.__new__ directly; the generated NamedTuple
+# constructor costs several times more and runs once per line
+_new_token = tuple.__new__
+_BLANK = _new_token(LineToken, ("blank", "", None, None, None))
+
+
+def tokenize_line(line: str) -> LineToken:
+    """Classify a single line of wikitext."""
+    text = line.strip()
+    if not text:
+        return _BLANK
+    first = text[0]
+    if first == '{' and text.startswith('{|'):
+        return _new_token(LineToken, ("table_start", text, None, None, None))
+    if first != '|':
+        return _new_token(LineToken, ("text", text, None, None, None))
+
+    if text == '|-':
+        return _new_token(LineToken, ("row", text, '-', None, None))
+    if text == '|}':
+        return _new_token(LineToken, ("table_end", text, '}', None, None))
+
+    body = text[1:]
+    if '=' not in body:
+        return _new_token(LineToken, ("cell", text, body.lstrip(), None, None))
+    key, value = body.split('=', 1)
+    return _new_token(LineToken, ("cell", text, body.lstrip(), key.strip(), value.strip()))
+
+
+def tokenize_lines(text: str) -> List[LineToken]:
+    """Tokenize a block of wikitext into one LineToken per line."""
+    return [tokenize_line(line) for line in text.split('\n')]
+
+
+def unescape_and_normalize(text: str, strip_tags: bool = True) -> str:
+    """
+    Decode HTML entities, drop bold/italic quotes, collapse whitespace and
+    (optionally) remove HTML tags. Regex passes are skipped when their marker
+    character does not occur in the text.
+    """
+    if '&' in text:
+        text = html.unescape(text)
+    if "''" in text:
+        text = BOLD_ITALIC.sub('', text)
+    text = ' '.join(text.split())
+    if strip_tags and '<' in text:
+        text = HTML_TAG.sub('', text)
+    return text.strip()
+
+
+def build_section_index(text: str) -> Dict[Tuple[int, str], Tuple[int, int]]:
+    """
+    Index every ==/=== section of a page in one pass.
+    Returns (level, lowercased title) -> (start, end) offsets of the section body,
+    which runs from the line after the heading (leading blank lines skipped) to
+    the next line starting with ==. Only the first section with a title is kept.
+    """
+    index: Dict[Tuple[int, str], Tuple[int, int]] = {}
+    # Headings can only start at a line beginning with ==, so jump between those
+    # (find() + 1 is 0 when there is no further line, mapped to -1)
+    line_start = 0 if text.startswith('==') else text.find('\n==') + 1 or -1
+    while line_start != -1:
+        match = SECTION_HEADING.match(text, line_start)
+        next_line = text.find('\n==', line_start) + 1 or -1
+        if match:
+            key = (len(match.group(1)), match.group(2).lower())
+            if key not in index:
+                whitespace_end = WHITESPACE.match(text, match.end()).end()
+                start = text.rfind('\n', match.end(), whitespace_end) + 1
+                end = text.find('\n==', start)
+                index[key] = (start, end if end != -1 else len(text))
+        line_start = next_line
+    return index